@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 # 1️⃣ Base Directory
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -67,6 +68,7 @@ CORS_ALLOW_ORIGINS = [
 CORS_ALLOW_ALL_ORIGINS = True  # Temporarily allow all origins
 CORS_ALLOW_METHODS = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
 CORS_ALLOW_HEADERS = ["*"]
+CORS_EXPOSE_HEADERS = ["X-Next-Cursor"]  # Pagination cursor of the pending tasks list
 
 
 CORS_ALLOWED_ALL_ORGINS = True
@@ -122,6 +124,13 @@ STATIC_URL = '/static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Stream every upload to a temporary file in small chunks instead of holding
+# smaller ones in memory. Saving the photo then moves that file into MEDIA_ROOT,
+# so an upload is never buffered whole in the worker.
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
@@ -195,6 +204,43 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'bingo-frontend/build'),
 ]
 
+# Photo fraud checks run in a background thread pool after each submission.
+# Set FRAUD_CHECK_IN_PROCESS to False to leave them to `manage.py process_fraud_checks --loop`.
+# That command rejects photos and awards points in its own process, so it
+# needs the shared cache (REDIS_URL, below) for web workers to see the change.
+FRAUD_CHECK_IN_PROCESS = os.getenv('FRAUD_CHECK_IN_PROCESS', 'true').lower() == 'true'
+FRAUD_CHECK_THREADS = int(os.getenv('FRAUD_CHECK_THREADS', '2'))
+
+# Cache for read-mostly API responses and per-user profiles. Cached profiles,
+# the task list and ETags are invalidated by bumping version counters kept in
+# this cache, so every worker must share it and increment them atomically:
+# set REDIS_URL whenever gunicorn runs more than one worker (WEB_CONCURRENCY).
+# The local-memory fallback is per process and only correct with a single
+# worker. Active users each take a few keys (their profile version and
+# cached profile), so CACHE_MAX_ENTRIES should be sized to the user base.
+REDIS_URL = os.getenv('REDIS_URL')
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '200000'))
+if int(os.getenv('WEB_CONCURRENCY', '1')) > 1 and not REDIS_URL:
+    raise ImproperlyConfigured(
+        "REDIS_URL must be set when running more than one worker: the per-process "
+        "cache would serve stale profiles and ETags after writes in other workers."
+    )
+if not FRAUD_CHECK_IN_PROCESS and not REDIS_URL:
+    raise ImproperlyConfigured(
+        "REDIS_URL must be set when FRAUD_CHECK_IN_PROCESS is off: rejections made by "
+        "process_fraud_checks would not reach the profiles cached by the web workers."
+    )
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bingo',
+        'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+    }
+}
+
 # Email settings for development
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'noreply@yourgame.com'
\ No newline at end of file
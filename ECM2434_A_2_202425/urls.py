@@ -4,12 +4,20 @@ from django.urls import path, include, re_path
 from django.views.generic import TemplateView
 from django.conf import settings
 from django.conf.urls.static import static
+
+from bingo.etags import conditional_etag, make_etag
+
+
+def api_environment(request):
+    return "production" if request.get_host() == 'caffeinated-divas.fly.dev' else "development"
+
+
+@conditional_etag(lambda request: make_etag('config', api_environment(request)))
 def api_config(request):
-    is_prod = request.get_host() == 'caffeinated-divas.fly.dev'
     return JsonResponse({
         "apiBaseUrl": "/api",
         "mediaBaseUrl": "/media",
-        "environment": "production" if is_prod else "development"
+        "environment": api_environment(request)
     })
 urlpatterns = [
     path('api-config/', api_config, name='api_config'),
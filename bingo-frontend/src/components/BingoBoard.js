@@ -15,6 +15,50 @@ import config from '../config';
 
 const API_URL = config.API_BASE_URL;
 
+// Board size used until the task list says otherwise. Tasks carry the
+// board's size as board_size and their cell as position (row * size + col).
+const DEFAULT_BOARD_SIZE = 3;
+
+const getBoardSize = (tasks) =>
+  (tasks.length > 0 && tasks[0].board_size) || DEFAULT_BOARD_SIZE;
+
+// Row and column names used in pattern messages on the 3x3 board
+const ROW_NAMES = ['Top', 'Middle', 'Bottom'];
+const COLUMN_NAMES = ['Left', 'Middle', 'Right'];
+
+// Every pattern on a size x size board, as lists of cell positions
+const getBoardPatterns = (size) => {
+  const cells = Array.from({ length: size }, (_, i) => i);
+  const diagonals = [
+    ...cells.map(i => i * size + i),
+    ...cells.map(i => i * size + (size - 1 - i)).filter(cell => cell !== (size * size - 1) / 2)
+  ];
+  const edge = cells.flatMap(row => cells
+    .filter(col => row === 0 || row === size - 1 || col === 0 || col === size - 1)
+    .map(col => row * size + col));
+
+  return [
+    // X pattern (both diagonals)
+    { type: 'X', name: 'X Pattern', cells: diagonals, points: 35 },
+    // Outside frame (O pattern)
+    { type: 'O', name: 'O Pattern', cells: edge, points: 35 },
+    // Horizontal lines (only 5 points each)
+    ...cells.map(row => ({
+      type: 'HORIZ',
+      name: `Horizontal Line (${size === 3 ? ROW_NAMES[row] : `Row ${row + 1}`})`,
+      cells: cells.map(col => row * size + col),
+      points: 5
+    })),
+    // Vertical lines (only 5 points each)
+    ...cells.map(col => ({
+      type: 'VERT',
+      name: `Vertical Line (${size === 3 ? COLUMN_NAMES[col] : `Column ${col + 1}`})`,
+      cells: cells.map(row => row * size + col),
+      points: 5
+    }))
+  ];
+};
+
 // For storing already shown pattern notifications across sessions/renders
 const getShownPatternNotifications = () => {
   try {
@@ -234,26 +278,15 @@ const checkForCompletedPatterns = useCallback((userTasksData) => {
     .filter(task => task.completed)
     .map(task => task.task_id);
 
-  // Define patterns to check (these indices match the 3x3 grid layout)
-  const patterns = [
-    // X pattern (corners and center)
-    { type: 'X', name: 'X Pattern', cells: [0, 2, 4, 6, 8], points: 35 },
-    // Outside frame (O pattern)
-    { type: 'O', name: 'O Pattern', cells: [0, 1, 2, 3, 5, 6, 7, 8], points: 35 },
-    // Horizontal lines (only 5 points each)
-    { type: 'HORIZ', name: 'Horizontal Line (Top)', cells: [0, 1, 2], points: 5 },
-    { type: 'HORIZ', name: 'Horizontal Line (Middle)', cells: [3, 4, 5], points: 5 },
-    { type: 'HORIZ', name: 'Horizontal Line (Bottom)', cells: [6, 7, 8], points: 5 },
-    // Vertical lines (only 5 points each)
-    { type: 'VERT', name: 'Vertical Line (Left)', cells: [0, 3, 6], points: 5 },
-    { type: 'VERT', name: 'Vertical Line (Middle)', cells: [1, 4, 7], points: 5 },
-    { type: 'VERT', name: 'Vertical Line (Right)', cells: [2, 5, 8], points: 5 }
-  ];
+  // Define patterns to check for the board's size
+  const patterns = getBoardPatterns(getBoardSize(tasks));
 
-  // Map task IDs to their indices in the grid (0-8)
-  const taskIndices = {};
-  tasks.forEach((task, index) => {
-    taskIndices[task.id] = index;
+  // Map grid cells to the task the server placed there
+  const cellTaskIds = {};
+  tasks.forEach(task => {
+    if (task.position !== null && task.position !== undefined) {
+      cellTaskIds[task.position] = task.id;
+    }
   });
 
   // Keep track of newly detected patterns
@@ -263,8 +296,7 @@ const checkForCompletedPatterns = useCallback((userTasksData) => {
   patterns.forEach(pattern => {
     // Check if all cells in pattern are completed
     const isComplete = pattern.cells.every(cellIndex => {
-      if (cellIndex >= tasks.length) return false;
-      const taskId = tasks[cellIndex]?.id;
+      const taskId = cellTaskIds[cellIndex];
       return taskId && completedTaskIds.includes(taskId);
     });
 
@@ -673,6 +705,43 @@ const checkForCompletedPatterns = useCallback((userTasksData) => {
     return classes.join(' ');
   };
 
+  // Lay out the board by position, with placeholders for empty cells so every
+  // task is drawn in the cell its patterns are checked against. Tasks that are
+  // not on the board follow it.
+  const boardSize = getBoardSize(tasks);
+  const boardCellCount = boardSize * boardSize;
+  const boardCells = Array.from({ length: boardCellCount }, (_, position) =>
+    tasks.find(task => task.position === position) || null
+  );
+  const offBoardTasks = tasks.filter(task =>
+    task.position === null || task.position === undefined || task.position >= boardCellCount
+  );
+
+  const renderTaskCell = (task) => (
+    <div
+      key={task.id}
+      className={`bingo-cell ${getTaskStatusClass(task.id)}`}
+      onClick={() => handleTaskClick(task)}
+    >
+      <div className='cell-content'>
+        {/* Task Points */}
+        <div className='points'><strong>{task.points} Points</strong></div>
+        {/* Task Description */}
+        <div className='description'>{task.description}</div>
+        {/* Icons for upload or scan-required tasks */}
+        {task.requires_upload && <div className='upload-indicator'>📷</div>}
+        {task.requires_scan && <div className='scan-indicator'>🤳🏻</div>}
+        {/* Status indicator */}
+        {getTaskStatus(task.id) === 'pending' &&
+          <div className='status-indicator'>Awaiting approval</div>}
+        {getTaskStatus(task.id) === 'rejected' &&
+          <div className='status-indicator rejected'>Rejected</div>}
+        {getTaskStatus(task.id) === 'completed' &&
+          <div className='status-indicator completed'>Completed!</div>}
+      </div>
+    </div>
+  );
+
   // Render Bingo Board UI
 
   return (
@@ -689,32 +758,20 @@ const checkForCompletedPatterns = useCallback((userTasksData) => {
       ) : error ? (
         <p className="error-message">{error}</p>
       ) : (
-        <div className="bingo-board">
-          {/* Render tasks dynamically if available */}
-          {tasks.length > 0 ? tasks.map((task) => (
-            <div
-              key={task.id}
-              className={`bingo-cell ${getTaskStatusClass(task.id)}`}
-              onClick={() => handleTaskClick(task)}
-            >
-              <div className='cell-content'>
-                {/* Task Points */}
-                <div className='points'><strong>{task.points} Points</strong></div>
-                {/* Task Description */}
-                <div className='description'>{task.description}</div>
-                {/* Icons for upload or scan-required tasks */}
-                {task.requires_upload && <div className='upload-indicator'>📷</div>}
-                {task.requires_scan && <div className='scan-indicator'>🤳🏻</div>}
-                {/* Status indicator */}
-                {getTaskStatus(task.id) === 'pending' &&
-                  <div className='status-indicator'>Awaiting approval</div>}
-                {getTaskStatus(task.id) === 'rejected' &&
-                  <div className='status-indicator rejected'>Rejected</div>}
-                {getTaskStatus(task.id) === 'completed' &&
-                  <div className='status-indicator completed'>Completed!</div>}
-              </div>
-            </div>
-          )) : <p>No tasks available.</p>}
+        <div className="bingo-board" style={{ gridTemplateColumns: `repeat(${boardSize}, 1fr)` }}>
+          {/* Render the board cells in position order, then any tasks off the board */}
+          {tasks.length > 0 ? (
+            <>
+              {boardCells.map((task, position) => task ? renderTaskCell(task) : (
+                <div key={`empty-${position}`} className='bingo-cell empty'>
+                  <div className='cell-content'>
+                    <div className='description'>Coming soon</div>
+                  </div>
+                </div>
+              ))}
+              {offBoardTasks.map(renderTaskCell)}
+            </>
+          ) : <p>No tasks available.</p>}
         </div>
       )}
 
@@ -12,6 +12,7 @@ const GameKeeper = () => {
   const navigate = useNavigate();
   const [tasks, setTasks] = useState([]);
   const [pendingTasks, setPendingTasks] = useState([]);
+  const [pendingCursor, setPendingCursor] = useState(null);
   const [leaderboard, setLeaderboard] = useState([]);
   const [selectedImage, setSelectedImage] = useState(null);
   const [newTask, setNewTask] = useState({
@@ -37,6 +38,23 @@ const GameKeeper = () => {
     }
   }, [token]);
 
+  // Fetch the next page of pending tasks
+  const loadMorePendingTasks = async () => {
+    try {
+      const pendingResponse = await axios.get(`${API_URL}/api/pending-tasks/`, {
+        params: { after: pendingCursor },
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      });
+      setPendingTasks(prev => [...prev, ...pendingResponse.data]);
+      setPendingCursor(pendingResponse.headers['x-next-cursor'] || null);
+    } catch (pendingError) {
+      console.error("Error fetching more pending tasks:", pendingError);
+      setError("Failed to load more pending tasks: " + (pendingError.response?.data?.error || pendingError.message));
+    }
+  };
+
   // Fetch initial data
   const fetchData = async () => {
     setLoading(true);
@@ -55,6 +73,7 @@ const GameKeeper = () => {
         });
         console.log("Pending tasks response:", pendingResponse);
         setPendingTasks(pendingResponse.data);
+        setPendingCursor(pendingResponse.headers['x-next-cursor'] || null);
       } catch (pendingError) {
         console.error("Error fetching pending tasks:", pendingError);
         setError("Failed to load pending tasks: " + (pendingError.response?.data?.error || pendingError.message));
@@ -258,6 +277,15 @@ const GameKeeper = () => {
 
                 <div className="submission-details">
                   <p>Submitted: {new Date(task.completion_date).toLocaleString()}</p>
+                  {task.verification_status && task.verification_status !== 'not_required' && (
+                    <p className={`fraud-check fraud-check-${task.verification_status}`}>
+                      {task.fraud_score !== null && task.fraud_score !== undefined
+                        ? `Fraud check: ${task.fraud_score.toFixed(1)}% similar to a previous photo`
+                        : task.verification_status === 'failed'
+                          ? 'Fraud check failed'
+                          : 'Fraud check pending...'}
+                    </p>
+                  )}
                 </div>
 
                 <div className="task-photo">
@@ -265,14 +293,15 @@ const GameKeeper = () => {
                     <>
                       <img
                         src={task.photo_url}
+                        loading="lazy"
                         alt="Task submission"
-                        onClick={() => handleImageClick(task.photo_url)}
+                        onClick={() => handleImageClick(task.photo_review_url || task.photo_url)}
                         className="submission-photo"
                       />
                       <div className="image-tools">
                         <button
                           className="enlarge-btn"
-                          onClick={() => handleImageClick(task.photo_url)}
+                          onClick={() => handleImageClick(task.photo_review_url || task.photo_url)}
                         >
                           🔍 Zoom
                         </button>
@@ -302,6 +331,11 @@ const GameKeeper = () => {
             ))}
           </div>
         )}
+        {!loading && pendingCursor && (
+          <button className="load-more-btn" onClick={loadMorePendingTasks}>
+            Load more submissions
+          </button>
+        )}
       </div>
 
       {/* Create Task Section */}
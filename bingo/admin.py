@@ -1,5 +1,5 @@
 # Import necessary models from the models module
-from .models import Task, UserTask, Leaderboard, User, Profile, UserConsent
+from .models import Task, UserTask, Leaderboard, User, Profile, UserConsent, Board, BoardCell
 
 # Import Django's admin module to register models for the admin interface
 from django.contrib import admin
@@ -11,3 +11,16 @@ admin.site.register(UserTask)  # Tracks task assignments and completions by user
 admin.site.register(Leaderboard)  # Stores leaderboard data for gamification
 admin.site.register(Profile)  # Extends the default User model with additional details
 admin.site.register(UserConsent)  # Manages user consent data for compliance and permissions
+
+
+class BoardCellInline(admin.TabularInline):
+    """Edit the tasks on a board's cells; cell (row, col) is position row * size + col."""
+    model = BoardCell
+    extra = 0
+
+
+@admin.register(Board)
+class BoardAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'version', 'is_active', 'updated_at')
+    readonly_fields = ('version', 'updated_at')
+    inlines = [BoardCellInline]
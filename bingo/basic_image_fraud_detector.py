@@ -1,11 +1,144 @@
-from PIL import Image
+from PIL import ExifTags, Image
 import io
-from django.core.cache import cache
 import logging
 import math
 
 logger = logging.getLogger(__name__)
 
+# The perceptual hash is a HASH_SIZE x HASH_SIZE average hash packed into an integer
+HASH_SIZE = 16
+HASH_BITS = HASH_SIZE * HASH_SIZE
+HASH_BYTES = HASH_BITS // 8
+
+# Bump whenever the way signatures are calculated changes, so stored ones can be backfilled
+SIGNATURE_VERSION = 3
+
+# Images are decoded at roughly this many pixels on their shorter side. It is
+# far below phone camera resolution but comfortably above the 16x16 hash.
+DECODE_SIZE = 128
+
+# Region colours are sampled from a small RGB thumbnail of this size, so each
+# sample is the average colour of its neighbourhood rather than a single pixel
+REGION_THUMBNAIL_SIZE = 32
+REGION_POINTS = (0.25, 0.5, 0.75)
+
+# Largest bitmap, in pixels, a signature decode may build. JPEGs are counted
+# after DCT scaling, so this only limits huge or unusual uploads, and keeps
+# the memory of one decode to roughly 4 bytes per pixel of this.
+MAX_DECODE_PIXELS = 24_000_000
+
+# Modes Image.reduce can shrink directly, before the copy made by convert('RGB')
+REDUCIBLE_MODES = ('L', 'RGB')
+
+# Transposes that turn an image with each EXIF orientation upright, as
+# ImageOps.exif_transpose applies them to the stored copies
+ORIENTATION_TRANSPOSES = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def hash_to_int(value):
+    """
+    Read a stored perceptual hash as a packed integer.
+
+    Accepts the packed integer itself, its big-endian byte form (as stored in the
+    database) and the legacy 256-character '0'/'1' string form.
+
+    Returns:
+        int: The packed hash, or None if the value is not a valid hash
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        return int.from_bytes(value, 'big') if len(value) == HASH_BYTES else None
+    if isinstance(value, str) and len(value) == HASH_BITS:
+        try:
+            return int(value, 2)
+        except ValueError:
+            return None
+    return None
+
+
+def hash_to_bytes(value):
+    """Pack a perceptual hash into its fixed-size big-endian byte form for storage."""
+    return hash_to_int(value).to_bytes(HASH_BYTES, 'big')
+
+
+def load_reduced_image(source, target=DECODE_SIZE):
+    """
+    Open an image and decode it at reduced resolution, converted to RGB once
+    and turned upright by its EXIF orientation.
+
+    JPEGs are decoded with Image.draft, which lets libjpeg skip detail through
+    DCT scaling, so a full-resolution bitmap is never built. Other formats are
+    decoded and shrunk with Image.reduce before being converted. Stored photos
+    are rotated upright when resized, so an upload and its stored copy give
+    the same signature.
+
+    Args:
+        source: Path or binary file object
+        target (int): Approximate size of the shorter side after decoding
+
+    Returns:
+        tuple: (RGB image, (original width, original height) once upright)
+
+    Raises:
+        ValueError: If decoding would build a bitmap larger than MAX_DECODE_PIXELS
+    """
+    image = Image.open(source)
+    original_size = image.size
+    transpose = ORIENTATION_TRANSPOSES.get(image.getexif().get(ExifTags.Base.Orientation))
+
+    if image.format == 'JPEG':
+        image.draft('RGB', (target, target))
+
+    width, height = image.size
+    if width * height > MAX_DECODE_PIXELS:
+        raise ValueError(f"Image too large to decode ({original_size[0]}x{original_size[1]})")
+
+    if image.format == 'JPEG':
+        image = image.convert('RGB')
+    else:
+        # Shrinking first avoids a full-resolution RGB copy; it gives the same
+        # pixels as converting first for these modes
+        factor = min(image.size) // target
+        if factor > 1 and image.mode in REDUCIBLE_MODES:
+            image = image.reduce(factor)
+        image = image.convert('RGB')
+        factor = min(image.size) // target
+        if factor > 1:
+            image = image.reduce(factor)
+
+    if transpose is not None:
+        image = image.transpose(transpose)
+        if transpose in (Image.Transpose.TRANSPOSE, Image.Transpose.ROTATE_270,
+                         Image.Transpose.TRANSVERSE, Image.Transpose.ROTATE_90):
+            original_size = original_size[::-1]
+
+    return image, original_size
+
+
+def signature_inputs(image):
+    """
+    Build the inputs a signature is calculated from.
+
+    Args:
+        image: Reduced RGB image from load_reduced_image
+
+    Returns:
+        tuple: (HASH_SIZE x HASH_SIZE grayscale image, REGION_THUMBNAIL_SIZE square RGB thumbnail)
+    """
+    gray = image.convert('L').resize((HASH_SIZE, HASH_SIZE), Image.LANCZOS)
+    thumbnail = image.resize((REGION_THUMBNAIL_SIZE, REGION_THUMBNAIL_SIZE), Image.BOX)
+    return gray, thumbnail
+
 
 class BasicImageFraudDetector:
     """
@@ -27,45 +160,41 @@ class BasicImageFraudDetector:
         Create a simple image signature using downsampling and average pixel values.
 
         Args:
-            image_data: Binary image data
+            image_data: Binary image data, or a binary file object to decode from
 
         Returns:
             dict: Dictionary containing image signature
         """
         try:
-            # Open image with PIL
-            image = Image.open(io.BytesIO(image_data))
-
-            # Convert to grayscale
-            gray_image = image.convert('L')
+            if isinstance(image_data, (bytes, bytearray)):
+                image_data = io.BytesIO(image_data)
 
-            # Resize to small dimensions (16x16) for a basic perceptual hash
-            small_image = gray_image.resize((16, 16), Image.LANCZOS)
+            # Decode at reduced resolution and convert to RGB exactly once
+            image, (width, height) = load_reduced_image(image_data)
+            small_image, thumbnail = signature_inputs(image)
 
-            # Get pixel data
+            # Get pixel data of the 16x16 grayscale image
             pixels = list(small_image.getdata())
 
             # Calculate average pixel value
             avg_pixel = sum(pixels) / len(pixels)
 
-            # Create a simple binary hash (1 for pixels above average, 0 for below)
-            binary_hash = ''.join('1' if p > avg_pixel else '0' for p in pixels)
+            # Create a simple binary hash (1 for pixels above average, 0 for below),
+            # packed into an integer with the first pixel as the most significant bit
+            binary_hash = 0
+            for p in pixels:
+                binary_hash = (binary_hash << 1) | (p > avg_pixel)
 
-            # Get basic image stats
-            width, height = image.size
+            # Get basic image stats from the original dimensions
             aspect_ratio = width / height
 
-            # Get sample pixels from different regions (simplified color analysis)
+            # Sample colours of different regions from the thumbnail (simplified color analysis)
             regions = []
-            for x in [0.25, 0.5, 0.75]:
-                for y in [0.25, 0.5, 0.75]:
-                    px = int(width * x)
-                    py = int(height * y)
-                    if image.mode == 'RGB':
-                        regions.append(image.getpixel((px, py)))
-                    else:
-                        # Convert to RGB if not already
-                        regions.append(image.convert('RGB').getpixel((px, py)))
+            for x in REGION_POINTS:
+                for y in REGION_POINTS:
+                    px = int(REGION_THUMBNAIL_SIZE * x)
+                    py = int(REGION_THUMBNAIL_SIZE * y)
+                    regions.append(thumbnail.getpixel((px, py)))
 
             return {
                 'binary_hash': binary_hash,
@@ -79,20 +208,22 @@ class BasicImageFraudDetector:
 
     def _calculate_hash_similarity(self, hash1, hash2):
         """
-        Calculate similarity between two binary hash strings.
+        Calculate similarity between two perceptual hashes using their Hamming distance.
 
         Args:
-            hash1 (str): First hash string
-            hash2 (str): Second hash string
+            hash1: First hash (packed integer, stored bytes or legacy '0'/'1' string)
+            hash2: Second hash (packed integer, stored bytes or legacy '0'/'1' string)
 
         Returns:
             float: Similarity percentage (0-100)
         """
-        if len(hash1) != len(hash2):
+        hash1 = hash_to_int(hash1)
+        hash2 = hash_to_int(hash2)
+        if hash1 is None or hash2 is None:
             return 0
 
-        matching_bits = sum(c1 == c2 for c1, c2 in zip(hash1, hash2))
-        similarity = (matching_bits / len(hash1)) * 100
+        differing_bits = (hash1 ^ hash2).bit_count()
+        similarity = ((HASH_BITS - differing_bits) / HASH_BITS) * 100
         return similarity
 
     def _calculate_color_similarity(self, regions1, regions2):
@@ -121,34 +252,130 @@ class BasicImageFraudDetector:
         similarity = 100 - (total_diff / max_possible_diff) * 100
         return max(0, similarity)
 
-    def is_image_fraudulent(self, new_image_data, user_id=None):
+    def get_stored_signature(self, user_task, decode_missing=True):
         """
-        Check if an image is potentially fraudulent by comparing it to previously approved images.
+        Get the stored signature for a UserTask photo.
+
+        Photos uploaded before signatures were persisted are decoded once and
+        their signature is saved, so later checks never need to re-read them.
 
         Args:
-            new_image_data: Binary image data of the new submission
-            user_id: Optional user ID to check only against this user's submissions
+            user_task: UserTask instance with a photo
+            decode_missing (bool): Whether to decode the photo if no signature is stored
+
+        Returns:
+            dict: Dictionary containing image signature, or None if unavailable
+        """
+        from .models import ImageSignature
+
+        try:
+            stored = user_task.image_signature
+        except ImageSignature.DoesNotExist:
+            stored = None
+
+        if stored is not None:
+            return {
+                'binary_hash': hash_to_int(stored.binary_hash),
+                'aspect_ratio': stored.aspect_ratio,
+                'regions': stored.regions
+            }
+
+        if not user_task.photo or not decode_missing:
+            return None
+
+        try:
+            # Decode straight from the stored file rather than reading it into memory
+            with user_task.photo.open('rb') as photo:
+                return self.save_image_signature(user_task.id, photo)
+        except Exception as file_error:
+            print(f"Error reading photo for task #{user_task.id}: {str(file_error)}")
+            return None
+
+    def find_similar_hash(self, binary_hash):
+        """
+        Search every stored photo, across all accounts, for a hash similar enough
+        to count as a duplicate.
+
+        Uses the in-process similarity index, so the cost does not grow linearly
+        with the number of stored photos. Only the hash is compared here; the
+        color samples are too coarse to tell unrelated photos apart at this scale.
+
+        Args:
+            binary_hash: Packed hash of the new image
+
+        Returns:
+            tuple: (matched_task_id, similarity_percentage)
+        """
+        from .image_hash_index import signature_index
+        from .models import ImageSignature
+
+        radius = int(HASH_BITS * (100 - self.similarity_threshold) / 100)
+        binary_hash = hash_to_int(binary_hash)
+
+        # Reads other processes' new signatures at most every SYNC_INTERVAL seconds
+        signature_index.sync()
+        matches = signature_index.search(binary_hash, radius)[:50]
+        if not matches:
+            return None, 0
+
+        # The index may still hold signatures deleted or rolled back in another
+        # process, so confirm each match against the stored hash
+        stored_hashes = dict(
+            ImageSignature.objects.filter(
+                user_task_id__in=[task_id for task_id, _ in matches]
+            ).values_list('user_task_id', 'binary_hash')
+        )
+        best_task_id, best_distance = None, None
+        for task_id, _ in matches:
+            if task_id not in stored_hashes:
+                signature_index.remove(task_id)
+                continue
+            stored_hash = hash_to_int(stored_hashes[task_id])
+            signature_index.add(task_id, stored_hash)
+            distance = (stored_hash ^ binary_hash).bit_count()
+            if distance <= radius and (best_distance is None or distance < best_distance):
+                best_task_id, best_distance = task_id, distance
+
+        if best_task_id is None:
+            return None, 0
+        return best_task_id, ((HASH_BITS - best_distance) / HASH_BITS) * 100
+
+    def is_image_fraudulent(self, new_image_data, user_id=None, new_signature=None, check_all_users=True,
+                            current_task_id=None):
+        """
+        Check if an image is potentially fraudulent by comparing it to the stored
+        signatures of previously submitted images.
+
+        Args:
+            new_image_data: Binary image data or file object of the new submission; not
+                needed when new_signature is given
+            user_id: Optional user ID to compare hash and colors against this user's submissions
+            new_signature: Optional precomputed signature of the new image
+            check_all_users: Whether to also search every account's photos by hash
+            current_task_id: Optional ID of the UserTask the new image is already saved on.
+                Its stored signature (of the photo being replaced) is still compared, but
+                its photo is never decoded, as that is the new image itself.
 
         Returns:
             tuple: (is_fraudulent, similarity_percentage, matched_task_id)
         """
         print("=== FRAUD DETECTION STARTED ===")
 
-        # Calculate signature for the new image
-        new_signature = self._get_image_signature(new_image_data)
+        # Calculate signature for the new image - the only decode this check needs
+        if new_signature is None:
+            new_signature = self._get_image_signature(new_image_data)
         if not new_signature:
             logger.error("Could not calculate signature for new image")
             return False, 0, None
 
-        print(f"New image size: {len(new_image_data)} bytes")
-        print(f"New image signature calculated: {new_signature['binary_hash'][:20]}...")
+        print(f"New image signature calculated: {new_signature['binary_hash']:064x}")
 
-        # Get previously approved images
+        # Get previously submitted images
         from .models import UserTask
 
         # Get all tasks with photos (including approved and pending)
         # We want to check for duplicates in any status to prevent multiple submissions of the same image
-        query = UserTask.objects.exclude(photo='')
+        query = UserTask.objects.exclude(photo='').select_related('image_signature')
 
         # If user_id provided, check only against this user's previous uploads
         if user_id:
@@ -162,29 +389,13 @@ class BasicImageFraudDetector:
 
         for task in previous_tasks:
             try:
-                print(f"Comparing with task #{task.id}...")
-
-                # Get image data - handle Django's file field properly
-                try:
-                    # Make sure the file is open for reading
-                    task.photo.open('rb')
-                    previous_image_data = task.photo.read()
-                    task.photo.close()
-                except Exception as file_error:
-                    print(f"Error reading photo for task #{task.id}: {str(file_error)}")
-                    continue
-
-                print(f"Previous image size: {len(previous_image_data)} bytes")
-
-                # Calculate signature for previous image
-                prev_signature = self._get_image_signature(previous_image_data)
+                # Use the stored signature instead of re-decoding the previous photo
+                prev_signature = self.get_stored_signature(task, decode_missing=task.id != current_task_id)
 
                 if not prev_signature:
-                    print(f"Could not calculate signature for task #{task.id}")
+                    print(f"Could not get signature for task #{task.id}")
                     continue
 
-                print(f"Previous signature: {prev_signature['binary_hash'][:20]}...")
-
                 # Compare binary hashes
                 hash_similarity = self._calculate_hash_similarity(
                     new_signature['binary_hash'],
@@ -197,17 +408,15 @@ class BasicImageFraudDetector:
                     prev_signature['regions']
                 )
 
-                print(f"Hash similarity: {hash_similarity:.2f}%, Color similarity: {color_similarity:.2f}%")
-
                 # Use max similarity instead of weighted average for stricter detection
                 final_similarity = max(hash_similarity, color_similarity)
 
-                print(f"Final similarity: {final_similarity:.2f}%")
+                print(f"Task #{task.id}: hash similarity {hash_similarity:.2f}%, "
+                      f"color similarity {color_similarity:.2f}%, final {final_similarity:.2f}%")
 
                 if final_similarity > highest_similarity:
                     highest_similarity = final_similarity
                     matched_task_id = task.id
-                    print(f"New highest similarity: {highest_similarity:.2f}% with task #{matched_task_id}")
 
                 # Early exit if we find a very high match
                 if highest_similarity > 95:
@@ -219,6 +428,17 @@ class BasicImageFraudDetector:
                 print(f"Error comparing with task {task.id}: {str(e)}")
                 continue
 
+        # Look for reused photos across all accounts
+        if check_all_users and highest_similarity < self.similarity_threshold:
+            try:
+                global_task_id, global_similarity = self.find_similar_hash(new_signature['binary_hash'])
+                print(f"Closest stored photo across all users: task #{global_task_id}, {global_similarity:.2f}%")
+                if global_similarity > highest_similarity:
+                    highest_similarity = global_similarity
+                    matched_task_id = global_task_id
+            except Exception as e:
+                logger.error(f"Error searching image similarity index: {str(e)}")
+
         # Lower threshold for stricter detection
         similarity_threshold = self.similarity_threshold
         print(f"Highest similarity found: {highest_similarity:.2f}%, threshold: {similarity_threshold}")
@@ -231,16 +451,42 @@ class BasicImageFraudDetector:
 
         return is_fraudulent, highest_similarity, matched_task_id
 
+    def store_signature(self, task_id, signature):
+        """
+        Persist an already calculated signature for a UserTask photo.
+
+        Args:
+            task_id: The ID of the UserTask the photo belongs to
+            signature: Dictionary returned by _get_image_signature
+
+        Returns:
+            dict: The stored signature
+        """
+        from .models import ImageSignature
+
+        ImageSignature.objects.update_or_create(
+            user_task_id=task_id,
+            defaults={
+                'binary_hash': hash_to_bytes(signature['binary_hash']),
+                'aspect_ratio': signature['aspect_ratio'],
+                'regions': [list(region) for region in signature['regions']],
+                'version': SIGNATURE_VERSION
+            }
+        )
+        return signature
+
     def save_image_signature(self, task_id, image_data):
         """
-        Save image signature for a newly approved image.
+        Calculate and persist the signature of a UserTask photo.
 
         Args:
-            task_id: The ID of the approved task
-            image_data: Binary image data
+            task_id: The ID of the UserTask the photo belongs to
+            image_data: Binary image data or a binary file object
+
+        Returns:
+            dict: The stored signature, or None if it could not be calculated
         """
         signature = self._get_image_signature(image_data)
-        if signature:
-            # Store in cache for quick access
-            cache_key = f"image_signature_{task_id}"
-            cache.set(cache_key, signature, timeout=60 * 60 * 24 * 30)  # Store for 30 days
\ No newline at end of file
+        if not signature:
+            return None
+        return self.store_signature(task_id, signature)
@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+
+from django.db import transaction
+from django.db.models import F
+
+from .bingo_patterns import BingoPatternDetector
+
+logger = logging.getLogger(__name__)
+
+# Size of the board created when the first task is added
+BOARD_SIZE = 3
+
+# Seconds a cached layout is trusted without a reload. Changes made in this
+# process invalidate it straight away; this bounds how long another worker
+# process can keep serving a layout changed elsewhere.
+LAYOUT_CACHE_SECONDS = 60
+
+
+class BoardLayout:
+    """
+    Snapshot of the active board's cells, as read from Board and BoardCell.
+
+    Attributes:
+        board_id: ID of the board, or None when there is no board yet
+        version: Board version the snapshot was read at
+        size: Cells per row and column
+        task_ids: Tuple of the task ID in each cell by position, None for empty cells
+        positions: Dict of task ID -> cell position
+    """
+
+    def __init__(self, board_id, version, size, cells):
+        self.board_id = board_id
+        self.version = version
+        self.size = size
+        task_ids = [None] * (size * size)
+        for position, task_id in cells:
+            if position < len(task_ids):
+                task_ids[position] = task_id
+        self.task_ids = tuple(task_ids)
+        self.positions = {task_id: position for position, task_id in enumerate(task_ids) if task_id is not None}
+
+    @property
+    def key(self):
+        """Identify the layout, so a stored mask is only trusted for the layout it was built on."""
+        return f"{self.board_id}:{self.version}"
+
+    def cells_for(self, task_ids):
+        """Bitmask of the cells holding any of the given tasks."""
+        cells = 0
+        for task_id in task_ids:
+            position = self.positions.get(task_id)
+            if position is not None:
+                cells |= 1 << position
+        return cells
+
+    def __repr__(self):
+        return f"<BoardLayout {self.key} {self.size}x{self.size} {self.task_ids}>"
+
+
+_layout = None
+_layout_loaded_at = 0.0
+_layout_lock = threading.Lock()
+
+
+def active_board():
+    """Return the board being played, or None if there is none yet."""
+    from .models import Board
+
+    return Board.objects.filter(is_active=True).order_by('-id').first()
+
+
+def load_board_layout():
+    """Read the active board's layout from the database."""
+    from .models import BoardCell
+
+    board = active_board()
+    if board is None:
+        return BoardLayout(None, 0, BOARD_SIZE, ())
+    cells = BoardCell.objects.filter(board=board).values_list('position', 'task_id')
+    return BoardLayout(board.id, board.version, board.size, cells)
+
+
+def get_board_layout():
+    """
+    Return the active board's layout, cached in this process.
+
+    The cache is dropped by the Board and BoardCell signals, and reloaded
+    after LAYOUT_CACHE_SECONDS in case another process changed the board.
+    """
+    global _layout, _layout_loaded_at
+
+    with _layout_lock:
+        if _layout is None or time.monotonic() - _layout_loaded_at > LAYOUT_CACHE_SECONDS:
+            _layout = load_board_layout()
+            _layout_loaded_at = time.monotonic()
+        return _layout
+
+
+def invalidate_board_layout():
+    """Drop this process's cached layout so the next read reloads it."""
+    global _layout
+
+    with _layout_lock:
+        _layout = None
+
+
+def add_task_to_board(task):
+    """
+    Place a new task in the first empty cell of the active board, creating
+    the board if there is none. Tasks already on the board keep their cells,
+    and the task is left off the board when it is full.
+
+    Returns:
+        BoardCell: The new cell, or None if the board is full
+    """
+    from .models import Board, BoardCell
+
+    with transaction.atomic():
+        board = Board.objects.select_for_update().filter(is_active=True).order_by('-id').first()
+        if board is None:
+            board = Board.objects.create(size=BOARD_SIZE)
+
+        taken = set(board.cells.values_list('position', flat=True))
+        position = next((position for position in range(board.size * board.size) if position not in taken), None)
+        if position is None:
+            return None
+        return BoardCell.objects.create(board=board, position=position, task=task)
+
+
+def rebuild_completion_mask(user_id, layout):
+    """
+    Rebuild and store a user's completion mask from their completed UserTasks.
+
+    Args:
+        user_id: ID of the user
+        layout: BoardLayout to build the mask for
+
+    Returns:
+        int: The completion mask
+    """
+    from .models import Profile, UserTask
+
+    completed_task_ids = set(
+        UserTask.objects.filter(
+            user_id=user_id, completed=True, task_id__in=layout.positions
+        ).values_list('task_id', flat=True)
+    )
+    mask = BingoPatternDetector.mask_from_task_ids(completed_task_ids, layout.task_ids)
+    Profile.objects.filter(user_id=user_id).update(completion_mask=mask, completion_board=layout.key)
+    return mask
+
+
+def get_completion_mask(user):
+    """
+    Return a user's board completion mask.
+
+    The mask stored on the profile is used while it was built for the current
+    board layout, so this normally costs a single read. It is rebuilt from the
+    user's completed tasks when missing or when the layout has changed.
+
+    Returns:
+        tuple: (completion mask, BoardLayout)
+    """
+    from .models import Profile
+
+    layout = get_board_layout()
+    profile, _ = Profile.objects.get_or_create(user=user)
+    if profile.completion_mask is not None and profile.completion_board == layout.key:
+        return profile.completion_mask, layout
+
+    logger.info(f"Rebuilding completion mask for user {user.id}")
+    return rebuild_completion_mask(user.id, layout), layout
+
+
+def set_cells_completed(user_id, task_ids, completed=True):
+    """
+    Set or clear the cells of tasks in a user's stored completion mask.
+
+    Uses a single UPDATE with a bitwise F() expression, so concurrent
+    completions for the same user are not lost. Masks built for a different
+    layout are left alone; they are rebuilt when next read.
+
+    Args:
+        user_id: ID of the user
+        task_ids: IDs of the tasks whose cells changed
+        completed (bool): Whether the cells are now completed
+    """
+    from .models import Profile
+
+    layout = get_board_layout()
+    cells = layout.cells_for(task_ids)
+    if not cells:
+        return
+
+    mask = F('completion_mask').bitor(cells) if completed else F('completion_mask').bitand(~cells)
+    Profile.objects.filter(
+        user_id=user_id,
+        completion_mask__isnull=False,
+        completion_board=layout.key
+    ).update(completion_mask=mask)
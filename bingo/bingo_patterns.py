@@ -1,15 +1,111 @@
+from functools import lru_cache
+
 DEBUG_PATTERNS = False
 
+# Board sizes the detector supports; cell (row, col) is bit row * size + col
+SUPPORTED_BOARD_SIZES = (3, 4, 5)
+
+# Pattern types in the order detect_patterns reports them
+PATTERN_TYPES = ("O", "X", "HORIZ", "VERT")
+
+
+@lru_cache(maxsize=None)
+def pattern_masks(size=3):
+    """
+    Precompute the bitmask of every pattern on a size x size board.
+
+    Args:
+        size: Board size, one of SUPPORTED_BOARD_SIZES
+
+    Returns:
+        dict: Pattern name -> tuple of masks. A pattern is complete when all
+              bits of any one of its masks are set. Contains "HORIZ" (each
+              row), "VERT" (each column), "DIAG" (both diagonals), "X" (both
+              diagonals together) and "O" (the outer edge).
+    """
+    if size not in SUPPORTED_BOARD_SIZES:
+        raise ValueError(f"Unsupported board size {size}, expected one of {SUPPORTED_BOARD_SIZES}")
+
+    def bit(row, col):
+        return 1 << (row * size + col)
+
+    rows = tuple(sum(bit(row, col) for col in range(size)) for row in range(size))
+    cols = tuple(sum(bit(row, col) for row in range(size)) for col in range(size))
+    diagonals = (
+        sum(bit(i, i) for i in range(size)),
+        sum(bit(i, size - 1 - i) for i in range(size)),
+    )
+    edge = rows[0] | rows[-1] | cols[0] | cols[-1]
+
+    return {
+        "HORIZ": rows,
+        "VERT": cols,
+        "DIAG": diagonals,
+        "X": (diagonals[0] | diagonals[1],),
+        "O": (edge,),
+    }
+
+
+@lru_cache(maxsize=None)
+def _detected_pattern_masks(size):
+    """(pattern type, masks) pairs for the patterns detect_patterns reports, in order."""
+    masks = pattern_masks(size)
+    return tuple((pattern_type, masks[pattern_type]) for pattern_type in PATTERN_TYPES)
+
+
+@lru_cache(maxsize=None)
+def patterns_through_cell(cell, size=3):
+    """(pattern type, mask) pairs of the detected patterns that include a cell."""
+    return tuple(
+        (pattern_type, pattern)
+        for pattern_type, masks in _detected_pattern_masks(size)
+        for pattern in masks
+        if pattern >> cell & 1
+    )
+
 
 class BingoPatternDetector:
     """
-    Class to detect various bingo patterns on a 3x3 grid
+    Class to detect bingo patterns on a 3x3, 4x4 or 5x5 board.
+
+    A board is an integer bitmask of completed cells, so checking a pattern is
+    a `mask & pattern == pattern` test against the precomputed pattern masks.
+    The list-of-lists grid methods are kept for existing callers.
     """
 
+    @staticmethod
+    def mask_from_task_ids(completed_task_ids, grid_task_ids):
+        """
+        Build the board bitmask from task IDs.
+
+        Args:
+            completed_task_ids: Set of IDs of the tasks the user has completed
+            grid_task_ids: IDs of the tasks on the board, in board order
+
+        Returns:
+            int: Bitmask with bit i set when the i-th board task is completed
+        """
+        mask = 0
+        for position, task_id in enumerate(grid_task_ids):
+            if task_id in completed_task_ids:
+                mask |= 1 << position
+        return mask
+
+    @staticmethod
+    def mask_from_grid(grid):
+        """Convert a list-of-lists grid of booleans into a board bitmask."""
+        size = len(grid)
+        mask = 0
+        for row in range(size):
+            for col in range(size):
+                if grid[row][col]:
+                    mask |= 1 << (row * size + col)
+        return mask
+
     @staticmethod
     def create_grid_from_tasks(user_tasks, all_tasks, grid_size=3):
         """
-        Creates a 3x3 grid representation of completed tasks
+        Creates a grid representation of completed tasks
 
         Args:
             user_tasks: List of UserTask objects that are completed
@@ -20,146 +116,89 @@ class BingoPatternDetector:
             2D grid where True represents completed tasks and False represents incomplete tasks
         """
         # Create a set of completed task IDs for quick lookup
-        completed_task_ids = {task.task.id for task in user_tasks}
-
-        # Debug info
-        if DEBUG_PATTERNS:
-            print(f"Completed task IDs: {completed_task_ids}")
+        completed_task_ids = {user_task.task_id for user_task in user_tasks}
 
         # Get only the tasks that will fit in the grid
-        grid_tasks = list(all_tasks[:grid_size * grid_size])
+        grid_task_ids = [task.id for task in all_tasks[:grid_size * grid_size]]
 
-        # Debug: List grid tasks
         if DEBUG_PATTERNS:
-            grid_task_ids = [task.id for task in grid_tasks]
+            print(f"Completed task IDs: {completed_task_ids}")
             print(f"Grid task IDs (in order): {grid_task_ids}")
 
-        # Create the grid
-        grid = [[False for _ in range(grid_size)] for _ in range(grid_size)]
-
-        # Map tasks to grid positions based on their sequence in the list
-        for i, task in enumerate(grid_tasks):
-            row = i // grid_size
-            col = i % grid_size
+        mask = BingoPatternDetector.mask_from_task_ids(completed_task_ids, grid_task_ids)
+        return [[bool(mask >> (row * grid_size + col) & 1) for col in range(grid_size)]
+                for row in range(grid_size)]
 
-            # Debug position mapping
-            if DEBUG_PATTERNS:
-                print(f"Task {task.id} at position ({row}, {col})")
+    @staticmethod
+    def has_pattern(mask, pattern_type, size=3):
+        """Check whether any mask of a pattern is fully contained in the board mask."""
+        return any(mask & pattern == pattern for pattern in pattern_masks(size)[pattern_type])
 
-            # Mark as completed if this task is in the completed set
-            if task.id in completed_task_ids:
-                grid[row][col] = True
-                if DEBUG_PATTERNS:
-                    print(f"  - Marked as completed")
+    @staticmethod
+    def detect_patterns_from_mask(mask, size=3):
+        """
+        Detect all patterns on a board bitmask
 
-        return grid
+        Returns:
+            A list of pattern types found, in PATTERN_TYPES order (e.g. ["O", "HORIZ", "VERT"])
+        """
+        patterns = []
+        for pattern_type, masks in _detected_pattern_masks(size):
+            for pattern in masks:
+                if mask & pattern == pattern:
+                    patterns.append(pattern_type)
+                    break
+        if DEBUG_PATTERNS:
+            print(f"Board {mask:0{size * size}b}: patterns {patterns}")
+        return patterns
 
     @staticmethod
-    def check_o_pattern(grid, size=3):
-        """Check if the outer edge is complete (O pattern)"""
-        # For a 3x3 grid, the outer edge is all cells except the center
-        # Check top and bottom rows
-        for col in range(size):
-            if not grid[0][col] or not grid[size - 1][col]:
-                return False
-
-        # Check left and right columns (excluding corners which were already checked)
-        for row in range(1, size - 1):
-            if not grid[row][0] or not grid[row][size - 1]:
-                return False
+    def detect_patterns_through_cells(mask, cells, size=3):
+        """
+        Detect only the patterns that include one of the given cells, e.g. the
+        cells just completed. Patterns elsewhere on the board are not checked.
 
-        return True
+        Args:
+            mask: Board bitmask after the cells were completed
+            cells: Iterable of cell positions (bit indexes)
+            size: Board size
 
+        Returns:
+            A list of pattern types found, in PATTERN_TYPES order
+        """
+        found = set()
+        for cell in cells:
+            for pattern_type, pattern in patterns_through_cell(cell, size):
+                if pattern_type not in found and mask & pattern == pattern:
+                    found.add(pattern_type)
+        return [pattern_type for pattern_type in PATTERN_TYPES if pattern_type in found]
 
     @staticmethod
-    def check_x_pattern(grid, size=3):
+    def detect_patterns(grid, size=3):
         """
-        Check if X pattern is complete (corners and center)
+        Detect all patterns in the grid
+
+        Returns:
+            A list of pattern types found (e.g. ["O", "X", "HORIZ", "VERT"])
         """
-        # Check corners
-        if not grid[0][0] or not grid[0][size - 1] or not grid[size - 1][0] or not grid[size - 1][size - 1]:
-            return False
+        return BingoPatternDetector.detect_patterns_from_mask(BingoPatternDetector.mask_from_grid(grid), size)
 
-        # Check center
-        if not grid[1][1]:
-            return False
+    @staticmethod
+    def check_o_pattern(grid, size=3):
+        """Check if the outer edge is complete (O pattern)"""
+        return BingoPatternDetector.has_pattern(BingoPatternDetector.mask_from_grid(grid), "O", size)
 
-        return True
+    @staticmethod
+    def check_x_pattern(grid, size=3):
+        """Check if X pattern is complete (both diagonals)"""
+        return BingoPatternDetector.has_pattern(BingoPatternDetector.mask_from_grid(grid), "X", size)
 
     @staticmethod
     def check_horizontal_line(grid, size=3):
         """Check if any horizontal line is complete"""
-        for row in range(size):
-            all_completed = True
-            for col in range(size):
-                if not grid[row][col]:
-                    all_completed = False
-                    break
-            if all_completed:
-                return True
-        return False
+        return BingoPatternDetector.has_pattern(BingoPatternDetector.mask_from_grid(grid), "HORIZ", size)
 
     @staticmethod
     def check_vertical_line(grid, size=3):
         """Check if any vertical line is complete"""
-        for col in range(size):
-            all_completed = True
-            for row in range(size):
-                if not grid[row][col]:
-                    all_completed = False
-                    break
-            if all_completed:
-                return True
-        return False
-
-    @staticmethod
-    def detect_patterns(grid, size=3):
-        """
-        Detect all patterns in the grid
-
-        Returns:
-            A list of pattern types found (e.g. ["O", "X", "H", "V", "HORIZ", "VERT"])
-        """
-        patterns = []
-
-        # Check for each pattern with logging
-        if DEBUG_PATTERNS:
-            print("Checking for O pattern...")
-        if BingoPatternDetector.check_o_pattern(grid, size):
-            patterns.append("O")
-            if DEBUG_PATTERNS:
-                print("✓ O pattern detected!")
-        elif DEBUG_PATTERNS:
-            print("✗ O pattern not detected")
-
-        # Check for X pattern
-        if DEBUG_PATTERNS:
-            print("Checking for X pattern...")
-        if BingoPatternDetector.check_x_pattern(grid, size):
-            patterns.append("X")
-            if DEBUG_PATTERNS:
-                print("✓ X pattern detected!")
-        elif DEBUG_PATTERNS:
-            print("✗ X pattern not detected")
-
-        # Check for horizontal line pattern (basic pattern)
-        if DEBUG_PATTERNS:
-            print("Checking for horizontal line pattern...")
-        if BingoPatternDetector.check_horizontal_line(grid, size):
-            patterns.append("HORIZ")
-            if DEBUG_PATTERNS:
-                print("✓ Horizontal pattern detected!")
-        elif DEBUG_PATTERNS:
-            print("✗ Horizontal pattern not detected")
-
-        # Check for vertical line pattern (basic pattern)
-        if DEBUG_PATTERNS:
-            print("Checking for vertical line pattern...")
-        if BingoPatternDetector.check_vertical_line(grid, size):
-            patterns.append("VERT")
-            if DEBUG_PATTERNS:
-                print("✓ Vertical pattern detected!")
-        elif DEBUG_PATTERNS:
-            print("✗ Vertical pattern not detected")
-
-        return patterns
\ No newline at end of file
+        return BingoPatternDetector.has_pattern(BingoPatternDetector.mask_from_grid(grid), "VERT", size)
@@ -0,0 +1,83 @@
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+
+def _version_key(resource):
+    return f'bingo:version:{resource}'
+
+
+def resource_version(resource):
+    """
+    Current version of a shared resource, e.g. 'tasks'. A missing counter
+    starts from the clock, so it never repeats a version handed out before.
+    """
+    version = cache.get(_version_key(resource))
+    if version is None:
+        cache.add(_version_key(resource), time.time_ns(), None)
+        version = cache.get(_version_key(resource))
+    return version
+
+
+def _bump(resource):
+    try:
+        cache.incr(_version_key(resource))
+    except ValueError:
+        cache.set(_version_key(resource), time.time_ns(), None)
+
+
+def bump_resource_version(resource):
+    """
+    Mark a resource as changed, so clients holding its old ETag get the new
+    copy. Bumped now and again once the change commits, so an ETag handed
+    out before the commit is not reused for the committed data.
+    """
+    _bump(resource)
+    transaction.on_commit(lambda: _bump(resource))
+
+
+def make_etag(*parts):
+    """A strong ETag from version parts, e.g. make_etag('tasks', 12) -> '"tasks-12"'."""
+    return '"' + '-'.join(str(part) for part in parts) + '"'
+
+
+def conditional_etag(etag_func, private=False):
+    """
+    Decorator answering GET requests with 304 Not Modified when the client's
+    If-None-Match matches the ETag from etag_func, without running the view.
+
+    Place it below @api_view so etag_func sees the authenticated user.
+
+    Args:
+        etag_func: Called with the view's arguments; returns the current
+                   ETag (see make_etag) or None to skip the check
+        private: The response depends on the user, so shared caches must not keep it
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            etag = etag_func(request, *args, **kwargs)
+            if etag is None:
+                return view(request, *args, **kwargs)
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                # Errors are not tagged, so they are never revalidated
+                if response.status_code != 200:
+                    return response
+
+            response['ETag'] = etag
+            # Let browsers keep the copy but revalidate it on every use
+            patch_cache_control(response, no_cache=True)
+            if private:
+                patch_cache_control(response, private=True)
+                patch_vary_headers(response, ['Authorization'])
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,79 @@
+import json
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard library encoder is used without it
+    orjson = None
+
+# Fields of TaskSerializer, in the same order
+TASK_FIELDS = ('id', 'description', 'points', 'requires_upload', 'requires_scan')
+
+
+def dumps(data):
+    """
+    Encode data as compact JSON bytes, with orjson when it is installed.
+
+    Datetimes are written in full ISO 8601 by orjson, where Django's encoder
+    rounds them to milliseconds, so the hot list endpoints only pass plain values.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def serialize_tasks(queryset):
+    """
+    The output of TaskSerializer(queryset, many=True), read with values_list.
+
+    Returns:
+        list: Dicts of TASK_FIELDS
+    """
+    return [dict(zip(TASK_FIELDS, row)) for row in queryset.values_list(*TASK_FIELDS)]
+
+
+def serialize_leaderboard(queryset, points_field='points'):
+    """
+    The output of LeaderboardSerializer(queryset, many=True), with the
+    username joined in the same query.
+
+    Args:
+        queryset: Leaderboard entries, already ordered and sliced
+        points_field: 'points' or 'monthly_points'
+
+    Returns:
+        list: Dicts of 'user' (username) and 'points'
+    """
+    return [
+        {'user': username, 'points': points}
+        for username, points in queryset.values_list('user__username', points_field)
+    ]
+
+
+def serialize_profiles(queryset):
+    """
+    The output of ProfileSerializer(queryset, many=True) in one query, with
+    points and completed task counts joined and counted instead of being
+    queried for each profile.
+
+    Returns:
+        list: Dicts of username, email, profile_picture (URL), total_points
+              and completed_tasks
+    """
+    rows = queryset.annotate(
+        completed_count=Count('user__usertask', filter=Q(user__usertask__completed=True))
+    ).values_list('user__username', 'user__email', 'profile_picture', 'user__leaderboard__points',
+                  'completed_count')
+    return [
+        {
+            'username': username,
+            'email': email,
+            'profile_picture': default_storage.url(picture) if picture else None,
+            'total_points': points or 0,
+            'completed_tasks': completed,
+        }
+        for username, email, picture, points, completed in rows
+    ]
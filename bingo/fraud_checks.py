@@ -0,0 +1,216 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .basic_image_fraud_detector import BasicImageFraudDetector
+from .image_derivatives import generate_image_derivatives
+from .image_hash_index import signature_index
+from .profile_cache import profile_changed
+
+logger = logging.getLogger(__name__)
+
+# Similarity (0-100) at which a photo is treated as a reused image
+FRAUD_SIMILARITY_THRESHOLD = 85
+
+# Checks claimed longer ago than this are assumed lost, e.g. to a worker restart
+STALE_CHECK_AFTER = timedelta(minutes=10)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Return the process-wide thread pool that runs fraud checks off the request path."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'FRAUD_CHECK_THREADS', 2),
+                thread_name_prefix='fraud-check'
+            )
+            # Queued ahead of the first check, so no check waits on the full load
+            _executor.submit(_load_signature_index)
+        return _executor
+
+
+def _load_signature_index():
+    """Load this process's image similarity index from the stored signatures."""
+    close_old_connections()
+    try:
+        signature_index.sync()
+    except Exception:
+        logger.exception("Could not load the image similarity index")
+    finally:
+        connection.close()
+
+
+def schedule_fraud_check(user_task_id):
+    """
+    Run the fraud check for a submission in the background once the current
+    transaction commits.
+
+    With FRAUD_CHECK_IN_PROCESS disabled, checks are left in the queue for the
+    process_fraud_checks management command instead.
+    """
+    if not getattr(settings, 'FRAUD_CHECK_IN_PROCESS', True):
+        return
+
+    transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, user_task_id))
+
+
+def _run_in_thread(user_task_id):
+    """Thread pool entry point; each thread uses and then closes its own connection."""
+    close_old_connections()
+    try:
+        run_fraud_check(user_task_id)
+    except Exception:
+        logger.exception(f"Fraud check for UserTask {user_task_id} crashed")
+    finally:
+        connection.close()
+
+
+def run_fraud_check(user_task_id):
+    """
+    Score a queued submission photo against previously submitted photos.
+
+    The check is claimed atomically, so a submission is only scored once even
+    if the thread pool and the management command both pick it up. Photos
+    found to be reused are rejected, as they were when the check ran inside
+    complete_task, unless a GameKeeper has already approved the submission.
+
+    Args:
+        user_task_id: ID of the UserTask to check
+
+    Returns:
+        str: The resulting verification status, or None if the check was not claimed
+    """
+    from .models import UserTask
+
+    claimed = UserTask.objects.filter(id=user_task_id, verification_status='pending').update(
+        verification_status='checking',
+        verification_updated_at=timezone.now()
+    )
+    if not claimed:
+        return None
+
+    user_task = UserTask.objects.select_related('task').get(id=user_task_id)
+    detector = BasicImageFraudDetector(similarity_threshold=FRAUD_SIMILARITY_THRESHOLD)
+
+    try:
+        # Decode from the stored file; only a reduced-resolution bitmap is held in memory
+        with user_task.photo.open('rb') as photo:
+            signature = detector._get_image_signature(photo)
+        if not signature:
+            raise ValueError("Could not calculate image signature")
+
+        is_fraudulent, similarity, matched_task_id = detector.is_image_fraudulent(
+            None,
+            user_id=user_task.user_id,  # Full comparison against this user's submissions, hash search across all users
+            new_signature=signature,
+            current_task_id=user_task.id
+        )
+    except Exception as e:
+        logger.error(f"Error during fraud detection for UserTask {user_task_id}: {str(e)}")
+        UserTask.objects.filter(id=user_task_id, verification_status='checking').update(
+            verification_status='failed',
+            verification_updated_at=timezone.now()
+        )
+        return 'failed'
+
+    verification_status = 'flagged' if is_fraudulent else 'clear'
+    rejected = 0
+
+    with transaction.atomic():
+        detector.store_signature(user_task.id, signature)
+
+        if is_fraudulent:
+            matched_task = UserTask.objects.select_related('task').filter(id=matched_task_id).first()
+            matched_task_info = f"task '{matched_task.task.description}'" if matched_task else "unknown task"
+            rejected = UserTask.objects.filter(id=user_task.id, status='pending').update(
+                status='rejected',
+                rejection_reason=(
+                    f"This image appears to be identical or very similar to a previously submitted image "
+                    f"for {matched_task_info} ({similarity:.1f}% similar). Please take a new picture that "
+                    f"clearly shows you completing this specific task."
+                )
+            )
+            # update() skips the UserTask signals, so the profile cache is bumped here
+            if rejected:
+                profile_changed(user_task.user_id)
+
+        UserTask.objects.filter(id=user_task.id).update(
+            verification_status=verification_status,
+            fraud_score=similarity,
+            fraud_matched_task_id=matched_task_id,
+            verification_updated_at=timezone.now()
+        )
+
+    logger.info(f"Fraud check for UserTask {user_task_id}: {verification_status} ({similarity:.2f}%)")
+
+    # Resized copies are made after hashing, which must see the photo as
+    # uploaded. Rejected photos are replaced on resubmission, so none are made.
+    if not rejected:
+        save_photo_derivatives(user_task)
+    return verification_status
+
+
+def save_photo_derivatives(user_task):
+    """
+    Write the capped original, review-size copy and thumbnail of a submission
+    photo. Failures are logged and leave the photo served at full size.
+
+    The copies are only saved if the submission still holds the photo they
+    were made from; if it was resubmitted meanwhile they are deleted.
+    """
+    from .models import UserTask
+
+    original_name = user_task.photo.name
+    try:
+        changed_fields = generate_image_derivatives(user_task, 'photo')
+    except Exception as e:
+        logger.error(f"Error resizing photo for UserTask {user_task.id}: {str(e)}")
+        return
+
+    # Update only the image fields, so a GameKeeper's decision made meanwhile is kept
+    updated = UserTask.objects.filter(id=user_task.id, photo=original_name).update(
+        **{field: getattr(user_task, field).name for field in changed_fields}
+    )
+    if not updated:
+        logger.info(f"UserTask {user_task.id} photo was replaced while resizing; discarding the copies")
+        for field in changed_fields:
+            getattr(user_task, field).delete(save=False)
+
+
+def process_pending_fraud_checks(limit=None):
+    """
+    Drain the queue of submissions waiting for a fraud check, oldest first.
+
+    Args:
+        limit: Optional maximum number of checks to run
+
+    Returns:
+        int: Number of checks run
+    """
+    from .models import UserTask
+
+    # Requeue checks whose worker never finished them
+    UserTask.objects.filter(
+        verification_status='checking',
+        verification_updated_at__lt=timezone.now() - STALE_CHECK_AFTER
+    ).update(verification_status='pending')
+
+    pending_ids = UserTask.objects.filter(verification_status='pending').order_by('completion_date', 'id')
+    pending_ids = pending_ids.values_list('id', flat=True)
+    if limit:
+        pending_ids = pending_ids[:limit]
+
+    processed = 0
+    for user_task_id in list(pending_ids):
+        if run_fraud_check(user_task_id) is not None:
+            processed += 1
+    return processed
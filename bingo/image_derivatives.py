@@ -0,0 +1,150 @@
+import logging
+import os
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Longest side, in pixels, of each stored size. Uploads larger than
+# MAX_ORIGINAL_SIZE are replaced by a copy capped at that size.
+MAX_ORIGINAL_SIZE = 2048
+REVIEW_SIZE = 1280
+THUMBNAIL_SIZE = 320
+
+# Derivatives are stored as WebP, which every browser we support can display
+DERIVATIVE_FORMAT = 'WEBP'
+DERIVATIVE_EXTENSION = '.webp'
+DERIVATIVE_QUALITY = 80
+ORIGINAL_QUALITY = 88
+
+# Suffixes of the model fields holding each derivative, e.g. photo_review
+DERIVATIVE_SIZES = {
+    'review': REVIEW_SIZE,
+    'thumbnail': THUMBNAIL_SIZE,
+}
+
+
+def _open_for_resize(source, size):
+    """
+    Decode an image no larger than needed for a copy of the given size,
+    upright and in a mode WebP can store.
+    """
+    image = Image.open(source)
+    if image.format == 'JPEG':
+        image.draft('RGB', (size, size))
+
+    # Phone cameras store orientation in EXIF; apply it so derivatives display upright
+    image = ImageOps.exif_transpose(image)
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def _save_resized(field_file, name, image, size, quality):
+    """
+    Shrink an image to fit a size x size box and store it as WebP in field_file.
+    The encoded image goes through a temporary file rather than memory.
+    """
+    image = image.copy()
+    image.thumbnail((size, size), Image.LANCZOS)
+    with tempfile.TemporaryFile() as encoded:
+        image.save(encoded, format=DERIVATIVE_FORMAT, quality=quality, method=4)
+        encoded.seek(0)
+        field_file.save(name, File(encoded), save=False)
+
+
+def generate_image_derivatives(instance, field_name):
+    """
+    Write the resized copies of an uploaded image.
+
+    Creates the review-size image and thumbnail in the instance's
+    <field_name>_review and <field_name>_thumbnail fields, and replaces the
+    upload itself with a capped-size copy if it is larger than
+    MAX_ORIGINAL_SIZE. The instance's fields are updated but it is not saved.
+
+    Args:
+        instance: Model instance holding the image
+        field_name (str): Name of the ImageField holding the upload
+
+    Returns:
+        list: Names of the fields that changed, for saving with update_fields
+    """
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return []
+
+    base_name = os.path.splitext(os.path.basename(field_file.name))[0]
+
+    with field_file.open('rb') as source:
+        image = _open_for_resize(source, MAX_ORIGINAL_SIZE)
+
+    delete_image_derivatives(instance, field_name)
+    changed = []
+
+    if max(image.size) > MAX_ORIGINAL_SIZE:
+        field_file.delete(save=False)
+        _save_resized(field_file, base_name + DERIVATIVE_EXTENSION, image, MAX_ORIGINAL_SIZE, ORIGINAL_QUALITY)
+        changed.append(field_name)
+
+    for suffix, size in DERIVATIVE_SIZES.items():
+        derivative_name = f"{field_name}_{suffix}"
+        _save_resized(
+            getattr(instance, derivative_name), f"{base_name}_{suffix}{DERIVATIVE_EXTENSION}",
+            image, size, DERIVATIVE_QUALITY
+        )
+        changed.append(derivative_name)
+
+    logger.info(f"Generated image derivatives for {instance.__class__.__name__} {instance.pk}: {field_file.name}")
+    return changed
+
+
+def delete_image_derivatives(instance, field_name):
+    """
+    Delete the resized copies of an image, e.g. before replacing the upload.
+    The instance's fields are cleared but it is not saved.
+    """
+    for suffix in DERIVATIVE_SIZES:
+        derivative = getattr(instance, f"{field_name}_{suffix}")
+        if derivative:
+            derivative.delete(save=False)
+
+
+def image_url(request, instance, field_name, size='thumbnail'):
+    """
+    Absolute URL of an image at the requested size.
+
+    Falls back to the upload itself while its derivatives have not been
+    generated yet.
+
+    Args:
+        request: The current request, used to build an absolute URL
+        instance: Model instance holding the image
+        field_name (str): Name of the ImageField holding the upload
+        size (str): 'thumbnail', 'review' or 'full'
+
+    Returns:
+        str: The URL, or None if there is no image
+    """
+    field_file = getattr(instance, field_name)
+    derivative = getattr(instance, f"{field_name}_{size}") if size in DERIVATIVE_SIZES else None
+    return stored_image_url(request, field_file.name, derivative.name if derivative else None)
+
+
+def stored_image_url(request, name, derivative_name=None):
+    """
+    Absolute URL of a stored image from its file names, as read with .values().
+
+    Args:
+        request: The current request, used to build an absolute URL
+        name (str): Stored name of the upload
+        derivative_name (str): Optional stored name of the resized copy to prefer
+
+    Returns:
+        str: The URL, or None if there is no image
+    """
+    if not name:
+        return None
+    return request.build_absolute_uri(default_storage.url(derivative_name or name))
@@ -0,0 +1,206 @@
+from datetime import timedelta
+from functools import lru_cache
+from itertools import combinations
+import logging
+import threading
+import time
+
+from .basic_image_fraud_detector import HASH_BITS, hash_to_int
+
+logger = logging.getLogger(__name__)
+
+# The 256-bit hash is split into 16 bands of 16 bits. Two hashes within Hamming
+# distance r must agree to within r // BAND_COUNT bits on at least one band
+# (pigeonhole), so a search only has to probe a few values per band.
+BAND_BITS = 16
+BAND_COUNT = HASH_BITS // BAND_BITS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# Each band table maps a band value to the list of keys holding it. Photo hashes
+# are far from uniform (flat areas give whole bands of 0s or 1s), so a few
+# buckets hold many keys; adding a key is still one append per band.
+
+# Re-read signatures slightly older than the last sync so rows committed late by
+# other processes are not missed
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Seconds between reads of signatures written by other processes. Signatures
+# saved in this process reach the index straight away through signals.
+SYNC_INTERVAL = 10
+
+
+@lru_cache(maxsize=None)
+def _flip_masks(band_radius):
+    """Return every mask that flips at most band_radius bits of a band."""
+    masks = [0]
+    for flipped in range(1, band_radius + 1):
+        for bits in combinations(range(BAND_BITS), flipped):
+            mask = 0
+            for bit in bits:
+                mask |= 1 << bit
+            masks.append(mask)
+    return tuple(masks)
+
+
+def _bands(hash_value):
+    """Split a packed hash into its BAND_COUNT band values."""
+    return [(hash_value >> (band * BAND_BITS)) & BAND_MASK for band in range(BAND_COUNT)]
+
+
+class ImageHashIndex:
+    """
+    Multi-index hashing structure answering "which stored hashes are within
+    Hamming radius r of this one" without comparing against every hash.
+    """
+
+    def __init__(self):
+        self._tables = [{} for _ in range(BAND_COUNT)]
+        self._hashes = {}  # key -> packed hash
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, key):
+        return key in self._hashes
+
+    def load(self, items):
+        """
+        Replace the index contents with (key, hash) pairs in one pass.
+
+        Args:
+            items: Iterable of (key, hash) pairs; hashes may be in any stored form
+        """
+        hashes = {}
+        for key, hash_value in items:
+            hash_value = hash_to_int(hash_value)
+            if hash_value is not None:
+                hashes[key] = hash_value
+
+        tables = [{} for _ in range(BAND_COUNT)]
+        for key, hash_value in hashes.items():
+            for table, value in zip(tables, _bands(hash_value)):
+                table.setdefault(value, []).append(key)
+
+        with self._lock:
+            self._hashes = hashes
+            self._tables = tables
+
+    def add(self, key, hash_value):
+        """Add or replace the hash stored under key."""
+        hash_value = hash_to_int(hash_value)
+        if hash_value is None:
+            return
+
+        with self._lock:
+            if self._hashes.get(key) == hash_value:
+                return
+            self._remove_entries(key)
+            self._hashes[key] = hash_value
+            for table, value in zip(self._tables, _bands(hash_value)):
+                table.setdefault(value, []).append(key)
+
+    def remove(self, key):
+        """Remove the hash stored under key, if any."""
+        with self._lock:
+            self._remove_entries(key)
+
+    def _remove_entries(self, key):
+        hash_value = self._hashes.pop(key, None)
+        if hash_value is None:
+            return
+        for table, value in zip(self._tables, _bands(hash_value)):
+            bucket = table[value]
+            bucket.remove(key)
+            if not bucket:
+                del table[value]
+
+    def search(self, hash_value, radius):
+        """
+        Find every stored hash within a Hamming distance of radius.
+
+        Args:
+            hash_value: Hash to search for
+            radius (int): Maximum number of differing bits
+
+        Returns:
+            list: (key, distance) pairs ordered by increasing distance
+        """
+        hash_value = hash_to_int(hash_value)
+        if hash_value is None:
+            return []
+
+        masks = _flip_masks(radius // BAND_COUNT)
+        candidates = set()
+
+        with self._lock:
+            for table, value in zip(self._tables, _bands(hash_value)):
+                for mask in masks:
+                    bucket = table.get(value ^ mask)
+                    if bucket:
+                        candidates.update(bucket)
+
+            hashes = self._hashes
+            matches = []
+            for key in candidates:
+                distance = (hashes[key] ^ hash_value).bit_count()
+                if distance <= radius:
+                    matches.append((key, distance))
+
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+
+class StoredSignatureIndex(ImageHashIndex):
+    """
+    ImageHashIndex over ImageSignature rows, keyed by UserTask id.
+
+    The index is loaded once per process, ideally before the first check
+    (see fraud_checks), and kept current in this process by the
+    ImageSignature save/delete signals. Signatures written by other worker
+    processes are picked up by sync(), which reads only rows updated since
+    the last sync, at most every SYNC_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.loaded = False
+        self._synced_until = None
+        self._synced_at = None
+
+    def sync(self, force=False):
+        """
+        Load the index on first use, then pull in recently updated signatures.
+
+        Args:
+            force (bool): Read new rows even if the last sync was under SYNC_INTERVAL ago
+        """
+        from .models import ImageSignature
+
+        with self._lock:
+            if (self.loaded and not force and self._synced_at is not None
+                    and time.monotonic() - self._synced_at < SYNC_INTERVAL):
+                return
+
+            query = ImageSignature.objects.all()
+            if self.loaded and self._synced_until is not None:
+                query = query.filter(updated_at__gte=self._synced_until - SYNC_OVERLAP)
+
+            rows = list(query.values_list('user_task_id', 'binary_hash', 'updated_at'))
+            if not self.loaded:
+                self.load((user_task_id, binary_hash) for user_task_id, binary_hash, _ in rows)
+                self.loaded = True
+                logger.info(f"Loaded {len(self)} image hashes into the similarity index")
+            else:
+                for user_task_id, binary_hash, _ in rows:
+                    self.add(user_task_id, binary_hash)
+
+            self._synced_at = time.monotonic()
+            if rows:
+                latest = max(updated_at for _, _, updated_at in rows)
+                if self._synced_until is None or latest > self._synced_until:
+                    self._synced_until = latest
+
+
+# Process-wide index shared by all fraud checks
+signature_index = StoredSignatureIndex()
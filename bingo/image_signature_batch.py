@@ -0,0 +1,77 @@
+import logging
+
+import numpy as np
+
+from .basic_image_fraud_detector import (
+    REGION_POINTS,
+    REGION_THUMBNAIL_SIZE,
+    load_reduced_image,
+    signature_inputs,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _prepare(image):
+    """Turn a reduced image into the NumPy hash input row and region thumbnail."""
+    gray, thumbnail = signature_inputs(image)
+    return np.asarray(gray, dtype=np.uint8).reshape(-1), np.asarray(thumbnail, dtype=np.uint8)
+
+
+def compute_signatures(sources):
+    """
+    Calculate image signatures for many images at once.
+
+    Decoding is done per image at reduced resolution; hash bits and region
+    colours are then computed for the whole batch as NumPy arrays.
+
+    Args:
+        sources: Iterable of paths or binary file objects
+
+    Returns:
+        list: Signature dictionaries in the same order as sources, with None
+              for images that could not be decoded
+    """
+    results = []
+    positions = []
+    gray_rows = []
+    thumbnails = []
+    sizes = []
+
+    for source in sources:
+        try:
+            image, size = load_reduced_image(source)
+            gray, thumbnail = _prepare(image)
+        except Exception as e:
+            logger.error(f"Error decoding image {source}: {str(e)}")
+            results.append(None)
+            continue
+        positions.append(len(results))
+        results.append(None)
+        gray_rows.append(gray)
+        thumbnails.append(thumbnail)
+        sizes.append(size)
+
+    if not positions:
+        return results
+
+    # Average hash: one bit per pixel, set where the pixel is above the image mean
+    pixels = np.stack(gray_rows).astype(np.float64)
+    bits = pixels > pixels.mean(axis=1, keepdims=True)
+    packed = np.packbits(bits, axis=1)
+
+    # Region colours: a 3x3 grid of samples from each thumbnail, x outer and y inner
+    points = np.array([int(REGION_THUMBNAIL_SIZE * p) for p in REGION_POINTS])
+    xs = np.repeat(points, len(points))
+    ys = np.tile(points, len(points))
+    regions = np.stack(thumbnails)[:, ys, xs]
+
+    for position, hash_bytes, image_regions, (width, height) in zip(positions, packed, regions, sizes):
+        results[position] = {
+            'binary_hash': int.from_bytes(hash_bytes.tobytes(), 'big'),
+            'size': f"{width}x{height}",
+            'aspect_ratio': width / height,
+            'regions': [tuple(int(channel) for channel in region) for region in image_regions]
+        }
+
+    return results
@@ -0,0 +1,104 @@
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .fast_serializers import dumps, serialize_leaderboard
+
+logger = logging.getLogger(__name__)
+
+# Number of players on each cached list
+LEADERBOARD_SIZE = 10
+
+# Seconds a cached leaderboard is kept. Point changes made through
+# bingo.points refresh it straight away; this bounds how stale it can be
+# after writes that bypass it, or in other processes using a per-process cache.
+LEADERBOARD_CACHE_SECONDS = 300
+
+LEADERBOARD_CACHE_KEY = 'bingo:leaderboard'
+
+# Months with archived standings only change when the monthly reset runs or
+# a standing is saved or deleted, which drop them; the timeout is a backstop
+ARCHIVED_MONTHS_CACHE_SECONDS = 24 * 60 * 60
+ARCHIVED_MONTHS_CACHE_KEY = 'bingo:leaderboard-months'
+
+
+def build_leaderboard():
+    """
+    Read the top lifetime and monthly players from the database.
+
+    Returns:
+        dict: 'lifetime' and 'monthly' lists of {'user', 'points'}, the
+              'etag' of their content and when it last changed ('last_modified')
+    """
+    from .models import Leaderboard
+
+    lifetime = serialize_leaderboard(Leaderboard.objects.order_by('-points', 'id')[:LEADERBOARD_SIZE])
+    monthly = serialize_leaderboard(
+        Leaderboard.objects.order_by('-monthly_points', 'id')[:LEADERBOARD_SIZE], 'monthly_points'
+    )
+    return {
+        'lifetime': lifetime,
+        'monthly': monthly,
+        'etag': '"lb-' + hashlib.md5(dumps([lifetime, monthly])).hexdigest() + '"',
+        'last_modified': timezone.now(),
+    }
+
+
+def refresh_leaderboard():
+    """
+    Rebuild the cached leaderboard. If its content is unchanged, the previous
+    ETag and Last-Modified are kept so clients can keep revalidating.
+    """
+    previous = cache.get(LEADERBOARD_CACHE_KEY)
+    entry = build_leaderboard()
+    if previous and previous['etag'] == entry['etag']:
+        entry['last_modified'] = previous['last_modified']
+    cache.set(LEADERBOARD_CACHE_KEY, entry, LEADERBOARD_CACHE_SECONDS)
+    return entry
+
+
+def get_leaderboard():
+    """Return the cached leaderboard, building it on a miss or when marked stale."""
+    entry = cache.get(LEADERBOARD_CACHE_KEY)
+    if entry is None or entry.get('stale'):
+        entry = refresh_leaderboard()
+    return entry
+
+
+def leaderboard_changed():
+    """
+    Called after points or usernames change. The cached copy is marked stale
+    so reads in this transaction rebuild it, and is rebuilt once the change
+    is committed so other requests see it.
+    """
+    entry = cache.get(LEADERBOARD_CACHE_KEY)
+    if entry is not None and not entry.get('stale'):
+        entry['stale'] = True
+        cache.set(LEADERBOARD_CACHE_KEY, entry, LEADERBOARD_CACHE_SECONDS)
+    transaction.on_commit(refresh_leaderboard)
+
+
+def archived_months():
+    """
+    Months with archived standings, newest first. Cached, as listing them
+    scans the whole archive.
+
+    Returns:
+        list: Dates of the first day of each month
+    """
+    from .models import MonthlyStanding
+
+    months = cache.get(ARCHIVED_MONTHS_CACHE_KEY)
+    if months is None:
+        months = list(MonthlyStanding.objects.order_by('-month').values_list('month', flat=True).distinct())
+        cache.set(ARCHIVED_MONTHS_CACHE_KEY, months, ARCHIVED_MONTHS_CACHE_SECONDS)
+    return months
+
+
+def archived_months_changed():
+    """Called after standings are archived, so the next read lists the new month."""
+    cache.delete(ARCHIVED_MONTHS_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(ARCHIVED_MONTHS_CACHE_KEY))
@@ -0,0 +1,86 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from bingo.basic_image_fraud_detector import SIGNATURE_VERSION, hash_to_bytes
+from bingo.image_signature_batch import compute_signatures
+from bingo.models import ImageSignature, UserTask
+
+
+def _compute_chunk(paths):
+    """Worker entry point: calculate signatures for a chunk of photo paths."""
+    return compute_signatures(paths)
+
+
+class Command(BaseCommand):
+    help = 'Recalculate fraud-detection signatures for stored task photos using a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of worker processes (default: number of CPUs)')
+        parser.add_argument('--chunk-size', type=int, default=64,
+                            help='Number of photos handed to a worker at a time')
+        parser.add_argument('--all', action='store_true',
+                            help='Recalculate every signature, not only missing or outdated ones')
+
+    def handle(self, *args, **options):
+        query = UserTask.objects.exclude(photo='').exclude(photo__isnull=True)
+        if not options['all']:
+            query = query.exclude(image_signature__version=SIGNATURE_VERSION)
+
+        # Workers only read files; all database access stays in this process
+        jobs = []
+        missing_files = 0
+        for user_task_id, photo_name in query.values_list('id', 'photo').iterator():
+            path = os.path.join(settings.MEDIA_ROOT, photo_name)
+            if os.path.exists(path):
+                jobs.append((user_task_id, path))
+            else:
+                missing_files += 1
+
+        self.stdout.write(f"Found {len(jobs)} photos to process ({missing_files} files missing)")
+        if not jobs:
+            return
+
+        chunk_size = max(1, options['chunk_size'])
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+        started = time.monotonic()
+        stored = 0
+        failed = 0
+
+        with ProcessPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            path_chunks = [[path for _, path in chunk] for chunk in chunks]
+            for chunk, signatures in zip(chunks, executor.map(_compute_chunk, path_chunks)):
+                rows = []
+                now = timezone.now()
+                for (user_task_id, _), signature in zip(chunk, signatures):
+                    if signature is None:
+                        failed += 1
+                        continue
+                    rows.append(ImageSignature(
+                        user_task_id=user_task_id,
+                        binary_hash=hash_to_bytes(signature['binary_hash']),
+                        aspect_ratio=signature['aspect_ratio'],
+                        regions=[list(region) for region in signature['regions']],
+                        version=SIGNATURE_VERSION,
+                        updated_at=now
+                    ))
+
+                ImageSignature.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=['user_task'],
+                    update_fields=['binary_hash', 'aspect_ratio', 'regions', 'version', 'updated_at']
+                )
+                stored += len(rows)
+                self.stdout.write(f"Stored {stored}/{len(jobs)} signatures")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {stored} signatures in {elapsed:.1f}s ({failed} photos could not be decoded)"
+        ))
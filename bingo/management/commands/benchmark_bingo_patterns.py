@@ -0,0 +1,85 @@
+import random
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from bingo.bingo_patterns import SUPPORTED_BOARD_SIZES, BingoPatternDetector
+
+
+def legacy_detect_patterns(grid, size=3):
+    """
+    The list-of-lists pattern checks BingoPatternDetector used before boards
+    became bitmasks, kept as the benchmark baseline. Only correct for 3x3.
+    """
+    patterns = []
+
+    o_complete = all(grid[0][col] and grid[size - 1][col] for col in range(size)) and \
+        all(grid[row][0] and grid[row][size - 1] for row in range(1, size - 1))
+    if o_complete:
+        patterns.append("O")
+
+    if grid[0][0] and grid[0][size - 1] and grid[size - 1][0] and grid[size - 1][size - 1] and grid[1][1]:
+        patterns.append("X")
+
+    for row in range(size):
+        all_completed = True
+        for col in range(size):
+            if not grid[row][col]:
+                all_completed = False
+                break
+        if all_completed:
+            patterns.append("HORIZ")
+            break
+
+    for col in range(size):
+        all_completed = True
+        for row in range(size):
+            if not grid[row][col]:
+                all_completed = False
+                break
+        if all_completed:
+            patterns.append("VERT")
+            break
+
+    return patterns
+
+
+class Command(BaseCommand):
+    help = 'Compare the speed of bitmask bingo pattern detection with the old grid-based checks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=1000,
+                            help='Number of random boards per run')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Number of timed runs; the fastest is reported')
+
+    def time_per_board(self, func, boards, repeat):
+        seconds = min(timeit.repeat(lambda: [func(board) for board in boards], number=1, repeat=repeat))
+        return seconds / len(boards) * 1e6
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        count = options['boards']
+        repeat = options['repeat']
+
+        for size in SUPPORTED_BOARD_SIZES:
+            masks = [rng.getrandbits(size * size) for _ in range(count)]
+            grids = [[[bool(mask >> (row * size + col) & 1) for col in range(size)] for row in range(size)]
+                     for mask in masks]
+
+            bitmask_us = self.time_per_board(
+                lambda mask: BingoPatternDetector.detect_patterns_from_mask(mask, size), masks, repeat
+            )
+            line = f"{size}x{size}: bitmask {bitmask_us:.2f} us/board"
+
+            # The old checks are hard-coded for 3x3 boards
+            if size == 3:
+                for mask, grid in zip(masks, grids):
+                    if legacy_detect_patterns(grid) != BingoPatternDetector.detect_patterns_from_mask(mask):
+                        raise AssertionError(f"Detectors disagree on board {mask:09b}")
+                legacy_us = self.time_per_board(legacy_detect_patterns, grids, repeat)
+                line += f", grid {legacy_us:.2f} us/board ({legacy_us / bitmask_us:.1f}x)"
+
+            self.stdout.write(line)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,85 @@
+import random
+import timeit
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from bingo.basic_image_fraud_detector import HASH_BITS, HASH_SIZE, hash_to_int
+from bingo.image_hash_index import ImageHashIndex
+from bingo.models import ImageSignature
+
+# Side of the random grid each synthetic image is interpolated from
+COARSE_SIZE = 4
+
+
+def clustered_hashes(count, seed=0, noise=0.05):
+    """
+    Average hashes of smooth synthetic images, which like real photo hashes
+    have long runs of equal bits, so many hashes share each band value.
+
+    Each image is a COARSE_SIZE square of random brightness, interpolated up
+    to HASH_SIZE with a little noise, and thresholded at its mean.
+    """
+    rng = np.random.default_rng(seed)
+    coarse = rng.random((count, COARSE_SIZE, COARSE_SIZE))
+    x = np.linspace(0, COARSE_SIZE - 1, HASH_SIZE)
+    weights = np.maximum(0, 1 - np.abs(x[:, None] - np.arange(COARSE_SIZE)[None, :]))
+    pixels = weights @ coarse @ weights.T + rng.normal(0, noise, (count, HASH_SIZE, HASH_SIZE))
+    pixels = pixels.reshape(count, HASH_BITS)
+    packed = np.packbits(pixels > pixels.mean(axis=1, keepdims=True), axis=1)
+    return [int.from_bytes(row.tobytes(), 'big') for row in packed]
+
+
+class Command(BaseCommand):
+    help = ('Time image hash index searches and inserts on clustered synthetic hashes, '
+            'or on the stored photo signatures with --stored')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hashes', type=int, default=100000,
+                            help='Number of synthetic hashes to index')
+        parser.add_argument('--stored', action='store_true',
+                            help='Index the stored ImageSignature hashes instead')
+        parser.add_argument('--radius', type=int, default=38,
+                            help='Search radius in bits (38 is the 85%% fraud threshold)')
+        parser.add_argument('--queries', type=int, default=200,
+                            help='Number of searches to time')
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        radius = options['radius']
+
+        if options['stored']:
+            hashes = [hash_to_int(value) for value in ImageSignature.objects.values_list('binary_hash', flat=True)]
+            hashes = [value for value in hashes if value is not None]
+            if not hashes:
+                self.stdout.write("No stored signatures to index")
+                return
+        else:
+            hashes = clustered_hashes(options['hashes'])
+
+        index = ImageHashIndex()
+        load_s = timeit.timeit(lambda: index.load(enumerate(hashes, 1)), number=1)
+        self.stdout.write(f"Loaded {len(index)} hashes in {load_s * 1000:.0f} ms")
+
+        # Search for near copies of indexed hashes, a few bits flipped each
+        queries = []
+        for _ in range(options['queries']):
+            query = rng.choice(hashes)
+            for bit in rng.sample(range(HASH_BITS), radius // 4):
+                query ^= 1 << bit
+            queries.append(query)
+
+        brute_force = sorted(key for key, value in enumerate(hashes, 1) if (value ^ queries[0]).bit_count() <= radius)
+        if sorted(key for key, _ in index.search(queries[0], radius)) != brute_force:
+            raise AssertionError("Index search disagrees with a full scan")
+
+        search_s = timeit.timeit(lambda: [index.search(query, radius) for query in queries], number=1)
+        self.stdout.write(f"Search (radius {radius}): {search_s / len(queries) * 1000:.2f} ms")
+
+        first_key = len(hashes) + 1
+        add_s = timeit.timeit(
+            lambda: [index.add(first_key + offset, query) for offset, query in enumerate(queries)], number=1
+        )
+        self.stdout.write(f"Add: {add_s / len(queries) * 1e6:.1f} us")
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
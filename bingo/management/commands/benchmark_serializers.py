@@ -0,0 +1,86 @@
+import json
+import timeit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from bingo import fast_serializers
+from bingo.models import Leaderboard, Profile, Task
+from bingo.serializers import LeaderboardSerializer, ProfileSerializer, TaskSerializer
+
+# Marks the rows created for the benchmark
+PREFIX = 'benchmark-'
+
+
+class Command(BaseCommand):
+    help = ('Compare the speed of the fast list serializers with the DRF serializers. '
+            'Rows are created in a transaction that is rolled back afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000],
+                            help='Row counts to benchmark')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Number of timed runs; the fastest is reported')
+
+    def create_rows(self, count):
+        User = get_user_model()
+        Task.objects.bulk_create(
+            Task(description=f"{PREFIX}{i}", points=i % 50, requires_upload=bool(i % 2)) for i in range(count)
+        )
+        User.objects.bulk_create(
+            User(username=f"{PREFIX}{i}", email=f"{PREFIX}{i}@exeter.ac.uk") for i in range(count)
+        )
+        users = list(User.objects.filter(username__startswith=PREFIX))
+        Leaderboard.objects.bulk_create(Leaderboard(user=user, points=i) for i, user in enumerate(users))
+        Profile.objects.bulk_create(Profile(user=user) for user in users)
+
+    def compare(self, name, drf, fast, repeat):
+        """Check both produce the same JSON, then report the fastest run of each."""
+        if json.loads(drf()) != json.loads(fast()):
+            raise AssertionError(f"{name}: fast serializer output differs from DRF")
+        drf_ms = min(timeit.repeat(drf, number=1, repeat=repeat)) * 1000
+        fast_ms = min(timeit.repeat(fast, number=1, repeat=repeat)) * 1000
+        return f"{name} DRF {drf_ms:.1f} ms, fast {fast_ms:.1f} ms ({drf_ms / fast_ms:.1f}x)"
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        renderer = JSONRenderer()
+        encoder = 'orjson' if fast_serializers.orjson is not None else 'json'
+        self.stdout.write(f"Encoding with {encoder}")
+
+        for count in options['rows']:
+            with transaction.atomic():
+                self.create_rows(count)
+                tasks = Task.objects.filter(description__startswith=PREFIX).order_by('id')
+                entries = Leaderboard.objects.filter(user__username__startswith=PREFIX).order_by('-points', 'id')
+                profiles = Profile.objects.filter(user__username__startswith=PREFIX).order_by('id')
+
+                lines = [
+                    self.compare(
+                        'tasks',
+                        lambda: renderer.render(TaskSerializer(tasks, many=True).data),
+                        lambda: fast_serializers.dumps(fast_serializers.serialize_tasks(tasks)),
+                        repeat,
+                    ),
+                    self.compare(
+                        'leaderboard',
+                        lambda: renderer.render(LeaderboardSerializer(entries.select_related('user'), many=True).data),
+                        lambda: fast_serializers.dumps(fast_serializers.serialize_leaderboard(entries)),
+                        repeat,
+                    ),
+                    # ProfileSerializer runs two queries per profile
+                    self.compare(
+                        'profiles',
+                        lambda: renderer.render(ProfileSerializer(profiles.select_related('user'), many=True).data),
+                        lambda: fast_serializers.dumps(fast_serializers.serialize_profiles(profiles)),
+                        repeat,
+                    ),
+                ]
+                transaction.set_rollback(True)
+
+            for line in lines:
+                self.stdout.write(f"{count} rows: {line}")
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
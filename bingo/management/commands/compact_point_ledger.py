@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from bingo.models import Leaderboard, Profile
+from bingo.points import compact_point_ledger, ledger_totals
+
+
+class Command(BaseCommand):
+    help = 'Snapshot per-user point totals for each complete month of the point ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Report users whose stored totals differ from the ledger')
+
+    def handle(self, *args, **options):
+        compacted = compact_point_ledger()
+        for month, count in compacted:
+            self.stdout.write(f"{month:%Y-%m}: {count} snapshots")
+
+        if options['check']:
+            totals = ledger_totals()
+            stored = {
+                user_id: {'points': points, 'monthly_points': monthly_points, 'total_points': 0}
+                for user_id, points, monthly_points in Leaderboard.objects.values_list('user_id', 'points', 'monthly_points')
+            }
+            for user_id, total_points in Profile.objects.values_list('user_id', 'total_points'):
+                stored.setdefault(user_id, {'points': 0, 'monthly_points': 0, 'total_points': 0})
+                stored[user_id]['total_points'] = total_points
+
+            empty = {'points': 0, 'monthly_points': 0, 'total_points': 0}
+            drifted = 0
+            for user_id in sorted(totals.keys() | stored.keys()):
+                expected = totals.get(user_id, empty)
+                actual = stored.get(user_id, empty)
+                if expected != actual:
+                    drifted += 1
+                    self.stdout.write(f"User {user_id}: stored {actual}, ledger {expected}")
+            self.stdout.write(f"{drifted} users differ from the ledger")
+
+        self.stdout.write(self.style.SUCCESS(f"Compacted {len(compacted)} months"))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bingo.fraud_checks import process_pending_fraud_checks
+from bingo.image_hash_index import signature_index
+
+
+class Command(BaseCommand):
+    help = 'Run queued photo fraud checks for submitted tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Maximum number of checks to run per pass')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling the queue instead of exiting once it is empty')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds to wait between polls when looping')
+
+    def handle(self, *args, **options):
+        if options['loop']:
+            # Load the similarity index once, before the first check needs it
+            signature_index.sync()
+
+        while True:
+            processed = process_pending_fraud_checks(limit=options['limit'])
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f"Processed {processed} fraud checks"))
+
+            if not options['loop']:
+                if not processed:
+                    self.stdout.write("No fraud checks waiting")
+                return
+
+            if not processed:
+                time.sleep(options['interval'])
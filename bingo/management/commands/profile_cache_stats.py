@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from bingo.profile_cache import STATS_FLUSH_EVERY, reset_profile_cache_stats, shared_profile_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Report the hit rate of the per-user profile cache across all workers sharing the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Start the counts again from zero after reporting them')
+
+    def handle(self, *args, **options):
+        stats = shared_profile_cache_stats()
+        lookups = stats['hits'] + stats['misses']
+        if lookups:
+            self.stdout.write(f"{stats['hits']} hits, {stats['misses']} misses "
+                              f"({stats['hits'] / lookups:.1%} hit rate)")
+        else:
+            self.stdout.write("No profile lookups counted yet")
+        self.stdout.write(f"Each worker adds its counts every {STATS_FLUSH_EVERY} lookups")
+
+        if options['reset']:
+            reset_profile_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counts reset"))
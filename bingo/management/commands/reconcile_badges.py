@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from bingo.bingo_board import get_board_layout, rebuild_completion_mask
+from bingo.bingo_patterns import BingoPatternDetector
+from bingo.models import Leaderboard, Profile, UserBadge
+from bingo.views import check_and_award_patterns, user_rank
+
+
+class Command(BaseCommand):
+    help = ('Rebuild board completion masks and award badges for patterns completed before '
+            'badges were awarded at approval time')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', dest='username', default=None,
+                            help='Only reconcile this username')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report missing badges without awarding them')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        dry_run = options['dry_run']
+
+        users = User.objects.filter(usertask__completed=True).distinct().order_by('id')
+        if options['username']:
+            users = users.filter(username=options['username'])
+
+        layout = get_board_layout()
+        checked = 0
+        missing_total = 0
+        awarded = 0
+
+        for user in users.iterator():
+            checked += 1
+            profile, _ = Profile.objects.get_or_create(user=user)
+            mask = rebuild_completion_mask(user.id, layout)
+
+            detected = BingoPatternDetector.detect_patterns_from_mask(mask, size=layout.size)
+            existing = set(UserBadge.objects.filter(user=user).values_list('pattern__pattern_type', flat=True))
+            missing = [pattern_type for pattern_type in detected if pattern_type not in existing]
+
+            if missing:
+                missing_total += len(missing)
+                self.stdout.write(f"{user.username}: missing {', '.join(missing)}")
+                if not dry_run:
+                    new_patterns, _ = check_and_award_patterns(user)
+                    awarded += len(new_patterns)
+
+            # The stored rank is no longer refreshed by profile reads
+            if not dry_run:
+                points = Leaderboard.objects.filter(user=user).values_list('points', flat=True).first() or 0
+                rank = user_rank(points)
+                if profile.rank != rank:
+                    Profile.objects.filter(id=profile.id).update(rank=rank)
+
+        summary = f"Checked {checked} users, found {missing_total} missing badges"
+        if not dry_run:
+            summary += f", awarded {awarded}"
+        self.stdout.write(self.style.SUCCESS(summary))
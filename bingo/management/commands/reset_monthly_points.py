@@ -1,18 +1,18 @@
 #!/usr/bin/env python3
 # 
 from django.core.management.base import BaseCommand
-from django.utils.timezone import now
-from bingo.models import Leaderboard
+from bingo.points import reset_monthly_points
 
 class Command(BaseCommand):
-    help = "Resets the monthly points of all players at the start of a new month."
+    help = ("Archives last month's standings and resets the monthly points of all players. "
+            "Players already reset this month are skipped, so it is safe to run daily.")
 
     def handle(self, *args, **kwargs):
-        today = now().date()
-        if today.day == 1:  # Only reset on the 1st of the month
-            players = Leaderboard.objects.all()
-            for player in players:
-                player.reset_monthly_points()
-            self.stdout.write(self.style.SUCCESS("Successfully reset monthly leaderboard."))
+        month, archived, reset = reset_monthly_points()
+        if reset:
+            self.stdout.write(self.style.SUCCESS(
+                f"Successfully reset monthly leaderboard: {reset} players reset, "
+                f"{archived} standings archived for {month:%Y-%m}."
+            ))
         else:
-            self.stdout.write(self.style.WARNING("Today is not the 1st day of the month. Skipping reset."))
+            self.stdout.write(self.style.WARNING("Monthly leaderboard already reset this month. Skipping reset."))
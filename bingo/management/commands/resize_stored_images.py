@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from bingo.fraud_checks import save_photo_derivatives
+from bingo.image_derivatives import generate_image_derivatives
+from bingo.models import Profile, UserTask
+from bingo.profile_cache import profile_changed
+
+
+class Command(BaseCommand):
+    help = 'Create resized copies and thumbnails for stored photos and profile pictures that lack them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Maximum number of images of each kind to process')
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+
+        user_tasks = UserTask.objects.exclude(photo='').exclude(photo__isnull=True).filter(
+            photo_thumbnail__isnull=True
+        ).order_by('id')[:limit]
+        task_count = 0
+        for user_task in user_tasks.iterator():
+            save_photo_derivatives(user_task)
+            task_count += 1
+
+        profiles = Profile.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True).filter(
+            profile_picture_thumbnail__isnull=True
+        ).order_by('id')[:limit]
+        profile_count = 0
+        for profile in profiles.iterator():
+            try:
+                changed_fields = generate_image_derivatives(profile, 'profile_picture')
+            except Exception as e:
+                self.stderr.write(f"Could not resize profile picture for {profile}: {str(e)}")
+                continue
+            Profile.objects.filter(id=profile.id).update(
+                **{field: getattr(profile, field).name for field in changed_fields}
+            )
+            profile_changed(profile.user_id)
+            profile_count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Resized {task_count} task photos and {profile_count} profile pictures"
+        ))
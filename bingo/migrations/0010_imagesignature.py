@@ -0,0 +1,39 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0009_passwordresettoken"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageSignature",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("binary_hash", models.CharField(max_length=256)),
+                ("regions", models.JSONField(default=list)),
+                ("aspect_ratio", models.FloatField()),
+                ("created_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user_task",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="image_signature",
+                        to="bingo.usertask",
+                    ),
+                ),
+            ],
+        ),
+    ]
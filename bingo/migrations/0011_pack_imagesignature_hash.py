@@ -0,0 +1,56 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:10
+
+from django.db import migrations, models
+
+
+def pack_binary_hashes(apps, schema_editor):
+    """Convert stored '0'/'1' hash strings into packed 32-byte values."""
+    ImageSignature = apps.get_model("bingo", "ImageSignature")
+    for signature in ImageSignature.objects.all().iterator():
+        try:
+            packed = int(signature.legacy_binary_hash, 2).to_bytes(32, "big")
+        except (TypeError, ValueError, OverflowError):
+            # Unreadable signatures are dropped and rebuilt from the photo on demand
+            signature.delete()
+            continue
+        signature.binary_hash = packed
+        signature.save(update_fields=["binary_hash"])
+
+
+def unpack_binary_hashes(apps, schema_editor):
+    """Convert packed hashes back into '0'/'1' strings."""
+    ImageSignature = apps.get_model("bingo", "ImageSignature")
+    for signature in ImageSignature.objects.all().iterator():
+        value = int.from_bytes(bytes(signature.binary_hash), "big")
+        signature.legacy_binary_hash = format(value, "0256b")
+        signature.save(update_fields=["legacy_binary_hash"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0010_imagesignature"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="imagesignature",
+            old_name="binary_hash",
+            new_name="legacy_binary_hash",
+        ),
+        migrations.AlterField(
+            model_name="imagesignature",
+            name="legacy_binary_hash",
+            field=models.CharField(max_length=256, null=True),
+        ),
+        migrations.AddField(
+            model_name="imagesignature",
+            name="binary_hash",
+            field=models.BinaryField(default=bytes(32), max_length=32),
+            preserve_default=False,
+        ),
+        migrations.RunPython(pack_binary_hashes, unpack_binary_hashes),
+        migrations.RemoveField(
+            model_name="imagesignature",
+            name="legacy_binary_hash",
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0011_pack_imagesignature_hash"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="imagesignature",
+            old_name="created_at",
+            new_name="updated_at",
+        ),
+        migrations.AlterField(
+            model_name="imagesignature",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
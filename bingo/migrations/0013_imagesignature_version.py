@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0012_imagesignature_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="imagesignature",
+            name="version",
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0013_imagesignature_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usertask",
+            name="fraud_matched_task",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="bingo.usertask",
+            ),
+        ),
+        migrations.AddField(
+            model_name="usertask",
+            name="fraud_score",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="usertask",
+            name="verification_status",
+            field=models.CharField(
+                choices=[
+                    ("not_required", "Not Required"),
+                    ("pending", "Pending Verification"),
+                    ("checking", "Checking"),
+                    ("clear", "Clear"),
+                    ("flagged", "Flagged"),
+                    ("failed", "Check Failed"),
+                ],
+                db_index=True,
+                default="not_required",
+                max_length=12,
+            ),
+        ),
+        migrations.AddField(
+            model_name="usertask",
+            name="verification_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0014_usertask_fraud_verification"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="profile_picture_review",
+            field=models.ImageField(
+                blank=True, null=True, upload_to="profile_pics/review/"
+            ),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="profile_picture_thumbnail",
+            field=models.ImageField(
+                blank=True, null=True, upload_to="profile_pics/thumbnails/"
+            ),
+        ),
+        migrations.AddField(
+            model_name="usertask",
+            name="photo_review",
+            field=models.ImageField(
+                blank=True, null=True, upload_to="task_photos/review/"
+            ),
+        ),
+        migrations.AddField(
+            model_name="usertask",
+            name="photo_thumbnail",
+            field=models.ImageField(
+                blank=True, null=True, upload_to="task_photos/thumbnails/"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0015_image_derivatives"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usertask",
+            index=models.Index(
+                fields=["status", "completion_date", "id"],
+                name="usertask_review_queue_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usertask",
+            index=models.Index(
+                fields=["status", "task", "completion_date", "id"],
+                name="usertask_task_review_idx",
+            ),
+        ),
+    ]
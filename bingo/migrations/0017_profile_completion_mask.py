@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0016_usertask_review_queue_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="completion_board",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="completion_mask",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_board(apps, schema_editor):
+    """Place the tasks the board used to be derived from, the first 9 by id, on a board."""
+    Board = apps.get_model("bingo", "Board")
+    BoardCell = apps.get_model("bingo", "BoardCell")
+    Task = apps.get_model("bingo", "Task")
+
+    task_ids = list(Task.objects.order_by("id").values_list("id", flat=True)[:9])
+    if not task_ids:
+        return
+    board = Board.objects.create(size=3)
+    BoardCell.objects.bulk_create(
+        BoardCell(board=board, position=position, task_id=task_id)
+        for position, task_id in enumerate(task_ids)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0017_profile_completion_mask"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Board",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(default="Main board", max_length=100)),
+                (
+                    "size",
+                    models.PositiveSmallIntegerField(
+                        choices=[(3, "3x3"), (4, "4x4"), (5, "5x5")], default=3
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(default=1)),
+                ("is_active", models.BooleanField(db_index=True, default=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="BoardCell",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.PositiveSmallIntegerField()),
+                (
+                    "board",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cells",
+                        to="bingo.board",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="board_cells",
+                        to="bingo.task",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["board", "position"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("board", "position"), name="boardcell_unique_position"
+                    ),
+                    models.UniqueConstraint(
+                        fields=("board", "task"), name="boardcell_unique_task"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(create_board, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,170 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:40
+
+from datetime import datetime, timedelta
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def record_opening_balances(apps, schema_editor):
+    """
+    Start the ledger from the stored totals. Points from before this month are
+    dated just before it starts, so they fall into last month's snapshot.
+    Monthly points are dated in the month of the entry's last reset: if that
+    was before this month, the reset still due must archive them, not carry
+    them into the new month.
+    """
+    Leaderboard = apps.get_model("bingo", "Leaderboard")
+    Profile = apps.get_model("bingo", "Profile")
+    PointEvent = apps.get_model("bingo", "PointEvent")
+
+    today = timezone.localdate()
+    this_month = timezone.make_aware(datetime(today.year, today.month, 1))
+    before_this_month = this_month - timedelta(seconds=1)
+
+    task_points = dict(Profile.objects.values_list("user_id", "total_points"))
+    totals = {
+        user_id: (points, monthly_points, last_reset)
+        for user_id, points, monthly_points, last_reset in Leaderboard.objects.values_list(
+            "user_id", "points", "monthly_points", "last_reset"
+        )
+    }
+
+    events = []
+    for user_id in task_points.keys() | totals.keys():
+        points, monthly_points, last_reset = totals.get(user_id, (0, 0, today))
+        user_task_points = task_points.get(user_id, 0)
+        monthly_dated = this_month
+        if last_reset < today.replace(day=1):
+            monthly_dated = timezone.make_aware(datetime(last_reset.year, last_reset.month, 1))
+        for amount, kind, created_at in (
+            (user_task_points, "task", before_this_month),
+            (
+                points - monthly_points - user_task_points,
+                "adjustment",
+                before_this_month,
+            ),
+            (monthly_points, "adjustment", monthly_dated),
+        ):
+            if amount:
+                events.append(
+                    PointEvent(
+                        user_id=user_id,
+                        points=amount,
+                        kind=kind,
+                        reason="Opening balance",
+                        created_at=created_at,
+                    )
+                )
+    PointEvent.objects.bulk_create(events, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0018_board_layout"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PointEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("points", models.IntegerField()),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("task", "Task completed"),
+                            ("pattern", "Bingo pattern"),
+                            ("bonus", "Bonus"),
+                            ("adjustment", "Adjustment"),
+                        ],
+                        default="task",
+                        max_length=10,
+                    ),
+                ),
+                ("reason", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="bingo.task",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="point_events",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "created_at"],
+                        name="pointevent_user_created_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PointSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("points", models.IntegerField(default=0)),
+                ("lifetime_points", models.IntegerField(default=0)),
+                ("lifetime_task_points", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="point_snapshots",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["month"], name="pointsnapshot_month_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "month"), name="pointsnapshot_unique_month"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(record_opening_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0019_point_ledger"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyStanding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("points", models.IntegerField()),
+                ("rank", models.PositiveIntegerField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_standings",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "month"), name="monthlystanding_unique_month"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0020_monthly_standing"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="monthlystanding",
+            index=models.Index(
+                fields=["month", "-points"], name="monthlystanding_top_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0021_monthly_standing_top_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="leaderboard",
+            index=models.Index(fields=["-points", "id"], name="leaderboard_points_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="leaderboard",
+            index=models.Index(
+                fields=["-monthly_points", "id"], name="leaderboard_monthly_idx"
+            ),
+        ),
+    ]
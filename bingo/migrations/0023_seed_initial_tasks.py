@@ -0,0 +1,48 @@
+import json
+import os
+
+from django.core.management.color import no_style
+from django.db import migrations
+
+
+def seed_initial_tasks(apps, schema_editor):
+    """
+    Load the tasks in initial_data.json into an empty database and place
+    them on the board, which the task list used to do on its first request.
+    """
+    Task = apps.get_model("bingo", "Task")
+    Board = apps.get_model("bingo", "Board")
+    BoardCell = apps.get_model("bingo", "BoardCell")
+
+    if Task.objects.exists():
+        return
+
+    json_file_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "initial_data.json")
+    with open(json_file_path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    tasks = Task.objects.bulk_create(Task(id=item["pk"], **item["fields"]) for item in data)
+
+    # Explicit ids do not advance the id sequence on PostgreSQL
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Task]):
+            cursor.execute(sql)
+
+    # The newest active board, as bingo_board.active_board() picks
+    board = Board.objects.filter(is_active=True).order_by("-id").first() or Board.objects.create(size=3)
+    used = set(BoardCell.objects.filter(board=board).values_list("position", flat=True))
+    free = [position for position in range(board.size * board.size) if position not in used]
+    BoardCell.objects.bulk_create(
+        BoardCell(board=board, position=position, task_id=task.id)
+        for position, task in zip(free, sorted(tasks, key=lambda task: task.id))
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bingo", "0022_leaderboard_points_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_initial_tasks, migrations.RunPython.noop),
+    ]
@@ -105,10 +105,24 @@ class Profile(models.Model):
         null=True,
         blank=True
     )  # Allows users to upload a profile picture
+    profile_picture_review = models.ImageField(
+        upload_to='profile_pics/review/',
+        null=True,
+        blank=True
+    )  # Resized copy of the profile picture for larger displays
+    profile_picture_thumbnail = models.ImageField(
+        upload_to='profile_pics/thumbnails/',
+        null=True,
+        blank=True
+    )  # Small copy of the profile picture, returned by default
 
     rank = models.CharField(max_length=50, default="Unranked")  # Stores the user's rank in the game
     total_points = models.IntegerField(default=0)  # Stores total points earned by the user
 
+    # Bitmask of the completed cells on the bingo board, bit i for the i-th board task
+    completion_mask = models.IntegerField(null=True, blank=True)  # Null until first built
+    completion_board = models.CharField(max_length=255, blank=True, default='')  # Key of the board layout the mask was built for
+
     def __str__(self):
         """Returns the username as the string representation of the profile."""
         return self.user.username
@@ -131,6 +145,49 @@ class Task(models.Model):
         return self.description
 
 
+# Board Models
+
+class Board(models.Model):
+    """
+    The bingo board players complete, laid out as size x size cells.
+    The version is bumped whenever a cell changes, so cached layouts and
+    completion masks built for an older layout can be recognised.
+    """
+    SIZE_CHOICES = [
+        (3, '3x3'),
+        (4, '4x4'),
+        (5, '5x5'),
+    ]
+
+    name = models.CharField(max_length=100, default='Main board')  # Display name for the admin
+    size = models.PositiveSmallIntegerField(choices=SIZE_CHOICES, default=3)  # Cells per row and column
+    version = models.PositiveIntegerField(default=1)  # Bumped whenever the board's cells change
+    is_active = models.BooleanField(default=True, db_index=True)  # The newest active board is the one played
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.size}x{self.size}, v{self.version})"
+
+
+class BoardCell(models.Model):
+    """
+    Places a task on a board cell. Cell (row, col) is position row * size + col.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='cells')
+    position = models.PositiveSmallIntegerField()  # row * board.size + col
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='board_cells')
+
+    class Meta:
+        ordering = ['board', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'position'], name='boardcell_unique_position'),
+            models.UniqueConstraint(fields=['board', 'task'], name='boardcell_unique_task'),
+        ]
+
+    def __str__(self):
+        return f"{self.board.name} cell {self.position}: {self.task}"
+
+
 # UserTask Model
 
 class UserTask(models.Model):
@@ -139,6 +196,14 @@ class UserTask(models.Model):
         ('approved', 'Approved'),
         ('rejected', 'Rejected')
     ]
+    VERIFICATION_CHOICES = [
+        ('not_required', 'Not Required'),  # No photo to check
+        ('pending', 'Pending Verification'),  # Queued for the background fraud check
+        ('checking', 'Checking'),  # Claimed by a fraud-check worker
+        ('clear', 'Clear'),
+        ('flagged', 'Flagged'),  # Too similar to a previously submitted photo
+        ('failed', 'Check Failed')
+    ]
     """
     Model representing a user's progress on specific tasks.
     Tracks task completion and stores proof (photo) if required.
@@ -159,14 +224,46 @@ class UserTask(models.Model):
         blank=True,
         null=True
     )  # Stores a photo if required for verification
+    photo_review = models.ImageField(
+        upload_to='task_photos/review/',
+        blank=True,
+        null=True
+    )  # Resized copy of the photo for GameKeeper review
+    photo_thumbnail = models.ImageField(
+        upload_to='task_photos/thumbnails/',
+        blank=True,
+        null=True
+    )  # Small copy of the photo for the review grid
 
     completion_date = models.DateTimeField(auto_now_add=True)  # Timestamp of task completion
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     approval_date = models.DateTimeField(null=True, blank=True)
     rejection_reason = models.TextField(blank=True, null=True)
 
+    # Result of the background photo fraud check
+    verification_status = models.CharField(
+        max_length=12,
+        choices=VERIFICATION_CHOICES,
+        default='not_required',
+        db_index=True
+    )
+    fraud_score = models.FloatField(null=True, blank=True)  # Highest similarity to a previous photo (0-100)
+    fraud_matched_task = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )  # The submission the photo was most similar to
+    verification_updated_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         unique_together = ('user', 'task')
+        indexes = [
+            # Keyset pagination of the GameKeeper review queue, overall and per task
+            models.Index(fields=['status', 'completion_date', 'id'], name='usertask_review_queue_idx'),
+            models.Index(fields=['status', 'task', 'completion_date', 'id'], name='usertask_task_review_idx'),
+        ]
 
 
 # Leaderboard Model
@@ -176,9 +273,16 @@ class Leaderboard(models.Model):
 
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     points = models.IntegerField(default=0)  # Lifetime points
-    monthly_points = models.IntegerField(default=0)  # Monthly points
+    monthly_points = models.IntegerField(default=0)  # Points of every kind earned this month, bonuses included
     last_reset = models.DateField(default=now)  # Stores the last reset date
 
+    class Meta:
+        indexes = [
+            # Top-N lists read these in leaderboard order
+            models.Index(fields=['-points', 'id'], name='leaderboard_points_idx'),
+            models.Index(fields=['-monthly_points', 'id'], name='leaderboard_monthly_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.points} Lifetime Points | {self.monthly_points} Monthly Points"
 
@@ -189,6 +293,93 @@ class Leaderboard(models.Model):
         self.save()
 
 
+class MonthlyStanding(models.Model):
+    """
+    A user's monthly points and leaderboard position, archived when the
+    monthly leaderboard is reset.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='monthly_standings')
+    month = models.DateField()  # First day of the month the standing is for
+    points = models.IntegerField()  # Monthly points at the reset
+    rank = models.PositiveIntegerField()  # Position on that month's leaderboard; ties share a rank
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month'], name='monthlystanding_unique_month'),
+        ]
+        indexes = [
+            # A month's top N reads the first N entries of this index
+            models.Index(fields=['month', '-points'], name='monthlystanding_top_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.month:%Y-%m}: #{self.rank} with {self.points} points"
+
+
+class PointEvent(models.Model):
+    """
+    Append-only ledger of points awarded. Leaderboard and Profile point
+    totals are kept in step with it by bingo.points; PointSnapshot rows
+    compact it per month.
+    """
+    TASK = 'task'
+    PATTERN = 'pattern'
+    BONUS = 'bonus'
+    ADJUSTMENT = 'adjustment'
+    KIND_CHOICES = [
+        (TASK, 'Task completed'),  # Also counts toward Profile.total_points
+        (PATTERN, 'Bingo pattern'),
+        (BONUS, 'Bonus'),
+        (ADJUSTMENT, 'Adjustment'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='point_events')
+    points = models.IntegerField()  # Points added, negative for corrections
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default=TASK)
+    task = models.ForeignKey('Task', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    reason = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(default=now, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='pointevent_user_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Events are never changed once written; corrections are new events."""
+        if not self._state.adding:
+            raise ValueError("Point events are append-only")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.points:+d} ({self.kind})"
+
+
+class PointSnapshot(models.Model):
+    """
+    A user's point totals at the end of a month, compacted from PointEvent
+    by the compact_point_ledger command. Totals at any later time are the
+    latest snapshot plus the events since, so they never need a full ledger scan.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='point_snapshots')
+    month = models.DateField()  # First day of the month the snapshot closes
+    points = models.IntegerField(default=0)  # Points earned during the month
+    lifetime_points = models.IntegerField(default=0)  # Leaderboard points at the end of the month
+    lifetime_task_points = models.IntegerField(default=0)  # Profile total_points at the end of the month
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month'], name='pointsnapshot_unique_month'),
+        ]
+        indexes = [
+            models.Index(fields=['month'], name='pointsnapshot_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.month:%Y-%m}: {self.points} points, {self.lifetime_points} lifetime"
+
+
 class AccessCode(models.Model):
     """Model to store access codes for admin roles"""
     code = models.CharField(max_length=20, unique=True)
@@ -240,4 +431,24 @@ class TaskBonus(models.Model):
         unique_together = ('user', 'task', 'reason')
 
     def __str__(self):
-        return f"{self.user.username} - {self.bonus_points} points for task #{self.task.id} ({self.reason})"
\ No newline at end of file
+        return f"{self.user.username} - {self.bonus_points} points for task #{self.task.id} ({self.reason})"
+
+class ImageSignature(models.Model):
+    """
+    Perceptual signature of a UserTask photo, stored when the photo is saved
+    so fraud checks can compare against it without re-decoding the original.
+    """
+    user_task = models.OneToOneField(
+        UserTask,
+        on_delete=models.CASCADE,
+        related_name='image_signature'
+    )  # The submission the photo belongs to
+
+    binary_hash = models.BinaryField(max_length=32)  # 16x16 average hash packed into 32 bytes
+    regions = models.JSONField(default=list)  # RGB samples from a 3x3 grid of regions
+    aspect_ratio = models.FloatField()  # Width / height of the original image
+    version = models.PositiveSmallIntegerField(default=1)  # Signature algorithm version, for backfills
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Used to sync in-process hash indexes
+
+    def __str__(self):
+        return f"Signature for UserTask #{self.user_task_id}"
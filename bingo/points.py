@@ -0,0 +1,389 @@
+import logging
+from datetime import date, datetime
+
+from django.db import transaction
+from django.db.models import Case, DateField, F, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from .leaderboard_cache import archived_months_changed, leaderboard_changed
+from .profile_cache import profile_changed
+from .rank_service import invalidate_rank_index, points_added
+
+logger = logging.getLogger(__name__)
+
+
+def _points_by_user_case(points_by_user):
+    """SQL expression giving each user's points to add, for a single UPDATE over many rows."""
+    if len(points_by_user) == 1:
+        (points,) = points_by_user.values()
+        return Value(points)
+    return Case(
+        *[When(user_id=user_id, then=Value(points)) for user_id, points in points_by_user.items()],
+        default=Value(0),
+        output_field=IntegerField()
+    )
+
+
+def _add_points(model, fields, points_by_user):
+    """
+    Add points to the given fields of each user's row with one UPDATE,
+    creating the rows of users who do not have one yet.
+    """
+    def update(user_points):
+        amount = _points_by_user_case(user_points)
+        return model.objects.filter(user_id__in=user_points).update(
+            **{field: F(field) + amount for field in fields}
+        )
+
+    if update(points_by_user) == len(points_by_user):
+        return
+
+    # Some users have no row yet; create them empty and add their points
+    existing = set(model.objects.filter(user_id__in=points_by_user).values_list('user_id', flat=True))
+    missing = {user_id: points for user_id, points in points_by_user.items() if user_id not in existing}
+    model.objects.bulk_create([model(user_id=user_id) for user_id in missing], ignore_conflicts=True)
+    update(missing)
+
+
+def record_point_events(events):
+    """
+    Append point events to the ledger and add them to the users' totals.
+
+    The events are inserted and the increments applied with F() expressions
+    in one transaction, with one UPDATE per table, so concurrent awards are
+    never lost and nothing is read back first. Events of every kind, pattern
+    bonuses included, add to the leaderboard's lifetime and monthly points;
+    only task events add to Profile.total_points.
+
+    Args:
+        events: Unsaved PointEvent instances
+    """
+    from .models import Leaderboard, PointEvent, Profile
+
+    events = [event for event in events if event.points]
+    if not events:
+        return
+
+    leaderboard_points = {}
+    task_points = {}
+    for event in events:
+        leaderboard_points[event.user_id] = leaderboard_points.get(event.user_id, 0) + event.points
+        if event.kind == PointEvent.TASK:
+            task_points[event.user_id] = task_points.get(event.user_id, 0) + event.points
+
+    with transaction.atomic():
+        PointEvent.objects.bulk_create(events)
+        _add_points(Leaderboard, ('points', 'monthly_points'), leaderboard_points)
+        if task_points:
+            _add_points(Profile, ('total_points',), task_points)
+    leaderboard_changed()
+    points_added(leaderboard_points)
+    for user_id in leaderboard_points:
+        profile_changed(user_id)
+
+    logger.info(f"Recorded {len(events)} point events for {len(leaderboard_points)} users")
+
+
+def award_points(user_id, points, kind='task', task=None, reason=''):
+    """
+    Award points to one user.
+
+    Args:
+        user_id: ID of the user
+        points (int): Points to add
+        kind (str): PointEvent kind; only task points count toward Profile.total_points
+        task: Optional Task the points were earned for
+        reason (str): Optional description stored on the event
+    """
+    from .models import PointEvent
+
+    record_point_events([PointEvent(user_id=user_id, points=points, kind=kind, task=task, reason=reason)])
+
+
+def award_points_bulk(awards, kind='task', reason=''):
+    """
+    Award many points at once, with one event per award and one UPDATE per
+    table however many users are involved.
+
+    Args:
+        awards: Iterable of (user_id, points, task) tuples; task may be None
+        kind (str): PointEvent kind of every award
+        reason (str): Optional description stored on the events
+    """
+    from .models import PointEvent
+
+    record_point_events([
+        PointEvent(user_id=user_id, points=points, kind=kind, task=task, reason=reason)
+        for user_id, points, task in awards
+    ])
+
+
+# Ledger compaction
+
+def month_start(value=None):
+    """First day of the month containing a date or datetime, in local time (default: now)."""
+    if value is None:
+        value = timezone.now()
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date()
+    return value.replace(day=1)
+
+
+def next_month(month):
+    """First day of the month after the given first-of-month date."""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def previous_month(month):
+    """First day of the month before the given first-of-month date."""
+    return date(month.year - (month.month == 1), (month.month - 2) % 12 + 1, 1)
+
+
+def month_boundary(month):
+    """Aware datetime at which the given month starts, in local time."""
+    return timezone.make_aware(datetime(month.year, month.month, 1))
+
+
+def _compact_month(month):
+    """
+    Write every user's snapshot for one month from the previous month's
+    snapshots and the month's events. Users without events that month are
+    carried forward, so the latest month's snapshots hold every user's totals.
+
+    Returns:
+        int: Number of snapshots written
+    """
+    from .models import PointEvent, PointSnapshot
+
+    totals = {
+        user_id: [0, lifetime, task_lifetime]
+        for user_id, lifetime, task_lifetime in PointSnapshot.objects.filter(
+            month=previous_month(month)
+        ).values_list('user_id', 'lifetime_points', 'lifetime_task_points')
+    }
+
+    earned = PointEvent.objects.filter(
+        created_at__gte=month_boundary(month),
+        created_at__lt=month_boundary(next_month(month))
+    ).values('user_id').annotate(
+        earned=Sum('points'),
+        earned_task=Sum('points', filter=Q(kind=PointEvent.TASK))
+    ).values_list('user_id', 'earned', 'earned_task')
+
+    for user_id, points, task_points in earned:
+        total = totals.setdefault(user_id, [0, 0, 0])
+        total[0] += points
+        total[1] += points
+        total[2] += task_points or 0
+
+    PointSnapshot.objects.bulk_create([
+        PointSnapshot(user_id=user_id, month=month, points=points,
+                      lifetime_points=lifetime, lifetime_task_points=task_lifetime)
+        for user_id, (points, lifetime, task_lifetime) in totals.items()
+    ], batch_size=1000)
+    return len(totals)
+
+
+def compact_point_ledger(until=None):
+    """
+    Snapshot each complete month that has no snapshots yet, oldest first.
+    Safe to run repeatedly; months already compacted are skipped.
+
+    Args:
+        until: Date or datetime in the first month not to compact (default: now)
+
+    Returns:
+        list: (month, snapshots written) for each month compacted
+    """
+    from .models import PointEvent, PointSnapshot
+
+    current = month_start(until)
+    last = PointSnapshot.objects.aggregate(last=Max('month'))['last']
+    if last is not None:
+        month = next_month(last)
+    else:
+        first_event = PointEvent.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        if first_event is None:
+            return []
+        month = month_start(first_event)
+
+    compacted = []
+    while month < current:
+        with transaction.atomic():
+            compacted.append((month, _compact_month(month)))
+        logger.info(f"Compacted point ledger for {month:%Y-%m}")
+        month = next_month(month)
+    return compacted
+
+
+def ledger_totals(user_ids=None, now=None):
+    """
+    Compute point totals from the ledger: the latest snapshots plus the
+    events since. With the ledger compacted up to last month this reads one
+    snapshot per user and only the current month's events.
+
+    Args:
+        user_ids: Optional IDs of the users to compute; all users by default
+        now: Optional datetime the monthly points are counted up to
+
+    Returns:
+        dict: user_id -> {'points', 'monthly_points', 'total_points'}, as
+              kept on Leaderboard and Profile
+    """
+    from .models import PointEvent, PointSnapshot
+
+    snapshots = PointSnapshot.objects.all()
+    events = PointEvent.objects.all()
+    if user_ids is not None:
+        snapshots = snapshots.filter(user_id__in=user_ids)
+        events = events.filter(user_id__in=user_ids)
+
+    totals = {}
+    last = snapshots.aggregate(last=Max('month'))['last']
+    if last is not None:
+        for user_id, lifetime, task_lifetime in snapshots.filter(month=last).values_list(
+                'user_id', 'lifetime_points', 'lifetime_task_points'):
+            totals[user_id] = {'points': lifetime, 'monthly_points': 0, 'total_points': task_lifetime}
+        events = events.filter(created_at__gte=month_boundary(next_month(last)))
+
+    this_month = month_boundary(month_start(now))
+    since = events.values('user_id').annotate(
+        earned=Sum('points'),
+        earned_this_month=Sum('points', filter=Q(created_at__gte=this_month)),
+        earned_task=Sum('points', filter=Q(kind=PointEvent.TASK))
+    ).values_list('user_id', 'earned', 'earned_this_month', 'earned_task')
+
+    for user_id, points, monthly_points, task_points in since:
+        total = totals.setdefault(user_id, {'points': 0, 'monthly_points': 0, 'total_points': 0})
+        total['points'] += points
+        total['monthly_points'] += monthly_points or 0
+        total['total_points'] += task_points or 0
+    return totals
+
+
+def _split_overdue_points(overdue, this_month):
+    """
+    Spread the points of entries that missed earlier resets over the months
+    they were earned in, read from the point ledger. The first month gets
+    whatever the ledger does not account for, e.g. points from before it.
+
+    Args:
+        overdue (dict): user_id -> (month of the last reset, points to archive)
+        this_month: First day of the month being reset into
+
+    Returns:
+        dict: month -> {user_id: points}
+    """
+    from .models import PointEvent
+
+    earliest = min(month for month, _ in overdue.values())
+    earned = PointEvent.objects.filter(
+        user_id__in=overdue,
+        created_at__gte=month_boundary(next_month(earliest)),
+        created_at__lt=month_boundary(this_month)
+    ).annotate(month=TruncMonth('created_at', output_field=DateField())).values('user_id', 'month').annotate(
+        total=Sum('points')
+    ).values_list('user_id', 'month', 'total')
+
+    later = {}
+    for user_id, month, total in earned:
+        if month > overdue[user_id][0]:
+            later.setdefault(user_id, {})[month] = total
+
+    points_by_month = {}
+    for user_id, (first_month, points) in overdue.items():
+        user_later = later.get(user_id, {})
+        points_by_month.setdefault(first_month, {})[user_id] = points - sum(user_later.values())
+        for month, total in user_later.items():
+            points_by_month.setdefault(month, {})[user_id] = total
+    return points_by_month
+
+
+def _ranked_standings(month, points_by_user):
+    """MonthlyStanding rows for a month's players with points, with competition ranks."""
+    from .models import MonthlyStanding
+
+    standings = []
+    rank = 0
+    previous_points = None
+    for position, (user_id, points) in enumerate(sorted(
+            (entry for entry in points_by_user.items() if entry[1] > 0), key=lambda entry: (-entry[1], entry[0])), start=1):
+        if points != previous_points:
+            rank, previous_points = position, points
+        standings.append(MonthlyStanding(user_id=user_id, month=month, points=points, rank=rank))
+    return standings
+
+
+def reset_monthly_points(today=None):
+    """
+    Archive last month's standings into MonthlyStanding and start the new
+    month's leaderboard, for every entry not yet reset this month.
+
+    Runs in one transaction with a single UPDATE for the reset. Entries
+    whose last_reset is already in the current month are skipped, so it is
+    safe to run daily. Points already earned this month, e.g. between
+    midnight and the reset, are kept as the new month's points. Entries
+    that missed earlier resets are archived under the months their points
+    were earned in (see _split_overdue_points).
+
+    Args:
+        today: Optional date to reset for (default: today)
+
+    Returns:
+        tuple: (archived month, standings archived, entries reset)
+    """
+    from .models import Leaderboard, MonthlyStanding, PointEvent
+
+    this_month = month_start(today or timezone.localdate())
+    archived_month = previous_month(this_month)
+
+    earned_this_month = Coalesce(Subquery(
+        PointEvent.objects.filter(
+            user_id=OuterRef('user_id'),
+            created_at__gte=month_boundary(this_month)
+        ).values('user_id').annotate(total=Sum('points')).values('total')
+    ), 0)
+
+    with transaction.atomic():
+        # Lock the entries so awards made during the reset wait for it
+        stale = Leaderboard.objects.select_for_update().filter(last_reset__lt=this_month)
+        closing = list(stale.annotate(earned=earned_this_month).values_list(
+            'user_id', 'monthly_points', 'earned', 'last_reset'
+        ))
+        if not closing:
+            return archived_month, 0, 0
+
+        # Normally every entry was reset last month and all its points are last month's
+        points_by_month = {archived_month: {}}
+        overdue = {}
+        for user_id, monthly_points, earned, last_reset in closing:
+            reset_month = month_start(last_reset)
+            if reset_month < archived_month:
+                overdue[user_id] = (reset_month, monthly_points - earned)
+            else:
+                points_by_month[archived_month][user_id] = monthly_points - earned
+        if overdue:
+            logger.warning(f"{len(overdue)} leaderboard entries missed earlier monthly resets; "
+                           f"archiving their points under the months they were earned")
+            for month, points_by_user in _split_overdue_points(overdue, this_month).items():
+                points_by_month.setdefault(month, {}).update(points_by_user)
+
+        standings = [
+            standing
+            for month, points_by_user in sorted(points_by_month.items())
+            for standing in _ranked_standings(month, points_by_user)
+        ]
+        MonthlyStanding.objects.bulk_create(standings, batch_size=1000, ignore_conflicts=True)
+        if standings:
+            archived_months_changed()
+
+        reset = Leaderboard.objects.filter(last_reset__lt=this_month).update(
+            monthly_points=earned_this_month,
+            last_reset=today or timezone.localdate()
+        )
+    leaderboard_changed()
+    transaction.on_commit(lambda: invalidate_rank_index('monthly_points'))
+
+    logger.info(f"Reset monthly points for {reset} entries, archived {len(standings)} standings for {archived_month:%Y-%m}")
+    return archived_month, len(standings), reset
@@ -0,0 +1,163 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Seconds a cached profile is kept. Writes bump the user's version, so this
+# only bounds how long an unused entry takes up cache space.
+PROFILE_CACHE_SECONDS = 3600
+
+# Lookups are counted in each process and added to counters in the shared
+# cache in batches of this many, so counting adds no cache round trip per read
+STATS_FLUSH_EVERY = 100
+
+_stats = {'hits': 0, 'misses': 0}
+_unflushed = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def _version_key(user_id):
+    return f'bingo:profile-version:{user_id}'
+
+
+def _stats_key(outcome):
+    return f'bingo:profile-cache-stats:{outcome}'
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+        _unflushed[outcome] += 1
+        if sum(_unflushed.values()) < STATS_FLUSH_EVERY:
+            return
+        batch = dict(_unflushed)
+        _unflushed.update(hits=0, misses=0)
+
+    for name, count in batch.items():
+        if count:
+            cache.add(_stats_key(name), 0, None)
+            try:
+                cache.incr(_stats_key(name), count)
+            except ValueError:
+                cache.set(_stats_key(name), count, None)
+
+
+def profile_cache_stats():
+    """Hits and misses of this process's profile cache lookups since it started."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def shared_profile_cache_stats():
+    """
+    Hits and misses counted by every process sharing the cache, up to each
+    process's last flush. Reported by `manage.py profile_cache_stats`.
+    """
+    return {outcome: cache.get(_stats_key(outcome), 0) for outcome in ('hits', 'misses')}
+
+
+def reset_profile_cache_stats():
+    """Start the shared hit and miss counts again from zero."""
+    cache.delete_many([_stats_key(outcome) for outcome in ('hits', 'misses')])
+
+
+def profile_version(user_id):
+    """
+    The user's current profile version. A missing counter starts from the
+    clock, so it can never match an entry cached under an older counter.
+
+    Versions are only seen by processes sharing the cache, which must
+    increment atomically; see CACHES in settings.
+    """
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), time.time_ns(), None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+
+def _bump_version(user_id):
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), time.time_ns(), None)
+
+
+def profile_changed(user_id):
+    """
+    Mark a user's cached profile out of date after one of their tasks,
+    badges, points or profile details changed. The version is bumped now
+    and again once the change commits, so a copy cached from before the
+    commit is not served.
+    """
+    _bump_version(user_id)
+    transaction.on_commit(lambda: _bump_version(user_id))
+
+
+def build_profile_state(user_id):
+    """
+    Read the parts of a user's profile that only change on writes, in three queries.
+
+    Returns:
+        dict: 'points', 'picture' and 'picture_thumbnail' (stored file names),
+              'user_tasks' and 'badges'
+    """
+    from .models import User, UserBadge, UserTask
+
+    # Profile pictures and points in one row, joined through the user
+    summary = User.objects.filter(id=user_id).values(
+        'profile__profile_picture', 'profile__profile_picture_thumbnail', 'leaderboard__points'
+    ).first() or {}
+
+    user_tasks = [
+        {
+            'task_id': task_id,
+            'status': task_status,
+            'completed': completed,
+            'submission_date': completion_date,
+            'rejection_reason': rejection_reason if task_status == 'rejected' else None
+        }
+        for task_id, task_status, completed, completion_date, rejection_reason in UserTask.objects.filter(
+            user_id=user_id
+        ).values_list('task_id', 'status', 'completed', 'completion_date', 'rejection_reason')
+    ]
+
+    badges = [
+        {
+            'id': pattern_id,
+            'name': name,
+            'type': pattern_type,
+            'description': description,
+            'bonus_points': bonus_points,
+        }
+        for pattern_id, name, pattern_type, description, bonus_points in UserBadge.objects.filter(
+            user_id=user_id
+        ).values_list('pattern_id', 'pattern__name', 'pattern__pattern_type', 'pattern__description',
+                      'pattern__bonus_points')
+    ]
+
+    return {
+        'points': summary.get('leaderboard__points') or 0,
+        'picture': summary.get('profile__profile_picture'),
+        'picture_thumbnail': summary.get('profile__profile_picture_thumbnail'),
+        'user_tasks': user_tasks,
+        'badges': badges,
+    }
+
+
+def get_profile_state(user_id):
+    """
+    Return a user's profile state from the cache, building and caching it
+    for the current version on a miss. Hits do not touch the database.
+    """
+    key = f'bingo:profile:{user_id}:{profile_version(user_id)}'
+    state = cache.get(key)
+    if state is not None:
+        _count('hits')
+        return state
+
+    _count('misses')
+    state = build_profile_state(user_id)
+    cache.set(key, state, PROFILE_CACHE_SECONDS)
+    return state
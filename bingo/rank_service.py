@@ -0,0 +1,312 @@
+import bisect
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Seconds an in-memory rank index is used before it is rebuilt from the
+# database. Awards made in this process are applied to it straight away;
+# this bounds how long changes made by other processes take to show.
+RANK_REFRESH_SECONDS = 30
+
+# Leaderboard fields players are ranked by
+RANK_FIELDS = ('points', 'monthly_points')
+
+
+class RankIndex:
+    """
+    Players ordered by points, for O(log n) rank lookups and updates.
+
+    Player counts per points value are kept in a Fenwick tree, so counting
+    the players above a score is a prefix sum. Players on the same points
+    are kept in a sorted list per value, which only around() reads.
+
+    Ranks are competition ranks, as a COUNT(points > x) + 1 query would give:
+    players with equal points share a rank.
+
+    Attributes:
+        generation: Generation of the rebuild that read the rows (see points_added)
+    """
+
+    def __init__(self, rows, generation=0):
+        """
+        Args:
+            rows: Iterable of (user_id, points)
+            generation: See points_added
+        """
+        self.generation = generation
+        self.points_by_user = dict(rows)
+        self.users_by_points = {}
+        for user_id, points in sorted(self.points_by_user.items()):
+            self.users_by_points.setdefault(points, []).append(user_id)
+        values = self.users_by_points.keys()
+        self._resize(min(values, default=0), max(values, default=0))
+
+    def __len__(self):
+        return len(self.points_by_user)
+
+    def _resize(self, low, high):
+        """Cover points low..high (with room to grow) and recount every player."""
+        self._low = low
+        self._capacity = 1 << max(high - low + 1, 64).bit_length()
+        self._tree = [0] * (self._capacity + 1)
+        for points, user_ids in self.users_by_points.items():
+            self._update(points, len(user_ids))
+
+    def _update(self, points, change):
+        slot = points - self._low + 1
+        while slot <= self._capacity:
+            self._tree[slot] += change
+            slot += slot & -slot
+
+    def _count_up_to(self, points):
+        """Number of players with at most the given points."""
+        slot = min(points - self._low + 1, self._capacity)
+        total = 0
+        while slot > 0:
+            total += self._tree[slot]
+            slot -= slot & -slot
+        return total
+
+    def _points_at(self, position):
+        """Points of the player at a 0-based position counted from the lowest score."""
+        slot = 0
+        step = self._capacity
+        while step:
+            if slot + step <= self._capacity and self._tree[slot + step] <= position:
+                slot += step
+                position -= self._tree[slot]
+            step >>= 1
+        return slot + self._low
+
+    def _count_above(self, points):
+        if points < self._low:
+            return len(self)
+        return len(self) - self._count_up_to(points)
+
+    def rank_for_points(self, points):
+        """Rank a player with the given points has: one more than the number of players with more."""
+        return self._count_above(points) + 1
+
+    def rank(self, user_id):
+        """Rank of a user, treating users without an entry as having 0 points."""
+        return self.rank_for_points(self.points_by_user.get(user_id, 0))
+
+    def _entry_at(self, position):
+        """(rank, user_id, points) of the player at a 0-based leaderboard position."""
+        points = self._points_at(len(self) - 1 - position)
+        above = self._count_above(points)
+        return above + 1, self.users_by_points[points][position - above], points
+
+    def around(self, user_id, count=2):
+        """
+        Entries for up to count players either side of a user, and the user.
+
+        Returns:
+            list: (rank, user_id, points) tuples in leaderboard order
+        """
+        points = self.points_by_user.get(user_id)
+        if points is None:
+            return []
+        position = self._count_above(points) + bisect.bisect_left(self.users_by_points[points], user_id)
+        return [
+            self._entry_at(other)
+            for other in range(max(position - count, 0), min(position + count + 1, len(self)))
+        ]
+
+    def add(self, deltas):
+        """
+        Apply point changes in place.
+
+        Args:
+            deltas (dict): user_id -> points added (users without an entry start from 0)
+        """
+        for user_id, delta in deltas.items():
+            old = self.points_by_user.get(user_id)
+            if old is not None:
+                users = self.users_by_points[old]
+                del users[bisect.bisect_left(users, user_id)]
+                if not users:
+                    del self.users_by_points[old]
+                self._update(old, -1)
+            new = (old or 0) + delta
+            self.points_by_user[user_id] = new
+            bisect.insort(self.users_by_points.setdefault(new, []), user_id)
+            if new < self._low or new >= self._low + self._capacity:
+                self._resize(min(new, self._low), max(new, self._low + self._capacity - 1))
+            else:
+                self._update(new, 1)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+_rebuilding = set()
+
+# Counts rebuilds. Each index records the generation it read the table at,
+# and deltas recorded before then are already part of it (see points_added).
+_generations = itertools.count(1)
+_generation = 0
+
+_executor = None
+
+
+def _get_executor():
+    """Return the single background thread that rebuilds rank indexes."""
+    global _executor
+    with _indexes_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rank-index')
+        return _executor
+
+
+def rebuild_rank_index(field='points'):
+    """
+    Build a field's rank index with one query and make it the current one.
+
+    Returns:
+        RankIndex: The new index
+    """
+    global _generation
+    from .models import Leaderboard
+
+    rows = list(Leaderboard.objects.values_list('user_id', field))
+    with _indexes_lock:
+        # Taken after the read: every delta recorded before it is in the rows or
+        # was committed after them, and only the latter is lost until the next rebuild
+        _generation = next(_generations)
+        index = RankIndex(rows, _generation)
+        _indexes[field] = (index, time.monotonic())
+    logger.info(f"Built {field} rank index for {len(index)} players")
+    return index
+
+
+def _rebuild_in_thread(field):
+    close_old_connections()
+    try:
+        rebuild_rank_index(field)
+    except Exception:
+        logger.exception(f"Rebuilding the {field} rank index failed")
+    finally:
+        with _indexes_lock:
+            _rebuilding.discard(field)
+        connection.close()
+
+
+def _schedule_rebuild(field):
+    """
+    Rebuild a field's index in the background once the current transaction
+    commits, so the rebuild's own connection sees this transaction's writes.
+    """
+    def submit():
+        with _indexes_lock:
+            if field in _rebuilding:
+                return
+            _rebuilding.add(field)
+        try:
+            _get_executor().submit(_rebuild_in_thread, field)
+        except RuntimeError:  # Interpreter shutting down
+            with _indexes_lock:
+                _rebuilding.discard(field)
+
+    transaction.on_commit(submit)
+
+
+def get_rank_index(field='points'):
+    """
+    Return this process's rank index for a Leaderboard field, or None if it
+    has not been built yet.
+
+    Missing indexes and ones older than RANK_REFRESH_SECONDS are rebuilt in
+    the background; an old index keeps being used until its replacement is ready.
+    """
+    with _indexes_lock:
+        cached = _indexes.get(field)
+    if cached is None or time.monotonic() - cached[1] > RANK_REFRESH_SECONDS:
+        _schedule_rebuild(field)
+    return cached[0] if cached is not None else None
+
+
+def invalidate_rank_index(field=None):
+    """Drop a field's rank index, or all of them, so the next lookup rebuilds it."""
+    with _indexes_lock:
+        if field is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(field, None)
+
+
+def _apply_points(deltas, generation):
+    with _indexes_lock:
+        for index, _ in _indexes.values():
+            if index.generation <= generation:
+                index.add(deltas)
+
+
+def points_added(deltas):
+    """
+    Apply awarded points to the loaded rank indexes once the award commits.
+    Lifetime and monthly points always change together, so both are updated.
+
+    The deltas are stamped with the current rebuild generation. An index
+    rebuilt after that may already have read the committed points, so the
+    deltas are not applied to it again.
+
+    Args:
+        deltas (dict): user_id -> points added
+    """
+    generation = _generation
+    transaction.on_commit(lambda: _apply_points(deltas, generation))
+
+
+def leaderboard_position(user_id, points=None, field='points'):
+    """
+    A player's position on the leaderboard.
+
+    Until this process's index is built, the position is counted with one
+    query instead.
+
+    Args:
+        user_id: ID of the user
+        points: The user's current points if already read, which keeps the
+                answer exact even when the index is slightly behind
+        field: 'points' or 'monthly_points'
+
+    Returns:
+        int: 1 for the top player; tied players share a position
+    """
+    from .models import Leaderboard
+
+    index = get_rank_index(field)
+    if index is not None:
+        if points is not None:
+            return index.rank_for_points(points)
+        return index.rank(user_id)
+
+    if points is None:
+        points = Leaderboard.objects.filter(user_id=user_id).values_list(field, flat=True).first() or 0
+    return Leaderboard.objects.filter(**{f'{field}__gt': points}).count() + 1
+
+
+def users_around(user_id, count=2, field='points'):
+    """
+    The players just above and below a user on the leaderboard. Builds the
+    index first if this process has none yet.
+
+    Returns:
+        list: Dicts of rank, user_id, username and points in leaderboard order,
+              including the user; empty if they have no leaderboard entry
+    """
+    from .models import User
+
+    index = get_rank_index(field) or rebuild_rank_index(field)
+    entries = index.around(user_id, count)
+    usernames = dict(User.objects.filter(id__in=[entry[1] for entry in entries]).values_list('id', 'username'))
+    return [
+        {'rank': rank, 'user_id': other_id, 'username': usernames.get(other_id), 'points': points}
+        for rank, other_id, points in entries
+    ]
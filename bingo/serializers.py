@@ -102,8 +102,9 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Profile
+        # The stored rank is not kept up to date; get_user_profile works it out from the points
         fields = ['username','email','profile_picture',
-                  'rank','total_points','completed_tasks']
+                  'total_points','completed_tasks']
         
     def get_total_points(self,obj):
         leaderboard, created =Leaderboard.objects.get_or_create(user=obj.user)
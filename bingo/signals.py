@@ -1,5 +1,5 @@
 
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_migrate, post_save, post_delete
 from django.dispatch import receiver
 from django.apps import apps
 
@@ -44,4 +44,165 @@ def create_special_users(sender, **kwargs):
         developer.save()
         print("Created developer user")
         
-        pass
\ No newline at end of file
+        pass
+
+
+@receiver(post_save, sender='bingo.ImageSignature')
+def index_image_signature(sender, instance, **kwargs):
+    """
+    Keep this process's image similarity index in step with stored signatures
+    """
+    from .image_hash_index import signature_index
+
+    if signature_index.loaded:
+        signature_index.add(instance.user_task_id, instance.binary_hash)
+
+
+@receiver(post_delete, sender='bingo.ImageSignature')
+def unindex_image_signature(sender, instance, **kwargs):
+    """
+    Drop deleted signatures from this process's image similarity index
+    """
+    from .image_hash_index import signature_index
+
+    signature_index.remove(instance.user_task_id)
+
+
+@receiver(post_save, sender='bingo.UserTask')
+def mark_board_cell_completed(sender, instance, **kwargs):
+    """
+    Set the task's cell in the user's stored board completion mask once it is completed
+    """
+    from .bingo_board import set_cells_completed
+
+    if instance.completed:
+        set_cells_completed(instance.user_id, {instance.task_id})
+
+
+@receiver(post_delete, sender='bingo.UserTask')
+def clear_board_cell(sender, instance, **kwargs):
+    """
+    Clear the cell of a deleted completed task from the user's board completion mask
+    """
+    from .bingo_board import set_cells_completed
+
+    if instance.completed:
+        set_cells_completed(instance.user_id, {instance.task_id}, completed=False)
+
+
+@receiver(post_save, sender='bingo.Task')
+@receiver(post_delete, sender='bingo.Task')
+def bump_tasks_version(sender, instance, raw=False, **kwargs):
+    """
+    Bump the task list's version, so clients revalidating it get the change
+    """
+    from .etags import bump_resource_version
+
+    if not raw:
+        bump_resource_version('tasks')
+
+
+@receiver(post_save, sender='bingo.Task')
+def place_task_on_board(sender, instance, created, raw=False, **kwargs):
+    """
+    Give new tasks the first empty cell of the board, so existing tasks keep their cells
+    """
+    from .bingo_board import add_task_to_board
+
+    if created and not raw:
+        add_task_to_board(instance)
+
+
+@receiver(post_save, sender='bingo.BoardCell')
+@receiver(post_delete, sender='bingo.BoardCell')
+def bump_board_version(sender, instance, **kwargs):
+    """
+    Bump the board's version when a cell changes, so masks built for the old layout are rebuilt
+    """
+    from django.db import transaction
+    from django.db.models import F
+    from django.utils import timezone
+    from .bingo_board import invalidate_board_layout
+    from .etags import bump_resource_version
+    from .models import Board
+
+    Board.objects.filter(id=instance.board_id).update(version=F('version') + 1, updated_at=timezone.now())
+    bump_resource_version('tasks')
+    invalidate_board_layout()
+    # Drop it again once committed, in case it was reloaded before the change was visible
+    transaction.on_commit(invalidate_board_layout)
+
+
+@receiver(post_save, sender='bingo.Board')
+@receiver(post_delete, sender='bingo.Board')
+def drop_cached_board_layout(sender, instance, created=False, **kwargs):
+    """
+    Drop this process's cached board layout when a board changes
+    """
+    from django.db import transaction
+    from django.db.models import F
+    from .bingo_board import invalidate_board_layout
+    from .etags import bump_resource_version
+    from .models import Board
+
+    # An edited board, e.g. resized or deactivated, is a new layout
+    if kwargs.get('signal') is post_save and not created:
+        Board.objects.filter(id=instance.id).update(version=F('version') + 1)
+    bump_resource_version('tasks')
+    invalidate_board_layout()
+    transaction.on_commit(invalidate_board_layout)
+
+
+@receiver(post_save, sender='bingo.Leaderboard')
+@receiver(post_delete, sender='bingo.Leaderboard')
+def refresh_cached_leaderboard(sender, instance, **kwargs):
+    """
+    Refresh the cached leaderboard and rank indexes after an entry is saved or deleted outside the point service
+    """
+    from .leaderboard_cache import leaderboard_changed
+    from .rank_service import invalidate_rank_index
+
+    leaderboard_changed()
+    invalidate_rank_index()
+
+
+@receiver(post_save, sender='bingo.UserTask')
+@receiver(post_delete, sender='bingo.UserTask')
+@receiver(post_save, sender='bingo.UserBadge')
+@receiver(post_delete, sender='bingo.UserBadge')
+@receiver(post_save, sender='bingo.Profile')
+@receiver(post_delete, sender='bingo.Profile')
+@receiver(post_save, sender='bingo.Leaderboard')
+@receiver(post_delete, sender='bingo.Leaderboard')
+def drop_cached_profile(sender, instance, **kwargs):
+    """
+    Bump the user's profile version when their tasks, badges, profile or points change
+    """
+    from .profile_cache import profile_changed
+
+    profile_changed(instance.user_id)
+
+
+@receiver(post_save, sender='bingo.User')
+def bump_user_profile_version(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Bump the profile version when a user's details change, and start new
+    users on a fresh one so nothing cached under a reused ID is served.
+    Logins only save last_login, which the profile does not show.
+    """
+    from .profile_cache import profile_changed
+
+    if raw or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    profile_changed(instance.id)
+
+
+@receiver(post_save, sender='bingo.MonthlyStanding')
+@receiver(post_delete, sender='bingo.MonthlyStanding')
+def drop_cached_archived_months(sender, instance, **kwargs):
+    """
+    Drop the cached list of archived months when a standing is edited outside the monthly reset
+    """
+    from .leaderboard_cache import archived_months_changed
+
+    archived_months_changed()
@@ -36,6 +36,7 @@ from unittest.mock import patch, mock_open, MagicMock
 # Import models and views for testing
 from bingo.models import Profile, Task, UserTask, Leaderboard, BingoPattern, UserBadge, PasswordResetToken
 from bingo.views import check_and_award_patterns
+from bingo.fraud_checks import run_fraud_check
 from bingo.bingo_patterns import BingoPatternDetector
 
 import os
@@ -246,25 +247,41 @@ class FraudDetectionTests(TestCase):
         self.client.force_authenticate(user=self.user)
         self.task = Task.objects.create(description="Fraud Task", points=10, requires_upload=True)
 
+    @patch("bingo.basic_image_fraud_detector.BasicImageFraudDetector._get_image_signature")
     @patch("bingo.basic_image_fraud_detector.BasicImageFraudDetector.is_image_fraudulent")
-    def test_fraud_detection_duplicate_image(self, mock_fraud_detection):
-        """Test that the system detects a fraudulent (duplicate) image."""
-        mock_fraud_detection.return_value = (True, 95.0, 1)  # Simulate fraud detection
+    def test_fraud_detection_duplicate_image(self, mock_fraud_detection, mock_signature):
+        """Test that the background check rejects a fraudulent (duplicate) image."""
+        mock_fraud_detection.return_value = (True, 95.0, None)  # Simulate fraud detection
+        mock_signature.return_value = {'binary_hash': 0, 'aspect_ratio': 1.0, 'regions': []}
         image = SimpleUploadedFile("test.jpg", b"file_content", content_type="image/jpeg")
         data = {"task_id": self.task.id, "photo": image}
         response = self.client.post('/api/complete_task/', data, format='multipart')
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("This image appears to be identical", response.data["message"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["verification_status"], "pending")
+
+        user_task = UserTask.objects.get(user=self.user, task=self.task)
+        self.assertEqual(run_fraud_check(user_task.id), "flagged")
+        user_task.refresh_from_db()
+        self.assertEqual(user_task.status, "rejected")
+        self.assertIn("This image appears to be identical", user_task.rejection_reason)
+        self.assertEqual(user_task.fraud_score, 95.0)
 
+    @patch("bingo.basic_image_fraud_detector.BasicImageFraudDetector._get_image_signature")
     @patch("bingo.basic_image_fraud_detector.BasicImageFraudDetector.is_image_fraudulent")
-    def test_fraud_detection_unique_image(self, mock_fraud_detection):
+    def test_fraud_detection_unique_image(self, mock_fraud_detection, mock_signature):
         """Test that the system allows a unique image to pass fraud detection."""
         mock_fraud_detection.return_value = (False, 0, None)  # Simulate no fraud detected
+        mock_signature.return_value = {'binary_hash': 0, 'aspect_ratio': 1.0, 'regions': []}
         image = SimpleUploadedFile("test.jpg", b"file_content", content_type="image/jpeg")
         data = {"task_id": self.task.id, "photo": image}
         response = self.client.post('/api/complete_task/', data, format='multipart')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("Task submitted successfully", response.data["message"])
+
+        user_task = UserTask.objects.get(user=self.user, task=self.task)
+        self.assertEqual(run_fraud_check(user_task.id), "clear")
+        user_task.refresh_from_db()
+        self.assertEqual(user_task.status, "pending")
         
 class TaskAutoApprovalTests(TestCase):
     def setUp(self):
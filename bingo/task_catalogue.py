@@ -0,0 +1,51 @@
+import logging
+import threading
+
+from .etags import resource_version
+from .fast_serializers import dumps, serialize_tasks
+
+logger = logging.getLogger(__name__)
+
+# (tasks version, JSON body) of the last task list built in this process
+_catalogue = None
+_catalogue_lock = threading.Lock()
+
+
+def build_task_catalogue():
+    """
+    Serialize every task with its board cell as position (row * size + col),
+    or None if it is not on the board, and the board's size as board_size.
+    Board tasks come first, in position order.
+
+    Returns:
+        bytes: The JSON body of the task list
+    """
+    from .bingo_board import get_board_layout
+    from .models import Task
+
+    layout = get_board_layout()
+    data = serialize_tasks(Task.objects.order_by('id'))
+    for item in data:
+        item['position'] = layout.positions.get(item['id'])
+        item['board_size'] = layout.size
+    data.sort(key=lambda item: (item['position'] is None, item['position'] or 0))
+    return dumps(data)
+
+
+def task_catalogue_json():
+    """
+    Return the task list as JSON bytes, rebuilt only when the 'tasks'
+    version has moved on. Task and board changes bump it, in this process
+    or any other sharing the cache, so a hit does no ORM or serializer work.
+    """
+    global _catalogue
+
+    version = resource_version('tasks')
+    with _catalogue_lock:
+        if _catalogue is not None and _catalogue[0] == version:
+            return _catalogue[1]
+
+        body = build_task_catalogue()
+        _catalogue = (version, body)
+        logger.info(f"Built task catalogue version {version} ({len(body)} bytes)")
+        return body
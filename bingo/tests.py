@@ -5,18 +5,30 @@ from django.test import TestCase, RequestFactory
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.db.models import F
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, MagicMock
 
 # Import models and views for testing
-from bingo.models import Profile, Task, UserTask, Leaderboard
-from bingo.views import user_rank, load_initial_tasks, login_user, tasks, get_user_profile, check_developer_role
+from bingo.models import Profile, Task, UserTask, Leaderboard, ImageSignature, UserBadge, Board, BoardCell, PointEvent, PointSnapshot, MonthlyStanding, TaskBonus
+from bingo.basic_image_fraud_detector import BasicImageFraudDetector, hash_to_int, hash_to_bytes
+from bingo.image_hash_index import ImageHashIndex
+from bingo.image_signature_batch import compute_signatures
+from bingo.fraud_checks import process_pending_fraud_checks
+from django.core.management import call_command
+from bingo.views import user_rank, login_user, tasks, get_user_profile, check_developer_role
 
 import os
+import io
 import json
+import random
+import tempfile
+
+from PIL import Image
 
 # Retrieve the custom User model
 User = get_user_model()
@@ -24,39 +36,51 @@ User = get_user_model()
 
 # Load Initial Tasks Tests
 
-class LoadInitialTasksTestCase(TestCase):
-    @patch("builtins.open", new_callable=mock_open, read_data='[{"pk": 2, "fields": {"description": "New Task", "points": 15, "requires_upload": false, "requires_scan": true}}]')
-    @patch("os.path.join", return_value="mocked_path/initial_data.json")
-    @patch("bingo.models.Task.objects.exists", return_value=False)
-    @patch("bingo.models.Task.objects.create")
-    def test_load_initial_tasks(self, mock_create, mock_exists, mock_path, mock_file):
-        """Test loading initial tasks when no tasks exist"""
-        load_initial_tasks()
-        mock_create.assert_called_once_with(
-            id=2,
-            description="New Task",
-            points=15,
-            requires_upload=False,
-            requires_scan=True
-        )
-        self.assertTrue(mock_create.called)
-
-    @patch("builtins.open", new_callable=mock_open, read_data='[]')
-    @patch("os.path.join", return_value="mocked_path/initial_data.json")
-    @patch("bingo.models.Task.objects.exists", return_value=False)
-    @patch("bingo.models.Task.objects.create")
-    def test_load_initial_tasks_empty_file(self, mock_create, mock_exists, mock_path, mock_file):
-        """Test loading initial tasks when JSON file is empty"""
-        load_initial_tasks()
-        mock_create.assert_not_called()
-
-    @patch("os.path.join", return_value="mocked_path/initial_data.json")
-    @patch("bingo.models.Task.objects.exists", return_value=True)
-    @patch("builtins.open", new_callable=mock_open)
-    def test_load_initial_tasks_already_exists(self, mock_file, mock_exists, mock_path):
-        """Test loading initial tasks when tasks already exist"""
-        load_initial_tasks()
-        mock_file.assert_not_called()
+class SeedInitialTasksTestCase(TestCase):
+    """
+    Tests for the migration that loads the initial tasks.
+    """
+    def seed(self):
+        from importlib import import_module
+        from types import SimpleNamespace
+        from django.apps import apps
+        from django.db import connection
+
+        migration = import_module('bingo.migrations.0023_seed_initial_tasks')
+        migration.seed_initial_tasks(apps, SimpleNamespace(connection=connection))
+
+    def test_initial_tasks_seeded_on_board(self):
+        """Test that migrating loads initial_data.json and fills the board in id order."""
+        from bingo.bingo_board import get_board_layout
+
+        with open(os.path.join(os.path.dirname(__file__), 'initial_data.json'), encoding='utf-8') as file:
+            data = json.load(file)
+        self.assertEqual(list(Task.objects.order_by('id').values_list('id', 'description')),
+                         [(item['pk'], item['fields']['description']) for item in data])
+        self.assertEqual(get_board_layout().task_ids[:len(data)], tuple(item['pk'] for item in data))
+
+    def test_seeding_skipped_when_tasks_exist(self):
+        """Test that seeding leaves an existing task catalogue alone."""
+        count = Task.objects.count()
+        self.seed()
+        self.assertEqual(Task.objects.count(), count)
+
+    def test_seeding_fills_the_board_in_play(self):
+        """Test that with two active boards the tasks go on the one the app shows."""
+        from bingo.bingo_board import active_board
+
+        Task.objects.all().delete()
+        Board.objects.create(size=3)
+        self.seed()
+        self.assertEqual(BoardCell.objects.filter(board=active_board()).count(), 9)
+
+    def test_seeding_empty_database(self):
+        """Test that an emptied catalogue is reseeded and new tasks still get fresh ids."""
+        Task.objects.all().delete()
+        self.seed()
+        self.assertEqual(Task.objects.count(), 9)
+        task = Task.objects.create(description="After Seeding", points=5)
+        self.assertGreater(task.id, 9)
 
 
 # User Profile Tests
@@ -221,32 +245,33 @@ class TasksTestCase(TestCase):
     def setUp(self):
         self.client = APIClient()
         self.user = User.objects.create_user(username='testuser', email='test@example.com', password='Str0ngP@ssw0rd123')
+        # Start from an empty catalogue rather than the seeded tasks
+        Task.objects.all().delete()
         self.task = Task.objects.create(id=1, description='Test Task', points=10, requires_upload=False, requires_scan=False)
 
-    @patch("bingo.views.load_initial_tasks", autospec=True)
-    def test_tasks_retrieval(self, mock_load_initial_tasks):
-        """Test retrieving tasks and ensuring task preloading is called."""
-        mock_load_initial_tasks.return_value = None  
+    def test_tasks_retrieval(self):
+        """Test retrieving tasks."""
         response = self.client.get(reverse('tasks'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(response.json()), 1)
-        self.assertTrue(mock_load_initial_tasks.called) 
 
-    @patch("bingo.views.load_initial_tasks", autospec=True)
-    def test_tasks_retrieval_no_tasks(self, mock_load_initial_tasks):
+    def test_tasks_retrieval_no_tasks(self):
         """Test retrieving tasks when no tasks exist in the database."""
         Task.objects.all().delete()
         response = self.client.get(reverse('tasks'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.json()), 0)
 
-    @patch("bingo.views.load_initial_tasks", autospec=True)
-    def test_tasks_retrieval_error_handling(self, mock_load_initial_tasks):
-        """Test error handling when an exception occurs in task retrieval."""
-        mock_load_initial_tasks.side_effect = Exception("Task loading error")
-        with self.assertRaises(Exception) as context:
-            self.client.get(reverse('tasks'))
-        self.assertEqual(str(context.exception), "Task loading error")
+    def test_tasks_served_from_memory_until_changed(self):
+        """Test that repeat requests do no queries and a task edit is seen on the next one."""
+        self.client.get(reverse('tasks'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('tasks'))
+        self.assertEqual(response.json()[0]['description'], 'Test Task')
+
+        self.task.description = 'Renamed Task'
+        self.task.save()
+        self.assertEqual(self.client.get(reverse('tasks')).json()[0]['description'], 'Renamed Task')
 
 # Task Completion Tests
 
@@ -319,6 +344,409 @@ class LeaderboardTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data[0]["points"], response.data[1]["points"])
 
+
+class LeaderboardCacheTests(TestCase):
+    """
+    Tests for the cached leaderboard and its conditional responses.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username="cacheuser1", email="cache1@exeter.ac.uk", password="testpass")
+        self.user2 = User.objects.create_user(username="cacheuser2", email="cache2@exeter.ac.uk", password="testpass")
+        self.client.force_authenticate(user=self.user1)
+        Leaderboard.objects.create(user=self.user1, points=100, monthly_points=5)
+        Leaderboard.objects.create(user=self.user2, points=200, monthly_points=1)
+
+    def test_cached_reads_and_not_modified(self):
+        """Test that repeat reads skip the database and a matching ETag gets a 304."""
+        response = self.client.get(reverse('leaderboard'))
+        self.assertEqual([player["user"] for player in response.data], ["cacheuser2", "cacheuser1"])
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('leaderboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_point_awards_refresh_write_through(self):
+        """Test that an award rebuilds the cached lists once committed, keeping the ETag only when unchanged."""
+        from bingo.points import award_points
+
+        etag = self.client.get(reverse('leaderboard'))["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            award_points(self.user1.id, 150)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('leaderboard'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0], {"user": "cacheuser1", "points": 250})
+        self.assertNotEqual(response["ETag"], etag)
+
+class RankServiceTests(TestCase):
+    """
+    Tests for in-memory leaderboard ranks.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [User.objects.create_user(username=f"rankuser{i}", email=f"rank{i}@exeter.ac.uk", password="testpass")
+                      for i in range(5)]
+        for user, points in zip(self.users, (50, 80, 50, 10, 0)):
+            Leaderboard.objects.create(user=user, points=points, monthly_points=points // 10)
+
+    def test_rank_index_matches_count_query(self):
+        """Test that index ranks equal COUNT(points > x) + 1, including ties and moves."""
+        from bingo.rank_service import RankIndex
+
+        index = RankIndex((user.id, points) for user, points in zip(self.users, (50, 80, 50, 10, 0)))
+        self.assertEqual([index.rank(user.id) for user in self.users], [2, 1, 2, 4, 5])
+        self.assertEqual(index.rank_for_points(60), 2)
+
+        index.add({self.users[3].id: 65, 999: 1})
+        self.assertEqual([index.rank(user.id) for user in self.users], [3, 1, 3, 2, 6])
+        self.assertEqual([entry[1] for entry in index.around(self.users[3].id, count=1)], [self.users[1].id, self.users[3].id, self.users[0].id])
+
+    def test_rank_index_matches_sorted_order_after_updates(self):
+        """Test that ranks and neighbours stay exact through many moves, including new highs and lows."""
+        from bingo.rank_service import RankIndex
+
+        rng = random.Random(20)
+        points = {user_id: rng.randint(0, 50) for user_id in range(1, 201)}
+        index = RankIndex(points.items())
+        for _ in range(500):
+            user_id = rng.randint(1, 220)
+            delta = rng.choice((rng.randint(-20, 20), rng.randint(-500, 5000)))
+            index.add({user_id: delta})
+            points[user_id] = points.get(user_id, 0) + delta
+
+        order = sorted(points, key=lambda user_id: (-points[user_id], user_id))
+        for user_id in rng.sample(order, 30):
+            self.assertEqual(index.rank(user_id), sum(1 for other in points.values() if other > points[user_id]) + 1)
+            position = order.index(user_id)
+            expected = order[max(position - 2, 0):position + 3]
+            self.assertEqual([entry[1] for entry in index.around(user_id)], expected)
+
+    def test_cold_profile_read_counts_instead_of_building(self):
+        """Test that a profile read with no index answers with one count and leaves the build to the background."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from bingo.rank_service import get_rank_index, invalidate_rank_index
+
+        invalidate_rank_index()
+        self.client.force_authenticate(user=self.users[3])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('get_user_profile'))
+        self.assertEqual(response.data["leaderboard_rank"], 4)
+        leaderboard_reads = [query["sql"] for query in queries if '"bingo_leaderboard"' in query["sql"]]
+        self.assertTrue(all("WHERE" in sql for sql in leaderboard_reads))
+        # Rebuilds wait for the request's transaction to commit, which a test never does
+        self.assertIsNone(get_rank_index())
+
+    def test_rebuild_after_award_not_applied_twice(self):
+        """Test that an award the rebuild already read is not added to the new index again."""
+        from bingo.points import award_points
+        from bingo.rank_service import get_rank_index, rebuild_rank_index
+
+        rebuild_rank_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            award_points(self.users[3].id, 100)
+            rebuild_rank_index()
+        self.assertEqual(get_rank_index().points_by_user[self.users[3].id], 110)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            award_points(self.users[3].id, 5)
+        self.assertEqual(get_rank_index().points_by_user[self.users[3].id], 115)
+
+    def test_profile_position_without_count_query(self):
+        """Test that the profile's leaderboard position comes from the index."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from bingo.rank_service import rebuild_rank_index
+
+        rebuild_rank_index()
+        self.client.force_authenticate(user=self.users[3])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('get_user_profile'))
+        self.assertEqual(response.data["leaderboard_rank"], 4)
+        self.assertFalse(any("COUNT" in query["sql"] and "bingo_leaderboard" in query["sql"] for query in queries))
+
+    def test_awards_update_ranks(self):
+        """Test that committed awards move players in the index and the around-me list."""
+        from bingo.points import award_points
+
+        self.client.force_authenticate(user=self.users[4])
+        response = self.client.get(reverse('leaderboard_around_me'), {"count": 1})
+        self.assertEqual(response.data["rank"], 5)
+        self.assertEqual([player["user"] for player in response.data["players"]], ["rankuser3", "rankuser4"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            award_points(self.users[4].id, 60)
+        response = self.client.get(reverse('leaderboard_around_me'), {"count": 1, "board": "monthly"})
+        self.assertEqual(response.data["rank"], 1)
+        response = self.client.get(reverse('leaderboard_around_me'))
+        self.assertEqual(response.data["rank"], 2)
+        self.assertEqual([player["rank"] for player in response.data["players"]], [1, 2, 3, 3])
+
+class PointAwardTests(TestCase):
+    """
+    Tests for the point service shared by approvals, bulk approvals and pattern bonuses.
+    """
+    def setUp(self):
+        self.user1 = User.objects.create_user(username="pointuser1", email="point1@exeter.ac.uk", password="testpass")
+        self.user2 = User.objects.create_user(username="pointuser2", email="point2@exeter.ac.uk", password="testpass")
+        Leaderboard.objects.create(user=self.user1, points=100, monthly_points=10)
+        Profile.objects.create(user=self.user1, total_points=100)
+
+    def test_award_updates_lifetime_and_monthly_points(self):
+        """Test that an award adds to both leaderboard totals without overwriting a stale copy."""
+        from bingo.points import award_points
+
+        stale = Leaderboard.objects.get(user=self.user1)
+        Leaderboard.objects.filter(user=self.user1).update(points=F('points') + 1)
+        award_points(self.user1.id, 15)
+
+        stale.refresh_from_db()
+        self.assertEqual((stale.points, stale.monthly_points), (116, 25))
+        self.assertEqual(Profile.objects.get(user=self.user1).total_points, 115)
+
+    def test_bonus_points_skip_profile_total(self):
+        """Test that pattern bonuses only count on the leaderboard."""
+        from bingo.points import award_points
+
+        award_points(self.user1.id, 35, kind="pattern")
+        self.assertEqual(Leaderboard.objects.get(user=self.user1).points, 135)
+        self.assertEqual(Profile.objects.get(user=self.user1).total_points, 100)
+        self.assertEqual(list(PointEvent.objects.values_list("points", "kind")), [(35, "pattern")])
+
+    def test_every_kind_counts_toward_monthly_points(self):
+        """Test that pattern bonuses and adjustments count toward this month's leaderboard as task points do."""
+        from bingo.leaderboard_cache import get_leaderboard
+        from bingo.points import award_points, ledger_totals
+
+        award_points(self.user1.id, 35, kind="pattern")
+        award_points(self.user1.id, 5, kind="adjustment")
+        award_points(self.user1.id, 10)
+        self.assertEqual(Leaderboard.objects.get(user=self.user1).monthly_points, 60)
+        self.assertEqual(ledger_totals([self.user1.id])[self.user1.id]["monthly_points"], 50)
+
+        self.assertEqual(get_leaderboard()["monthly"][0], {"user": "pointuser1", "points": 60})
+
+    def test_bulk_award_creates_missing_rows(self):
+        """Test that a batch award uses one UPDATE per table and creates rows for new users."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from bingo.points import award_points_bulk
+
+        Leaderboard.objects.create(user=self.user2)
+        Profile.objects.create(user=self.user2)
+        with CaptureQueriesContext(connection) as queries:
+            award_points_bulk([(self.user1.id, 5, None), (self.user2.id, 7, None)])
+        self.assertEqual(sum(query["sql"].startswith("UPDATE") for query in queries), 2)
+
+        user3 = User.objects.create_user(username="pointuser3", email="point3@exeter.ac.uk", password="testpass")
+        award_points_bulk([(self.user1.id, 1, None), (user3.id, 9, None)])
+        self.assertEqual(list(Leaderboard.objects.order_by("user_id").values_list("points", "monthly_points")),
+                         [(106, 16), (7, 7), (9, 9)])
+        self.assertEqual(Profile.objects.get(user=user3).total_points, 9)
+
+    def test_stored_totals_match_ledger(self):
+        """Test that awards keep the stored totals equal to the ledger totals."""
+        from bingo.points import award_points
+
+        PointEvent.objects.create(user=self.user1, points=100, kind="task")
+        award_points(self.user1.id, 5)
+        award_points(self.user2.id, 35, kind="pattern")
+
+        out = io.StringIO()
+        call_command("compact_point_ledger", check=True, stdout=out)
+        self.assertIn("User {}: stored".format(self.user1.id), out.getvalue())  # Seeded monthly points were not in the ledger
+        Leaderboard.objects.filter(user=self.user1).update(monthly_points=105)
+        out = io.StringIO()
+        call_command("compact_point_ledger", check=True, stdout=out)
+        self.assertIn("0 users differ from the ledger", out.getvalue())
+
+    def test_events_are_append_only(self):
+        """Test that a recorded point event cannot be changed."""
+        from bingo.points import award_points
+
+        award_points(self.user1.id, 5)
+        event = PointEvent.objects.get()
+        event.points = 500
+        with self.assertRaises(ValueError):
+            event.save()
+
+    def test_compacted_snapshots_give_ledger_totals(self):
+        """Test that monthly snapshots carry totals forward and match the stored totals."""
+        from datetime import date, datetime
+        from django.utils import timezone
+        from bingo.points import compact_point_ledger, ledger_totals
+
+        def event(user, points, kind, month):
+            PointEvent.objects.create(user=user, points=points, kind=kind,
+                                      created_at=timezone.make_aware(datetime(2026, month, 15)))
+
+        Leaderboard.objects.all().delete()
+        Profile.objects.all().delete()
+        event(self.user1, 10, "task", 7)
+        event(self.user1, 35, "pattern", 7)
+        event(self.user2, 4, "task", 8)
+        event(self.user1, 6, "task", 10)
+
+        compacted = compact_point_ledger(until=date(2026, 10, 18))
+        self.assertEqual([month for month, _ in compacted], [date(2026, 7, 1), date(2026, 8, 1), date(2026, 9, 1)])
+        self.assertEqual(compact_point_ledger(until=date(2026, 10, 18)), [])
+
+        september = dict(PointSnapshot.objects.filter(month=date(2026, 9, 1)).values_list("user_id", "lifetime_points"))
+        self.assertEqual(september, {self.user1.id: 45, self.user2.id: 4})
+
+        now = timezone.make_aware(datetime(2026, 10, 18))
+        with self.assertNumQueries(3):
+            totals = ledger_totals(now=now)
+        self.assertEqual(totals[self.user1.id], {"points": 51, "monthly_points": 6, "total_points": 16})
+        self.assertEqual(totals[self.user2.id], {"points": 4, "monthly_points": 0, "total_points": 4})
+
+class MonthlyResetTests(TestCase):
+    """
+    Tests for the set-based monthly leaderboard reset.
+    """
+    def setUp(self):
+        from datetime import date
+        self.users = [User.objects.create_user(username=f"resetuser{i}", email=f"reset{i}@exeter.ac.uk", password="testpass")
+                      for i in range(4)]
+        for user, points in zip(self.users, (30, 50, 30, 0)):
+            Leaderboard.objects.create(user=user, points=points + 100, monthly_points=points, last_reset=date(2026, 9, 1))
+
+    def test_reset_archives_standings_once(self):
+        """Test that a reset archives ranked standings, zeroes monthly points and is skipped when repeated."""
+        from datetime import date
+        from bingo.points import reset_monthly_points
+
+        with self.assertNumQueries(5):  # Savepoint, select, insert, update, release
+            self.assertEqual(reset_monthly_points(date(2026, 10, 2)), (date(2026, 9, 1), 3, 4))
+
+        standings = MonthlyStanding.objects.filter(month=date(2026, 9, 1)).order_by("rank", "user_id")
+        self.assertEqual([(s.user_id, s.rank, s.points) for s in standings],
+                         [(self.users[1].id, 1, 50), (self.users[0].id, 2, 30), (self.users[2].id, 2, 30)])
+        self.assertEqual(set(Leaderboard.objects.values_list("monthly_points", "last_reset")), {(0, date(2026, 10, 2))})
+        self.assertEqual(Leaderboard.objects.get(user=self.users[1]).points, 150)
+
+        self.assertEqual(reset_monthly_points(date(2026, 10, 3)), (date(2026, 9, 1), 0, 0))
+        self.assertEqual(MonthlyStanding.objects.count(), 3)
+
+    def test_points_earned_before_the_reset_are_kept(self):
+        """Test that points earned this month before the reset ran stay on the new month."""
+        from datetime import date
+        from bingo.points import award_points, reset_monthly_points
+
+        award_points(self.users[0].id, 7)
+        reset_monthly_points(date.today().replace(day=1))
+
+        self.assertEqual(MonthlyStanding.objects.get(user=self.users[0]).points, 30)
+        self.assertEqual(Leaderboard.objects.get(user=self.users[0]).monthly_points, 7)
+
+    def test_missed_resets_archived_under_their_months(self):
+        """Test that an entry last reset months ago is archived by the months its points were earned in."""
+        from datetime import date
+        from bingo.points import month_boundary, reset_monthly_points
+
+        late = User.objects.create_user(username="lateuser", email="late@exeter.ac.uk", password="testpass")
+        Leaderboard.objects.create(user=late, points=40, monthly_points=40, last_reset=date(2026, 7, 15))
+        for month, points in ((date(2026, 8, 1), 10), (date(2026, 9, 1), 5)):
+            PointEvent.objects.create(user=late, points=points, created_at=month_boundary(month))
+
+        self.assertEqual(reset_monthly_points(date(2026, 10, 2)), (date(2026, 9, 1), 6, 5))
+        self.assertEqual(
+            list(MonthlyStanding.objects.filter(user=late).order_by("month").values_list("month", "points", "rank")),
+            [(date(2026, 7, 1), 25, 1), (date(2026, 8, 1), 10, 1), (date(2026, 9, 1), 5, 4)]
+        )
+        self.assertEqual(Leaderboard.objects.get(user=late).monthly_points, 0)
+
+    def test_opening_balances_archived_by_the_due_reset(self):
+        """Test that monthly points recorded by the ledger migration before this month's reset are not carried over."""
+        from importlib import import_module
+        from django.apps import apps
+        from bingo.points import month_start, previous_month, reset_monthly_points
+
+        last_month = previous_month(month_start())
+        Leaderboard.objects.update(last_reset=last_month)
+        import_module('bingo.migrations.0019_point_ledger').record_opening_balances(apps, None)
+
+        self.assertEqual(reset_monthly_points()[1:], (3, 4))
+        self.assertEqual(MonthlyStanding.objects.get(user=self.users[1], month=last_month).points, 50)
+        self.assertEqual(set(Leaderboard.objects.values_list("monthly_points", flat=True)), {0})
+
+    def test_command_is_safe_to_run_daily(self):
+        """Test that the command reports a skipped reset when run again."""
+        out = io.StringIO()
+        call_command("reset_monthly_points", stdout=out)
+        call_command("reset_monthly_points", stdout=out)
+        self.assertIn("3 standings archived", out.getvalue())
+        self.assertIn("already reset this month", out.getvalue())
+
+class LeaderboardHistoryTests(TestCase):
+    """
+    Tests for the archived monthly leaderboard API.
+    """
+    def setUp(self):
+        from datetime import date
+        self.client = APIClient()
+        self.users = [User.objects.create_user(username=f"historyuser{i}", email=f"history{i}@exeter.ac.uk", password="testpass")
+                      for i in range(3)]
+        for month, points in ((date(2026, 8, 1), (5, 20, 10)), (date(2026, 9, 1), (40, 30, 30))):
+            for user, user_points in zip(self.users, points):
+                rank = 1 + sum(other > user_points for other in points)
+                MonthlyStanding.objects.create(user=user, month=month, points=user_points, rank=rank)
+
+    def test_latest_month_top_n(self):
+        """Test that the latest archived month is returned by default, limited and in rank order."""
+        response = self.client.get(reverse('leaderboard_history'), {"limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["month"], "2026-09")
+        self.assertEqual(response.data["months"], ["2026-09", "2026-08"])
+        self.assertEqual(response.data["standings"], [
+            {"rank": 1, "user": "historyuser0", "points": 40},
+            {"rank": 2, "user": "historyuser1", "points": 30},
+        ])
+
+    def test_past_month_and_invalid_month(self):
+        """Test that a given month is returned and a malformed month is rejected."""
+        response = self.client.get(reverse('leaderboard_history'), {"month": "2026-08"})
+        self.assertEqual([entry["user"] for entry in response.data["standings"]], ["historyuser1", "historyuser2", "historyuser0"])
+
+        response = self.client.get(reverse('leaderboard_history'), {"month": "August"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_archived_months_cached_until_reset(self):
+        """Test that the month list is read once and the monthly reset adds the month it archives."""
+        from datetime import date
+        from bingo.points import reset_monthly_points
+
+        self.client.get(reverse('leaderboard_history'))
+        # Only the standings query; the months come from the cache
+        with self.assertNumQueries(1):
+            self.client.get(reverse('leaderboard_history'))
+
+        Leaderboard.objects.create(user=self.users[0], monthly_points=15, last_reset=date(2026, 10, 1))
+        reset_monthly_points(today=date(2026, 11, 2))
+        response = self.client.get(reverse('leaderboard_history'))
+        self.assertEqual(response.data["months"], ["2026-10", "2026-09", "2026-08"])
+
+    def test_user_history(self):
+        """Test that players see their own ranks and only GameKeepers can look up others."""
+        self.client.force_authenticate(user=self.users[2])
+        response = self.client.get(reverse('user_leaderboard_history'), {"year": 2026})
+        self.assertEqual(response.data["history"], [
+            {"month": "2026-09", "rank": 2, "points": 30},
+            {"month": "2026-08", "rank": 2, "points": 10},
+        ])
+
+        response = self.client.get(reverse('user_leaderboard_history'), {"user_id": self.users[0].id})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        keeper = User.objects.create_user(username="historyKeeper", email="hk@exeter.ac.uk", password="testpass", role="GameKeeper")
+        self.client.force_authenticate(user=keeper)
+        response = self.client.get(reverse('user_leaderboard_history'), {"user_id": self.users[0].id})
+        self.assertEqual([entry["rank"] for entry in response.data["history"]], [1, 3])
+
 # Check Developer Role Tests
 
 class CheckDeveloperRoleTestCase(TestCase):
@@ -374,6 +802,233 @@ class GetUserProfileTestCase(TestCase):
         self.assertEqual(response.json()["total_points"], 0)
         self.assertEqual(response.json()["rank"], "Beginner")
 
+    def test_get_user_profile_query_count(self):
+        """Test that the profile costs three queries however many tasks and badges the user has."""
+        from bingo.models import BingoPattern
+        from bingo.rank_service import rebuild_rank_index
+
+        for i in range(5):
+            task = Task.objects.create(description=f"Profile Task {i}", points=5)
+            UserTask.objects.create(user=self.user, task=task, status="approved" if i < 3 else "rejected",
+                                    completed=i < 3, rejection_reason="Blurry" if i >= 3 else None)
+        for pattern_type in ("HORIZ", "VERT"):
+            pattern = BingoPattern.objects.create(name="", pattern_type=pattern_type, description="", bonus_points=5)
+            UserBadge.objects.create(user=self.user, pattern=pattern)
+        rebuild_rank_index()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('get_user_profile'))
+        data = response.json()
+        self.assertEqual(data["completed_tasks"], 3)
+        self.assertEqual([task["rejection_reason"] for task in data["user_tasks"]], [None, None, None, "Blurry", "Blurry"])
+        self.assertEqual([badge["name"] for badge in data["badges"]], ["HORIZ Pattern", "VERT Pattern"])
+        self.assertEqual(data["leaderboard_rank"], 1)
+
+        # Served from the profile cache until something changes
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse('get_user_profile'))
+        self.assertEqual(cached.json(), data)
+
+
+class ProfileCacheTests(TestCase):
+    """
+    Tests for the per-user profile cache and its version bumps.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='cacheuser', email='cacheuser@example.com', password='password123')
+        self.keeper = User.objects.create_user(username='cachekeeper', email='cachekeeper@example.com', password='password123',
+                                               role='GameKeeper')
+        Profile.objects.create(user=self.user)
+        Leaderboard.objects.create(user=self.user, points=10)
+        self.task = Task.objects.create(description="Cached Task", points=15)
+        self.user_task = UserTask.objects.create(user=self.user, task=self.task, status='pending')
+        self.client.force_authenticate(user=self.user)
+
+    def get_profile(self):
+        return self.client.get(reverse('get_user_profile')).json()
+
+    def test_hits_and_misses_are_counted(self):
+        """Test that the first read is a miss and repeated reads are hits."""
+        from bingo.profile_cache import get_profile_state, profile_cache_stats
+
+        before = profile_cache_stats()
+        for _ in range(3):
+            get_profile_state(self.user.id)
+        after = profile_cache_stats()
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 2)
+
+    def test_hit_rate_reported_across_processes(self):
+        """Test that counts are added to the shared cache and reported by the command."""
+        from bingo import profile_cache
+
+        profile_cache.reset_profile_cache_stats()
+        with patch.object(profile_cache, 'STATS_FLUSH_EVERY', 4), \
+                patch.dict(profile_cache._unflushed, {'hits': 0, 'misses': 0}):
+            for _ in range(5):
+                profile_cache.get_profile_state(self.user.id)
+        self.assertEqual(profile_cache.shared_profile_cache_stats(), {'hits': 3, 'misses': 1})
+
+        out = io.StringIO()
+        call_command('profile_cache_stats', '--reset', stdout=out)
+        self.assertIn("3 hits, 1 misses (75.0% hit rate)", out.getvalue())
+        self.assertEqual(profile_cache.shared_profile_cache_stats(), {'hits': 0, 'misses': 0})
+
+    def test_reject_bumps_version(self):
+        """Test that rejecting a submission is shown on the next read."""
+        from bingo.profile_cache import profile_version
+
+        self.assertEqual(self.get_profile()['user_tasks'][0]['status'], 'pending')
+        version = profile_version(self.user.id)
+
+        keeper_client = APIClient()
+        keeper_client.force_authenticate(user=self.keeper)
+        keeper_client.post(reverse('reject_task'), {'user_id': self.user.id, 'task_id': self.task.id,
+                                                    'reason': 'Blurry'}, format='json')
+
+        self.assertNotEqual(profile_version(self.user.id), version)
+        task = self.get_profile()['user_tasks'][0]
+        self.assertEqual(task['status'], 'rejected')
+        self.assertEqual(task['rejection_reason'], 'Blurry')
+
+    def test_bulk_approve_shows_points(self):
+        """Test that bulk approvals, which skip model signals, still refresh the profile."""
+        self.assertEqual(self.get_profile()['total_points'], 10)
+
+        keeper_client = APIClient()
+        keeper_client.force_authenticate(user=self.keeper)
+        with self.captureOnCommitCallbacks(execute=True):
+            keeper_client.post(reverse('approve_tasks_bulk'), {
+                'decisions': [{'user_id': self.user.id, 'task_id': self.task.id}]
+            }, format='json')
+
+        data = self.get_profile()
+        self.assertEqual(data['total_points'], 25)
+        self.assertEqual(data['completed_tasks'], 1)
+
+    def test_profile_update_bumps_version(self):
+        """Test that updating the profile picture is shown on the next read."""
+        from bingo.profile_cache import get_profile_state
+
+        self.assertIsNone(self.get_profile()['profile_picture'])
+
+        profile = Profile.objects.get(user=self.user)
+        profile.profile_picture = 'profile_pictures/new.png'
+        profile.save()
+        self.assertEqual(get_profile_state(self.user.id)['picture'], 'profile_pictures/new.png')
+
+class ConditionalGetTests(TestCase):
+    """
+    Tests for ETag revalidation of the read-mostly endpoints.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='etaguser', email='etaguser@example.com', password='password123')
+        Leaderboard.objects.create(user=self.user, points=10)
+        self.task = Task.objects.create(description="ETag Task", points=5)
+        self.client.force_authenticate(user=self.user)
+
+    def revalidate(self, url):
+        """Fetch a URL, then fetch it again with the ETag it returned."""
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('no-cache', first['Cache-Control'])
+        return first, self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+    def test_tasks_not_modified_until_task_changes(self):
+        """Test that the task list answers 304 until a task is added."""
+        first, second = self.revalidate(reverse('tasks'))
+        self.assertEqual(second.status_code, 304)
+
+        Task.objects.create(description="Another ETag Task", points=5)
+        third = self.client.get(reverse('tasks'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third['ETag'], first['ETag'])
+
+    def test_profile_not_modified_until_submission(self):
+        """Test that the profile answers 304 without queries until the user submits a task."""
+        from bingo.rank_service import rebuild_rank_index
+
+        rebuild_rank_index()
+        first = self.client.get(reverse('get_user_profile'))
+        self.assertIn('private', first['Cache-Control'])
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('get_user_profile'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+        UserTask.objects.create(user=self.user, task=self.task, status='pending')
+        third = self.client.get(reverse('get_user_profile'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(len(third.json()['user_tasks']), 1)
+
+    def test_badges_not_modified(self):
+        """Test that badges answer 304 when unchanged."""
+        _, second = self.revalidate(reverse('user_badges'))
+        self.assertEqual(second.status_code, 304)
+
+    def test_api_config_not_modified(self):
+        """Test that the API configuration answers 304 when unchanged."""
+        _, second = self.revalidate('/api-config/')
+        self.assertEqual(second.status_code, 304)
+
+    def test_errors_are_not_tagged(self):
+        """Test that unauthenticated requests get no ETag."""
+        response = APIClient().get(reverse('get_user_profile'))
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(response.has_header('ETag'))
+
+class FastSerializerTests(TestCase):
+    """
+    Tests that the fast list serializers match the DRF serializers.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='fastuser', email='fastuser@example.com', password='password123')
+        Profile.objects.create(user=self.user, rank="Beginner")
+        Leaderboard.objects.create(user=self.user, points=42)
+        task = Task.objects.create(description="Fast Task", points=7, requires_scan=True)
+        UserTask.objects.create(user=self.user, task=task, completed=True, status='approved')
+        UserTask.objects.create(user=self.user, task=Task.objects.create(description="Open Task", points=3))
+
+    def test_tasks_match_drf(self):
+        """Test that serialize_tasks gives the TaskSerializer output."""
+        from bingo.fast_serializers import serialize_tasks
+        from bingo.serializers import TaskSerializer
+
+        tasks = Task.objects.order_by('id')
+        self.assertEqual(serialize_tasks(tasks), TaskSerializer(tasks, many=True).data)
+
+    def test_leaderboard_matches_drf(self):
+        """Test that serialize_leaderboard gives the LeaderboardSerializer output."""
+        from bingo.fast_serializers import serialize_leaderboard
+        from bingo.serializers import LeaderboardSerializer
+
+        entries = Leaderboard.objects.order_by('-points', 'id')
+        self.assertEqual(serialize_leaderboard(entries), LeaderboardSerializer(entries, many=True).data)
+
+    def test_profiles_match_drf_in_one_query(self):
+        """Test that serialize_profiles gives the ProfileSerializer output without per-profile queries."""
+        from bingo.fast_serializers import serialize_profiles
+        from bingo.serializers import ProfileSerializer
+
+        profiles = Profile.objects.order_by('id')
+        with self.assertNumQueries(1):
+            fast = serialize_profiles(profiles)
+        self.assertEqual(fast, ProfileSerializer(profiles, many=True).data)
+        self.assertEqual(fast[0]['completed_tasks'], 1)
+        self.assertNotIn('rank', fast[0])  # The stored rank is not kept up to date
+
+    def test_dumps_without_orjson(self):
+        """Test that dumps falls back to the standard library encoder."""
+        from bingo import fast_serializers
+
+        data = [{'id': 1, 'description': 'Caf\u00e9', 'position': None}]
+        with patch('bingo.fast_serializers.orjson', None):
+            fallback = fast_serializers.dumps(data)
+        self.assertIsInstance(fallback, bytes)
+        self.assertEqual(json.loads(fallback), data)
+        self.assertEqual(json.loads(fast_serializers.dumps(data)), data)
+
 # User Rank Tests
 
 class UserRankTests(TestCase):
@@ -403,4 +1058,722 @@ class UserRankTests(TestCase):
         self.assertEqual(user_rank(49), "Beginner")
         self.assertEqual(user_rank(50), "Intermediate")
         self.assertEqual(user_rank(99), "Intermediate")
-        self.assertEqual(user_rank(100), "Expert")
\ No newline at end of file
+        self.assertEqual(user_rank(100), "Expert")
+
+# Pending Task Review Tests
+
+class PendingTasksPaginationTests(TestCase):
+    """
+    Tests for the keyset-paginated GameKeeper review queue.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.keeper = User.objects.create_user(username="queueKeeper", email="qk@exeter.ac.uk", password="testpass", role="GameKeeper")
+        self.client.force_authenticate(user=self.keeper)
+        self.tasks = [Task.objects.create(description=f"Queue Task {i}", points=5) for i in range(2)]
+        self.user_tasks = []
+        for i in range(5):
+            player = User.objects.create_user(username=f"queuePlayer{i}", email=f"qp{i}@exeter.ac.uk", password="testpass")
+            self.user_tasks.append(UserTask.objects.create(user=player, task=self.tasks[i % 2], status="pending"))
+        # Submissions made at the same moment are ordered by id
+        UserTask.objects.filter(id__in=[ut.id for ut in self.user_tasks[1:3]]).update(
+            completion_date=self.user_tasks[1].completion_date
+        )
+
+    def fetch_all(self, **params):
+        """Follow X-Next-Cursor through every page, returning the pages' user task ids."""
+        pages = []
+        while True:
+            response = self.client.get(reverse('pending-tasks'), params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append([item["user_task_id"] for item in response.data])
+            if "X-Next-Cursor" not in response:
+                return pages
+            params["after"] = response["X-Next-Cursor"]
+
+    def test_pages_cover_queue_in_order(self):
+        """Test that paging through the queue returns every submission once, oldest first."""
+        pages = self.fetch_all(limit=2)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), [ut.id for ut in self.user_tasks])
+
+    def test_filter_by_task(self):
+        """Test that the queue can be restricted to a single task."""
+        pages = self.fetch_all(limit=2, task_id=self.tasks[1].id)
+        self.assertEqual(sum(pages, []), [ut.id for ut in self.user_tasks if ut.task_id == self.tasks[1].id])
+
+    def test_page_is_a_single_query(self):
+        """Test that a page is loaded with one joined query regardless of its size."""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('pending-tasks'), {"limit": 50})
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response.data[0]["username"], "queuePlayer0")
+
+    def test_invalid_parameters(self):
+        """Test that malformed paging parameters are rejected."""
+        for params in ({"after": "yesterday,1"}, {"after": "1"}, {"limit": "many"}, {"limit": 0}):
+            response = self.client.get(reverse('pending-tasks'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class BulkReviewTests(TestCase):
+    """
+    Tests for approving and rejecting many submissions in one request.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.keeper = User.objects.create_user(username="bulkKeeper", email="bk@exeter.ac.uk", password="testpass", role="GameKeeper")
+        self.client.force_authenticate(user=self.keeper)
+        self.tasks = [Task.objects.create(description=f"Bulk Task {i}", points=10 + i) for i in range(6)]
+        self.players = []
+        for i in range(2):
+            player = User.objects.create_user(username=f"bulkPlayer{i}", email=f"bp{i}@exeter.ac.uk", password="testpass")
+            Leaderboard.objects.create(user=player, points=1)
+            if i == 0:
+                Profile.objects.create(user=player)  # The other player's profile is created on approval
+            self.players.append(player)
+            for task in self.tasks:
+                UserTask.objects.create(user=player, task=task, status="pending")
+
+    def decisions(self, task_count):
+        return [{"user_id": player.id, "task_id": task.id} for player in self.players for task in self.tasks[:task_count]]
+
+    def test_bulk_approve_awards_points_per_user(self):
+        """Test that a batch approves every submission and adds each user's points once."""
+        response = self.client.post(reverse('approve_tasks_bulk'), {"decisions": self.decisions(3)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["approved"], 6)
+
+        for player in self.players:
+            self.assertEqual(UserTask.objects.filter(user=player, status="approved", completed=True).count(), 3)
+            pattern_bonus = sum(badge.pattern.bonus_points for badge in UserBadge.objects.filter(user=player))
+            self.assertEqual(Leaderboard.objects.get(user=player).points, 1 + 10 + 11 + 12 + pattern_bonus)
+            self.assertEqual(Profile.objects.get(user=player).total_points, 10 + 11 + 12)
+            # One ledger event per approved task
+            self.assertEqual(sorted(PointEvent.objects.filter(user=player, kind="task").values_list("task_id", flat=True)),
+                             [task.id for task in self.tasks[:3]])
+
+    def test_bulk_approve_reports_skipped_decisions(self):
+        """Test that approved and unknown submissions are reported without failing the batch."""
+        self.client.post(reverse('approve_tasks_bulk'), {"decisions": self.decisions(1)}, format='json')
+        decisions = self.decisions(2) + [{"user_id": self.keeper.id, "task_id": self.tasks[0].id}]
+        response = self.client.post(reverse('approve_tasks_bulk'), {"decisions": decisions}, format='json')
+
+        self.assertEqual(response.data["approved"], 2)
+        self.assertEqual(len(response.data["already_approved"]), 2)
+        self.assertEqual(response.data["not_found"], [{"user_id": self.keeper.id, "task_id": self.tasks[0].id}])
+        self.assertEqual(Leaderboard.objects.get(user=self.players[0]).points, 1 + 10 + 11)
+
+    def test_bulk_approve_queries_do_not_grow_with_batch(self):
+        """Test that the number of queries depends on the users in a batch, not its size."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from bingo.bingo_board import get_board_layout
+
+        Profile.objects.create(user=self.players[1])
+        get_board_layout()  # Cached once per process, so keep it out of the first count
+        counts = []
+        with patch("bingo.views.check_and_award_patterns") as mock_patterns:
+            for task_range in ((0, 2), (2, 6)):
+                decisions = [{"user_id": player.id, "task_id": task.id}
+                             for player in self.players for task in self.tasks[slice(*task_range)]]
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.post(reverse('approve_tasks_bulk'), {"decisions": decisions}, format='json')
+                counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(mock_patterns.call_count, 4)  # Once per user per batch
+
+    def test_bulk_approve_survives_failed_pattern_check(self):
+        """Test that a pattern check whose transaction is rolled back does not undo the approvals."""
+        from django.db import transaction
+
+        def failed_check(user, completed_task_ids=None):
+            # What a swallowed IntegrityError leaves behind on PostgreSQL
+            transaction.set_rollback(True)
+            return [], False
+
+        with patch("bingo.views.check_and_award_patterns", side_effect=failed_check):
+            response = self.client.post(reverse('approve_tasks_bulk'), {"decisions": self.decisions(2)}, format='json')
+
+        self.assertEqual(response.data["approved"], 4)
+        self.assertEqual(UserTask.objects.filter(status="approved", completed=True).count(), 4)
+        self.assertEqual(Leaderboard.objects.get(user=self.players[0]).points, 1 + 10 + 11)
+
+    def test_bulk_reject_uses_reasons(self):
+        """Test that a batch rejection stores per-decision reasons with a shared default."""
+        decisions = self.decisions(2)
+        decisions[0]["reason"] = "Blurry photo"
+        response = self.client.post(reverse('reject_tasks_bulk'), {"decisions": decisions, "reason": "Not this task"}, format='json')
+        self.assertEqual(response.data["rejected"], 4)
+
+        reasons = list(UserTask.objects.filter(status="rejected").order_by("user_id", "task_id").values_list("rejection_reason", flat=True))
+        self.assertEqual(reasons, ["Blurry photo", "Not this task", "Not this task", "Not this task"])
+
+    def test_bulk_review_requires_gamekeeper(self):
+        """Test that players cannot use the bulk endpoints and bad input is rejected."""
+        response = self.client.post(reverse('approve_tasks_bulk'), {"decisions": [{"user_id": "x"}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.players[0])
+        for name in ('approve_tasks_bulk', 'reject_tasks_bulk'):
+            response = self.client.post(reverse(name), {"decisions": self.decisions(1)}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+# Bingo Pattern Tests
+
+class BingoPatternMaskTests(TestCase):
+    """
+    Tests for bitmask pattern detection on different board sizes.
+    """
+    def test_matches_grid_checks_on_every_3x3_board(self):
+        """Test that the bitmask detector agrees with the old grid checks on all 512 boards."""
+        from bingo.bingo_patterns import BingoPatternDetector
+        from bingo.management.commands.benchmark_bingo_patterns import legacy_detect_patterns
+
+        for mask in range(1 << 9):
+            grid = [[bool(mask >> (row * 3 + col) & 1) for col in range(3)] for row in range(3)]
+            self.assertEqual(BingoPatternDetector.mask_from_grid(grid), mask)
+            self.assertEqual(BingoPatternDetector.detect_patterns_from_mask(mask), legacy_detect_patterns(grid))
+
+    def test_larger_boards(self):
+        """Test rows, columns, X and O on 4x4 and 5x5 boards."""
+        from bingo.bingo_patterns import BingoPatternDetector, pattern_masks
+
+        for size in (4, 5):
+            masks = pattern_masks(size)
+            detect = lambda mask: BingoPatternDetector.detect_patterns_from_mask(mask, size)
+
+            self.assertEqual(detect(masks["HORIZ"][-1]), ["HORIZ"])
+            self.assertEqual(detect(masks["VERT"][1]), ["VERT"])
+            self.assertEqual(detect(masks["DIAG"][0]), [])  # One diagonal is not an X
+            self.assertEqual(detect(masks["X"][0]), ["X"])
+            self.assertEqual(detect(masks["O"][0]), ["O", "HORIZ", "VERT"])
+            self.assertEqual(detect(masks["O"][0] & ~1), ["HORIZ", "VERT"])  # Bottom row, right column
+            self.assertEqual(bin(masks["O"][0]).count("1"), 4 * size - 4)
+
+        with self.assertRaises(ValueError):
+            pattern_masks(6)
+
+    def test_benchmark_command(self):
+        """Test that the benchmark runs and cross-checks both detectors."""
+        out = io.StringIO()
+        call_command("benchmark_bingo_patterns", boards=50, repeat=1, stdout=out)
+        self.assertIn("5x5: bitmask", out.getvalue())
+
+class CompletionMaskTests(TestCase):
+    """
+    Tests for the stored board completion mask and incremental pattern checks.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.keeper = User.objects.create_user(username="maskKeeper", email="mk@exeter.ac.uk", password="testpass", role="GameKeeper")
+        self.client.force_authenticate(user=self.keeper)
+        self.player = User.objects.create_user(username="maskPlayer", email="mp@exeter.ac.uk", password="testpass")
+        Profile.objects.create(user=self.player)
+        # Start from an empty board rather than the seeded tasks
+        Task.objects.all().delete()
+        self.tasks = [Task.objects.create(description=f"Board Task {i}", points=5) for i in range(9)]
+
+    def approve(self, index):
+        UserTask.objects.create(user=self.player, task=self.tasks[index], status="pending")
+        response = self.client.post(reverse('approve_task'), {"user_id": self.player.id, "task_id": self.tasks[index].id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_mask_kept_up_to_date_and_pattern_awarded(self):
+        """Test that approvals set board cells and the completing cell awards its pattern."""
+        from bingo.views import check_and_award_patterns
+
+        self.approve(0)
+        self.approve(1)
+        profile = Profile.objects.get(user=self.player)
+        self.assertEqual(profile.completion_mask, 0b11)
+        self.assertFalse(UserBadge.objects.filter(user=self.player).exists())
+
+        self.approve(2)
+        self.assertEqual(Profile.objects.get(user=self.player).completion_mask, 0b111)
+        self.assertEqual(list(UserBadge.objects.filter(user=self.player).values_list("pattern__pattern_type", flat=True)), ["HORIZ"])
+        # The bonus record is linked to the task that completed the pattern
+        self.assertEqual(list(TaskBonus.objects.filter(user=self.player).values_list("task_id", flat=True)), [self.tasks[2].id])
+
+        # A check through a cell that completes nothing reads only the stored mask; the layout is cached
+        UserTask.objects.create(user=self.player, task=self.tasks[4], status="approved", completed=True)
+        with self.assertNumQueries(1):
+            self.assertEqual(check_and_award_patterns(self.player, completed_task_ids={self.tasks[4].id}), ([], False))
+
+    def test_failed_badge_keeps_other_awards(self):
+        """Test that a badge that fails to save does not undo the rest of the check's transaction."""
+        from django.db import transaction
+
+        from bingo.views import check_and_award_patterns
+
+        for i in (0, 1, 2, 3, 6):
+            UserTask.objects.create(user=self.player, task=self.tasks[i], status="approved", completed=True)
+        create_badge = UserBadge.objects.create
+
+        def concurrent_award(user, pattern):
+            if pattern.pattern_type == "HORIZ":
+                create_badge(user=user, pattern=pattern)  # Awarded by another approval first
+            return create_badge(user=user, pattern=pattern)
+
+        with patch.object(UserBadge.objects, "create", side_effect=concurrent_award), \
+                self.assertLogs("bingo.views", level="ERROR") as logs:
+            with transaction.atomic():
+                check_and_award_patterns(self.player, completed_task_ids={self.tasks[0].id})
+
+        self.assertIn("Error creating or retrieving pattern HORIZ", logs.output[0])
+        # The failed HORIZ badge is rolled back to its savepoint; VERT and its bonus are kept
+        self.assertEqual(list(UserBadge.objects.filter(user=self.player).values_list("pattern__pattern_type", flat=True)),
+                         ["VERT"])
+        self.assertEqual(Leaderboard.objects.get(user=self.player).points, 5)
+
+    def test_mask_rebuilt_when_board_changes(self):
+        """Test that a mask built for an old board layout is rebuilt."""
+        from bingo.bingo_board import get_completion_mask
+
+        UserTask.objects.create(user=self.player, task=self.tasks[1], status="approved", completed=True)
+        self.assertEqual(get_completion_mask(self.player)[0], 0b10)
+
+        self.tasks[1].delete()
+        replacement = Task.objects.create(description="Board Task 9", points=5)
+        UserTask.objects.create(user=self.player, task=replacement, status="approved", completed=True)
+        UserTask.objects.create(user=self.player, task=self.tasks[2], status="approved", completed=True)
+        mask, layout = get_completion_mask(self.player)
+        self.assertEqual(layout.task_ids[1], replacement.id)
+        self.assertEqual(mask, 0b110)
+
+
+    def test_profile_reads_do_not_award_badges(self):
+        """Test that profile and badge reads write nothing, and reconciliation awards missed badges."""
+        for i in range(3):
+            UserTask.objects.create(user=self.player, task=self.tasks[i], status="approved", completed=True)
+        self.client.force_authenticate(user=self.player)
+
+        for name in ('get_user_profile', 'user_badges'):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(UserBadge.objects.filter(user=self.player).exists())
+
+        out = io.StringIO()
+        call_command("reconcile_badges", dry_run=True, stdout=out)
+        self.assertIn("maskPlayer: missing HORIZ", out.getvalue())
+        self.assertFalse(UserBadge.objects.filter(user=self.player).exists())
+
+        call_command("reconcile_badges", stdout=out)
+        self.assertEqual(list(UserBadge.objects.filter(user=self.player).values_list("pattern__pattern_type", flat=True)), ["HORIZ"])
+        response = self.client.get(reverse('get_user_profile'))
+        self.assertEqual([badge["type"] for badge in response.data["badges"]], ["HORIZ"])
+
+    def test_only_patterns_through_new_cells_checked(self):
+        """Test that incremental detection ignores complete patterns elsewhere on the board."""
+        from bingo.bingo_patterns import BingoPatternDetector
+
+        full_top_row_and_left_column = 0b001001111
+        self.assertEqual(BingoPatternDetector.detect_patterns_through_cells(full_top_row_and_left_column, [6]), ["VERT"])
+        self.assertEqual(BingoPatternDetector.detect_patterns_through_cells(full_top_row_and_left_column, [0]), ["HORIZ", "VERT"])
+        self.assertEqual(BingoPatternDetector.detect_patterns_through_cells(full_top_row_and_left_column, [4]), [])
+
+
+class BoardLayoutTests(TestCase):
+    """
+    Tests for the versioned board layout and its in-process cache.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        # Start from an empty board rather than the seeded tasks
+        Task.objects.all().delete()
+        self.tasks = [Task.objects.create(description=f"Layout Task {i}", points=5) for i in range(9)]
+        self.board = Board.objects.get(is_active=True)
+
+    def test_new_tasks_fill_cells_in_order(self):
+        """Test that tasks take cells as they are created and extra tasks stay off a full board."""
+        from bingo.bingo_board import get_board_layout
+
+        layout = get_board_layout()
+        self.assertEqual(layout.task_ids, tuple(task.id for task in self.tasks))
+
+        extra = Task.objects.create(description="Off-board Task", points=5)
+        self.assertFalse(BoardCell.objects.filter(task=extra).exists())
+        self.assertEqual(get_board_layout().key, layout.key)
+
+    def test_deleted_task_frees_its_cell(self):
+        """Test that deleting a task empties its cell, bumps the version and the next task takes the cell."""
+        from bingo.bingo_board import get_board_layout
+
+        version = get_board_layout().version
+        self.tasks[4].delete()
+        layout = get_board_layout()
+        self.assertGreater(layout.version, version)
+        self.assertIsNone(layout.task_ids[4])
+        self.assertEqual(layout.task_ids[5], self.tasks[5].id)
+
+        replacement = Task.objects.create(description="Replacement Task", points=5)
+        self.assertEqual(get_board_layout().positions[replacement.id], 4)
+
+    def test_layout_cached_until_board_changes(self):
+        """Test that the layout is read once and reloaded after a board edit."""
+        from bingo.bingo_board import get_board_layout
+
+        layout = get_board_layout()
+        with self.assertNumQueries(0):
+            self.assertIs(get_board_layout(), layout)
+
+        self.board.size = 4
+        self.board.save()
+        resized = get_board_layout()
+        self.assertEqual(resized.size, 4)
+        self.assertNotEqual(resized.key, layout.key)
+        self.assertEqual(resized.task_ids[9:], (None,) * 7)
+        self.assertEqual({task['board_size'] for task in self.client.get(reverse('tasks')).json()}, {4})
+
+    def test_tasks_endpoint_includes_positions(self):
+        """Test that /tasks/ lists board tasks in cell order with their positions."""
+        BoardCell.objects.get(task=self.tasks[0]).delete()
+        moved = BoardCell.objects.get(task=self.tasks[8])
+        moved.position = 0
+        moved.save()
+        refill = Task.objects.create(description="Refill Task", points=5)
+        extra = Task.objects.create(description="Off-board Task", points=5)
+
+        response = self.client.get(reverse('tasks'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        positions = [(task["id"], task["position"]) for task in response.json()]
+        self.assertEqual(positions[0], (self.tasks[8].id, 0))
+        self.assertEqual(positions[1], (self.tasks[1].id, 1))
+        self.assertEqual(positions[8], (refill.id, 8))
+        self.assertEqual(positions[-2:], [(self.tasks[0].id, None), (extra.id, None)])
+
+
+# Image Fraud Detection Tests
+
+def make_test_image(color=(200, 30, 30), size=(64, 48), fmt="PNG"):
+    """Build an in-memory image with a split pattern so its hash is not uniform."""
+    image = Image.new("RGB", size, color)
+    for x in range(size[0] // 2):
+        for y in range(size[1]):
+            image.putpixel((x, y), (255 - color[0], 255 - color[1], 255 - color[2]))
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ImageSignatureTests(TestCase):
+    """
+    Tests for persisted image signatures used by the fraud detector.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="sigUser", email="sig@exeter.ac.uk", password="testpass")
+        self.client.force_authenticate(user=self.user)
+        Profile.objects.create(user=self.user)
+        self.task = Task.objects.create(description="Photo Task", points=10, requires_upload=True)
+
+    def test_signature_stored_by_fraud_check(self):
+        """Test that submitting a photo queues a check that scores it and stores its signature."""
+        photo = SimpleUploadedFile("photo.png", make_test_image(), content_type="image/png")
+        response = self.client.post(reverse('complete_task'), {"task_id": self.task.id, "photo": photo}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user_task = UserTask.objects.get(user=self.user, task=self.task)
+        self.assertEqual(user_task.verification_status, "pending")
+
+        self.assertEqual(process_pending_fraud_checks(), 1)
+        user_task.refresh_from_db()
+        self.assertEqual(user_task.verification_status, "clear")
+        self.assertEqual(user_task.status, "pending")
+        signature = ImageSignature.objects.get(user_task=user_task)
+        self.assertEqual(len(signature.regions), 9)
+
+    def test_reused_photo_flagged_and_shown_to_gamekeeper(self):
+        """Test that a reused photo is rejected by the check and its score is reported."""
+        first_task = Task.objects.create(description="First Photo Task", points=10, requires_upload=True)
+        for task in (first_task, self.task):
+            photo = SimpleUploadedFile("photo.png", make_test_image(), content_type="image/png")
+            self.client.post(reverse('complete_task'), {"task_id": task.id, "photo": photo}, format='multipart')
+            process_pending_fraud_checks()
+
+        user_task = UserTask.objects.get(user=self.user, task=self.task)
+        self.assertEqual(user_task.verification_status, "flagged")
+        self.assertEqual(user_task.status, "rejected")
+        self.assertEqual(user_task.fraud_matched_task, UserTask.objects.get(user=self.user, task=first_task))
+
+        keeper = User.objects.create_user(username="keeper", email="keeper@exeter.ac.uk", password="testpass", role="GameKeeper")
+        self.client.force_authenticate(user=keeper)
+        response = self.client.get(reverse('pending-tasks'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["verification_status"], "clear")
+        self.assertEqual(response.data[0]["fraud_score"], 0)
+
+    def test_previous_photos_are_not_decoded(self):
+        """Test that fraud checks only decode the new image."""
+        detector = BasicImageFraudDetector(similarity_threshold=85)
+        for i in range(3):
+            task = Task.objects.create(description=f"Task {i}", points=5)
+            user_task = UserTask.objects.create(user=self.user, task=task, photo=f"task_photos/missing_{i}.png")
+            detector.save_image_signature(user_task.id, make_test_image(color=(40 * i, 90, 160)))
+
+        new_image = make_test_image(color=(0, 90, 160))
+        with patch.object(BasicImageFraudDetector, "_get_image_signature",
+                          wraps=detector._get_image_signature) as mock_signature:
+            is_fraudulent, similarity, matched_task_id = detector.is_image_fraudulent(new_image, user_id=self.user.id)
+
+        self.assertEqual(mock_signature.call_count, 1)
+        self.assertTrue(is_fraudulent)
+        self.assertIsNotNone(matched_task_id)
+
+    def test_packed_hash_matches_legacy_string(self):
+        """Test that packed hashes and legacy '0'/'1' strings compare the same way."""
+        detector = BasicImageFraudDetector()
+        packed = detector._get_image_signature(make_test_image())['binary_hash']
+        legacy = format(packed, "0256b")
+        flipped = packed ^ 0b1111
+
+        self.assertEqual(hash_to_int(legacy), packed)
+        self.assertEqual(hash_to_int(hash_to_bytes(packed)), packed)
+        self.assertEqual(detector._calculate_hash_similarity(legacy, packed), 100)
+        self.assertAlmostEqual(detector._calculate_hash_similarity(legacy, flipped), 100 * 252 / 256)
+        self.assertEqual(detector._calculate_hash_similarity("0101", packed), 0)
+
+    def test_reused_photo_detected_across_accounts(self):
+        """Test that a photo submitted by another account is found through the hash index."""
+        other_user = User.objects.create_user(username="otherUser", email="other@exeter.ac.uk", password="testpass")
+        other_task = UserTask.objects.create(user=other_user, task=self.task, photo="task_photos/other.png")
+        detector = BasicImageFraudDetector(similarity_threshold=85)
+        detector.save_image_signature(other_task.id, make_test_image())
+
+        is_fraudulent, similarity, matched_task_id = detector.is_image_fraudulent(make_test_image(), user_id=self.user.id)
+        self.assertTrue(is_fraudulent)
+        self.assertEqual(matched_task_id, other_task.id)
+
+        other_task.delete()
+        is_fraudulent, similarity, matched_task_id = detector.is_image_fraudulent(make_test_image(), user_id=self.user.id)
+        self.assertFalse(is_fraudulent)
+
+    def test_batch_signatures_match_single_image_path(self):
+        """Test that batch signatures equal the per-image ones and flag bad files."""
+        detector = BasicImageFraudDetector()
+        images = [make_test_image(color=(40 * i, 90, 160), size=(400, 300), fmt=fmt)
+                  for i, fmt in enumerate(["PNG", "JPEG", "GIF"])]
+        batch = compute_signatures([io.BytesIO(data) for data in images] + [io.BytesIO(b"not an image")])
+
+        self.assertIsNone(batch[-1])
+        for data, signature in zip(images, batch):
+            self.assertEqual(signature, detector._get_image_signature(data))
+
+    def test_signature_uses_reduced_jpeg_decode(self):
+        """Test that large JPEGs are decoded in draft mode but keep their original dimensions."""
+        detector = BasicImageFraudDetector()
+        data = make_test_image(size=(2400, 1800), fmt="JPEG")
+        with patch.object(Image.Image, "convert", autospec=True, side_effect=Image.Image.convert) as mock_convert:
+            signature = detector._get_image_signature(data)
+
+        self.assertEqual(signature['size'], "2400x1800")
+        decoded_sizes = [call.args[0].size for call in mock_convert.call_args_list]
+        self.assertTrue(all(max(size) <= 2400 // 8 for size in decoded_sizes))
+
+    def test_upload_and_fraud_check_do_not_buffer_photo(self):
+        """Test that a large upload is streamed to storage and hashed without reading it into memory."""
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from bingo.views import complete_task
+        import tracemalloc
+
+        buffer = io.BytesIO()
+        Image.frombytes("RGB", (1200, 1000), os.urandom(1200 * 1000 * 3)).save(buffer, format="PNG")
+        data = buffer.getvalue()
+        request = APIRequestFactory().post(
+            reverse('complete_task'),
+            {"task_id": self.task.id, "photo": SimpleUploadedFile("noise.png", data, content_type="image/png")},
+            format='multipart'
+        )
+        force_authenticate(request, user=self.user)
+
+        tracemalloc.start()
+        try:
+            response = complete_task(request)
+            request.close()  # As the request handler does, closing the uploaded file
+            _, upload_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            process_pending_fraud_checks()
+            _, check_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLess(upload_peak, len(data) // 4)
+        self.assertLess(check_peak, len(data) // 4)
+        self.assertEqual(UserTask.objects.get(user=self.user, task=self.task).verification_status, "clear")
+
+    def test_signature_follows_exif_orientation(self):
+        """Test that a sideways upload tagged with its orientation hashes like the upright stored copy."""
+        detector = BasicImageFraudDetector()
+        upright = Image.open(io.BytesIO(make_test_image(size=(300, 400))))
+        upright.paste((0, 0, 0), (0, 0, 300, 100))
+
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotate 90 degrees clockwise to display
+        sideways = io.BytesIO()
+        upright.transpose(Image.Transpose.ROTATE_90).save(sideways, format="PNG", exif=exif)
+        stored = io.BytesIO()
+        upright.save(stored, format="PNG")
+
+        sideways_signature = detector._get_image_signature(sideways.getvalue())
+        self.assertEqual(sideways_signature, detector._get_image_signature(stored.getvalue()))
+        self.assertEqual(sideways_signature['size'], "300x400")
+
+    def test_oversized_image_is_not_decoded(self):
+        """Test that images beyond the decode pixel cap are refused before decoding."""
+        detector = BasicImageFraudDetector()
+        data = make_test_image(size=(800, 600))
+        with patch("bingo.basic_image_fraud_detector.MAX_DECODE_PIXELS", 400 * 300):
+            self.assertIsNone(detector._get_image_signature(data))
+        self.assertIsNotNone(detector._get_image_signature(data))
+
+    def test_backfill_command_stores_missing_signatures(self):
+        """Test that the backfill command stores signatures for photos on disk."""
+        from django.conf import settings
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, "task_photos"), exist_ok=True)
+        with open(os.path.join(settings.MEDIA_ROOT, "task_photos", "backfill.png"), "wb") as photo:
+            photo.write(make_test_image())
+        user_task = UserTask.objects.create(user=self.user, task=self.task, photo="task_photos/backfill.png")
+
+        call_command("backfill_image_signatures", workers=1, stdout=io.StringIO())
+        self.assertTrue(ImageSignature.objects.filter(user_task=user_task).exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ImageDerivativeTests(TestCase):
+    """
+    Tests for the resized copies made of task photos and profile pictures.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="resizeUser", email="resize@exeter.ac.uk", password="testpass")
+        self.client.force_authenticate(user=self.user)
+        Profile.objects.create(user=self.user)
+        self.task = Task.objects.create(description="Photo Task", points=10, requires_upload=True)
+
+    def test_task_photo_resized_after_check(self):
+        """Test that checked photos are capped, get WebP copies and are listed by thumbnail."""
+        photo = SimpleUploadedFile("big.jpg", make_test_image(size=(3000, 1500), fmt="JPEG"), content_type="image/jpeg")
+        self.client.post(reverse('complete_task'), {"task_id": self.task.id, "photo": photo}, format='multipart')
+        process_pending_fraud_checks()
+
+        user_task = UserTask.objects.get(user=self.user, task=self.task)
+        self.assertTrue(ImageSignature.objects.filter(user_task=user_task).exists())
+        expected_sizes = {"photo": (2048, 1024), "photo_review": (1280, 640), "photo_thumbnail": (320, 160)}
+        for field, size in expected_sizes.items():
+            with Image.open(getattr(user_task, field).path) as image:
+                self.assertEqual(image.format, "WEBP")
+                self.assertEqual(image.size, size)
+
+        keeper = User.objects.create_user(username="resizeKeeper", email="rk@exeter.ac.uk", password="testpass", role="GameKeeper")
+        self.client.force_authenticate(user=keeper)
+        response = self.client.get(reverse('pending-tasks'))
+        self.assertTrue(response.data[0]["photo_url"].endswith(user_task.photo_thumbnail.url))
+        self.assertTrue(response.data[0]["photo_review_url"].endswith(user_task.photo_review.url))
+
+    def test_photo_replaced_during_resize_keeps_new_photo(self):
+        """Test that copies of a photo resubmitted while resizing are discarded, not saved over the new one."""
+        from django.core.files.storage import default_storage
+        from bingo.fraud_checks import save_photo_derivatives
+
+        photo = SimpleUploadedFile("old.jpg", make_test_image(size=(3000, 1500), fmt="JPEG"), content_type="image/jpeg")
+        user_task = UserTask.objects.create(user=self.user, task=self.task, photo=photo)
+        base_name = os.path.splitext(os.path.basename(user_task.photo.name))[0]
+        UserTask.objects.filter(id=user_task.id).update(photo="task_photos/resubmitted.jpg")
+
+        save_photo_derivatives(user_task)
+
+        stored = UserTask.objects.get(id=user_task.id)
+        self.assertEqual(stored.photo.name, "task_photos/resubmitted.jpg")
+        self.assertFalse(stored.photo_review)
+        self.assertFalse(stored.photo_thumbnail)
+        left_over = [name for _, _, files in os.walk(default_storage.location) for name in files
+                     if name.startswith(base_name + "_") or name == base_name + ".webp"]
+        self.assertEqual(left_over, [])
+
+    def test_rejected_photo_not_resized(self):
+        """Test that photos rejected by the fraud check get no resized copies."""
+        first_task = Task.objects.create(description="First Photo Task", points=10, requires_upload=True)
+        for task in (first_task, self.task):
+            photo = SimpleUploadedFile("photo.png", make_test_image(), content_type="image/png")
+            self.client.post(reverse('complete_task'), {"task_id": task.id, "photo": photo}, format='multipart')
+            process_pending_fraud_checks()
+
+        rejected = UserTask.objects.get(user=self.user, task=self.task)
+        self.assertEqual(rejected.status, "rejected")
+        self.assertFalse(rejected.photo_thumbnail)
+        self.assertTrue(UserTask.objects.get(user=self.user, task=first_task).photo_thumbnail)
+
+    def test_profile_picture_thumbnail_returned(self):
+        """Test that profile pictures are resized on upload and the thumbnail is returned."""
+        image = SimpleUploadedFile("me.png", make_test_image(size=(800, 600)), content_type="image/png")
+        response = self.client.put(reverse('update_user_profile'), {"profile_picture": image}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        profile = Profile.objects.get(user=self.user)
+        self.assertTrue(profile.profile_picture.name.endswith(".png"))  # Small enough to keep as uploaded
+        self.assertTrue(response.data["profile_picture"].endswith(profile.profile_picture_thumbnail.url))
+
+        response = self.client.get(reverse('get_user_profile'))
+        self.assertTrue(response.data["profile_picture"].endswith(profile.profile_picture_thumbnail.url))
+        self.assertTrue(response.data["profile_picture_full"].endswith(profile.profile_picture.url))
+
+
+class ImageHashIndexTests(TestCase):
+    """
+    Tests that the multi-index hash search agrees with a brute-force scan.
+    """
+    def setUp(self):
+        self.random = random.Random(2434)
+        self.hashes = {key: self.random.getrandbits(256) for key in range(1, 2001)}
+        self.index = ImageHashIndex()
+        self.index.load(self.hashes.items())
+
+    def brute_force(self, query, radius):
+        return sorted(key for key, value in self.hashes.items() if (value ^ query).bit_count() <= radius)
+
+    def test_search_matches_brute_force(self):
+        """Test that every hash within the radius is returned."""
+        for radius in (0, 10, 38, 47):
+            base = self.hashes[self.random.randint(1, 2000)]
+            query = base
+            for bit in self.random.sample(range(256), min(radius, 30)):
+                query ^= 1 << bit
+            found = sorted(key for key, _ in self.index.search(query, radius))
+            self.assertEqual(found, self.brute_force(query, radius))
+
+    def test_incremental_add_and_remove(self):
+        """Test that added and removed hashes are reflected in searches."""
+        new_hash = self.random.getrandbits(256)
+        self.index.add(5000, new_hash)
+        self.assertEqual(self.index.search(new_hash ^ 0b101, 4), [(5000, 2)])
+
+        self.index.add(5000, new_hash ^ (1 << 255))
+        self.assertEqual(self.index.search(new_hash ^ (1 << 255), 0), [(5000, 0)])
+
+        self.index.remove(5000)
+        self.assertEqual(self.index.search(new_hash ^ (1 << 255), 4), [])
+        self.assertEqual(len(self.index), 2000)
+
+    def test_search_with_shared_band_values(self):
+        """Test that hashes made of mostly flat bands, as photo hashes are, are all found."""
+        flat_bands = (0x0000, 0xFFFF, 0x00FF, 0xFF00)
+        self.hashes = {}
+        for key in range(1, 2001):
+            value = 0
+            for band in range(16):
+                value |= self.random.choice(flat_bands) << (band * 16)
+            for bit in self.random.sample(range(256), 3):
+                value ^= 1 << bit
+            self.hashes[key] = value
+        self.index.load(self.hashes.items())
+
+        for key in (1, 500, 2000):
+            query = self.hashes[key] ^ (1 << 7) ^ (1 << 100)
+            found = sorted(key for key, _ in self.index.search(query, 38))
+            self.assertEqual(found, self.brute_force(query, 38))
+
+        self.index.remove(1)
+        self.index.add(1, self.hashes[2])
+        self.assertIn((1, 0), self.index.search(self.hashes[2], 0))
@@ -6,7 +6,7 @@ from .views import (
     pending_tasks, complete_task, approve_task,
     leaderboard, update_user_profile, check_developer_role,
     get_user_profile, debug_user_tasks, debug_media_urls, force_award_pattern
-    , reject_task, password_reset_request, password_reset_confirm,get_user_badges,index,api_test
+    , reject_task, approve_tasks_bulk, leaderboard_history, user_leaderboard_history, leaderboard_around_me, reject_tasks_bulk, password_reset_request, password_reset_confirm,get_user_badges,index,api_test
 )
 
 # URL Patterns
@@ -26,6 +26,9 @@ urlpatterns = [
     path('complete_task/', complete_task, name='complete_task'),
     path('approve-task/', approve_task, name='approve_task'),
     path('leaderboard/', leaderboard, name='leaderboard'),
+    path('leaderboard/around-me/', leaderboard_around_me, name='leaderboard_around_me'),
+    path('leaderboard/history/', leaderboard_history, name='leaderboard_history'),
+    path('leaderboard/history/user/', user_leaderboard_history, name='user_leaderboard_history'),
     path('profile/update/', update_user_profile, name='update_user_profile'),
     path('check-developer-role/', check_developer_role, name='check_developer_role'),
     path('profile/', get_user_profile, name='get_user_profile'),
@@ -34,6 +37,8 @@ urlpatterns = [
     path('api/badges/', get_user_badges, name='user_badges'),
     path('force-award-pattern/', force_award_pattern, name='force_award_pattern'),
     path('reject-task/', reject_task, name='reject_task'),
+    path('approve-tasks/', approve_tasks_bulk, name='approve_tasks_bulk'),
+    path('reject-tasks/', reject_tasks_bulk, name='reject_tasks_bulk'),
     path('password-reset/', password_reset_request, name='password_reset_request'),
     path('password-reset/confirm/', password_reset_confirm, name='password_reset_confirm'),
     path('manifest.json', serve, {'path': 'manifest.json'}),
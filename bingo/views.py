@@ -10,12 +10,16 @@ from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.db import transaction
+from django.db.models import F, Q
 from .models import User
 from django.utils.timezone import now
 from django.http import HttpResponse
 from django.views.generic import TemplateView
 from django.views.decorators.cache import never_cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 
 # Django Rest Framework Imports
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -28,12 +32,22 @@ from rest_framework import status
 from .models import PasswordResetToken
 from django.core.mail import send_mail
 from django.conf import settings
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 
 # Model and Serializer Imports
-from .models import BingoPattern, Task, TaskBonus, UserBadge, UserTask, Leaderboard, Profile, UserConsent
-from .serializers import TaskSerializer, LeaderboardSerializer
+from .models import BingoPattern, MonthlyStanding, PointEvent, Task, TaskBonus, UserBadge, UserTask, Leaderboard, Profile, UserConsent
+from .serializers import TaskSerializer
 from .bingo_patterns import BingoPatternDetector
+from .bingo_board import get_completion_mask, set_cells_completed
+from .fraud_checks import schedule_fraud_check
+from .points import award_points, award_points_bulk
+from .leaderboard_cache import archived_months, get_leaderboard, leaderboard_changed
+from .rank_service import leaderboard_position, users_around
+from .profile_cache import get_profile_state, profile_changed, profile_version
+from .etags import conditional_etag, make_etag, resource_version
+from .task_catalogue import task_catalogue_json
+from .fast_serializers import dumps
+from .image_derivatives import delete_image_derivatives, generate_image_derivatives, image_url, stored_image_url
 
 # Local Imports
 from .forms import CustomUserCreationForm
@@ -48,27 +62,15 @@ logger = logging.getLogger(__name__)
 
 # Constants
 ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png"]
+PENDING_TASKS_PAGE_SIZE = 50  # Default number of submissions per review page
+PENDING_TASKS_MAX_PAGE_SIZE = 200
+MAX_REVIEW_BATCH_SIZE = 500  # Decisions accepted by one bulk approve/reject request
+LEADERBOARD_HISTORY_SIZE = 10  # Default number of standings returned for a past month
+LEADERBOARD_HISTORY_MAX_SIZE = 100
 User = get_user_model()
 
 
-DEBUG_PATTERN_CHECKING = False
-
-
 # Task Loading Function
-def load_initial_tasks():
-    """Loads initial tasks from JSON file if the database is empty."""
-    if not Task.objects.exists():
-        try:
-            json_file_path = os.path.join(os.path.dirname(__file__), 'initial_data.json')
-            with open(json_file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-            for item in data:
-                Task.objects.create(**item['fields'], id=item['pk'])
-            logger.info("Initial tasks loaded successfully.")
-        except Exception as e:
-            logger.error(f"Failed to load initial tasks: {e}")
-
-
 # User Profile Update
 
 @api_view(['PUT'])
@@ -91,6 +93,7 @@ def update_user_profile(request):
             # Delete profile picture if it exists
             profile = Profile.objects.filter(user=user).first()
             if profile and profile.profile_picture:
+                delete_image_derivatives(profile, 'profile_picture')
                 profile.profile_picture.delete()
             
             # Delete user tasks
@@ -116,6 +119,7 @@ def update_user_profile(request):
     profile, _ = Profile.objects.get_or_create(user=user)
 
     # Update username and email if provided
+    username_changed = data.get('username', user.username) != user.username
     user.username = data.get('username', user.username)
     user.email = data.get('email', user.email)
 
@@ -123,8 +127,9 @@ def update_user_profile(request):
     if 'profile_picture' in request.FILES:
         file = request.FILES['profile_picture']
 
-        # Delete old image before replacing
+        # Delete old image and its resized copies before replacing
         if profile.profile_picture:
+            delete_image_derivatives(profile, 'profile_picture')
             profile.profile_picture.delete()
 
         profile.profile_picture = file
@@ -132,10 +137,23 @@ def update_user_profile(request):
     user.save()
     profile.save()
 
+    # The cached leaderboard shows usernames
+    if username_changed:
+        leaderboard_changed()
+
+    # Profile pictures are small enough to resize during the request
+    if 'profile_picture' in request.FILES:
+        try:
+            changed_fields = generate_image_derivatives(profile, 'profile_picture')
+            profile.save(update_fields=changed_fields)
+        except Exception as e:
+            print(f"Error resizing profile picture for {user.username}: {str(e)}")
+
     return Response({
         "username": user.username,
         "email": user.email,
-        "profile_picture": profile.profile_picture.url if profile.profile_picture else None,
+        "profile_picture": image_url(request, profile, 'profile_picture'),
+        "profile_picture_full": image_url(request, profile, 'profile_picture', size='full'),
     })
 
 # User Registration
@@ -241,16 +259,22 @@ def login_user(request):
 
 # Task Retrieval
 
+def tasks_etag(request):
+    """Tasks change with the task catalogue and the board layout, which both bump 'tasks'."""
+    return make_etag('tasks', resource_version('tasks'))
+
+
 @api_view(['GET'])
+@conditional_etag(tasks_etag)
 def tasks(request):
     """
-    Retrieves all available tasks.
-    Ensures tasks are preloaded before retrieval.
+    Retrieves all available tasks. The initial tasks are loaded by a migration.
+
+    Each task has its board cell as position (row * size + col), or None if
+    it is not on the board. Board tasks come first, in position order. The
+    JSON is built once per task list version and served from memory.
     """
-    load_initial_tasks()
-    task_list = Task.objects.all()
-    serializer = TaskSerializer(task_list, many=True)
-    return JsonResponse(serializer.data, safe=False)
+    return HttpResponse(task_catalogue_json(), content_type='application/json')
 
 # Task Completion
 
@@ -289,7 +313,8 @@ def complete_task(request):
         return Response({"message": "This task requires a photo upload."},
                         status=status.HTTP_400_BAD_REQUEST)
 
-    # If photo is provided, check for fraud
+    # If photo is provided, validate it. The fraud check itself runs in the
+    # background once the submission is saved, so it doesn't hold this request.
     if 'photo' in request.FILES:
         photo_file = request.FILES['photo']
         print(f"Photo provided: size={photo_file.size}, type={photo_file.content_type}")
@@ -304,54 +329,13 @@ def complete_task(request):
             return Response({"message": "Uploaded file is not an image."},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        # Perform fraud detection check before saving
-        from .basic_image_fraud_detector import BasicImageFraudDetector
-
-        try:
-            # Read the image data
-            photo_file.seek(0)  # Reset file pointer to beginning
-            photo_data = photo_file.read()
-            photo_file.seek(0)  # Reset file pointer again
-
-            # Initialize the fraud detector
-            detector = BasicImageFraudDetector(similarity_threshold=85)
-
-            # Check if the image is fraudulent (similar to previously submitted images)
-            is_fraudulent, similarity, matched_task_id = detector.is_image_fraudulent(
-                photo_data,
-                user_id=user.id  # Check against this user's submissions
-            )
-
-            print(
-                f"Fraud detection results: is_fraudulent={is_fraudulent}, similarity={similarity:.2f}%, matched_task_id={matched_task_id}")
-
-            # If fraudulent, reject the submission
-            if is_fraudulent:
-                matched_task = None
-                if matched_task_id:
-                    matched_task = UserTask.objects.filter(id=matched_task_id).first()
-
-                matched_task_info = "unknown task"
-                if matched_task:
-                    matched_task_info = f"task '{matched_task.task.description}'"
-
-                return Response({
-                    "message": f"This image appears to be identical or very similar to a previously submitted image for {matched_task_info}.",
-                    "similarity": f"{similarity:.1f}%",
-                    "error": "Please take a new picture that clearly shows you completing this specific task."
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-        except Exception as e:
-            # Log the error but continue - don't block submission if fraud detection fails
-            print(f"Error during fraud detection: {str(e)}")
-            logger.error(f"Error during fraud detection: {str(e)}")
-
     # If user_task exists but was rejected, update it
     if user_task and user_task.status == 'rejected':
         print("Updating previously rejected task")
 
-        # If there was a photo, delete it before adding the new one
+        # If there was a photo, delete it and its resized copies before adding the new one
         if user_task.photo:
+            delete_image_derivatives(user_task, 'photo')
             user_task.photo.delete()
 
         # Update the existing task record
@@ -360,11 +344,14 @@ def complete_task(request):
         user_task.completion_date = timezone.now()
         user_task.rejection_reason = None  
 
-        # Save the new photo if provided
+        # Save the new photo if provided and queue it for verification
         if 'photo' in request.FILES:
             user_task.photo = request.FILES['photo']
+        queue_photo_verification(user_task)
 
         user_task.save()
+        if user_task.verification_status == 'pending':
+            schedule_fraud_check(user_task.id)
 
         print(f"Updated task: status={user_task.status}, completed={user_task.completed}")
 
@@ -372,26 +359,17 @@ def complete_task(request):
         if should_auto_approve:
             # Award points
             try:
-                profile = Profile.objects.get(user=user)
-                profile.total_points += task.points
-                profile.save()
-
-                # Also update the leaderboard
-                leaderboard, created = Leaderboard.objects.get_or_create(user=user)
-                leaderboard.points += task.points
-                leaderboard.save()
-
+                award_points(user.id, task.points, task=task)
                 print(f"Points awarded to {user.username}: {task.points}")
 
                 # Check for patterns and award badges
-                check_and_award_patterns(user)
-            except Profile.DoesNotExist:
-                print(f"Profile not found for user: {user.username}")
+                check_and_award_patterns(user, completed_task_ids={task.id})
             except Exception as e:
                 print(f"Error updating points: {str(e)}")
 
         message = "Task completed successfully!" if should_auto_approve else "Task resubmitted successfully and awaiting GameKeeper approval!"
-        return Response({"message": message}, status=status.HTTP_200_OK)
+        return Response({"message": message, "verification_status": user_task.verification_status},
+                        status=status.HTTP_200_OK)
 
     # Otherwise, create a new user task
     print("Creating new user task")
@@ -402,37 +380,39 @@ def complete_task(request):
         status='approved' if should_auto_approve else 'pending'
     )
 
-    # Save photo if provided
+    # Save photo if provided and queue it for verification
     if 'photo' in request.FILES:
         new_user_task.photo = request.FILES['photo']
+    queue_photo_verification(new_user_task)
 
     new_user_task.save()
+    if new_user_task.verification_status == 'pending':
+        schedule_fraud_check(new_user_task.id)
 
     print(f"Created new task: status={new_user_task.status}, completed={new_user_task.completed}")
 
     # Award points and check patterns if auto-approved
     if should_auto_approve:
         try:
-            profile = Profile.objects.get(user=user)
-            profile.total_points += task.points
-            profile.save()
-
-            # Also update the leaderboard
-            leaderboard, created = Leaderboard.objects.get_or_create(user=user)
-            leaderboard.points += task.points
-            leaderboard.save()
-
+            award_points(user.id, task.points, task=task)
             print(f"Points awarded to {user.username}: {task.points}")
 
             # Check for patterns and award badges
-            check_and_award_patterns(user)
-        except Profile.DoesNotExist:
-            print(f"Profile not found for user: {user.username}")
+            check_and_award_patterns(user, completed_task_ids={task.id})
         except Exception as e:
             print(f"Error updating points: {str(e)}")
 
     message = "Task completed successfully!" if should_auto_approve else "Task submitted successfully and awaiting GameKeeper approval!"
-    return Response({"message": message}, status=status.HTTP_200_OK)
+    return Response({"message": message, "verification_status": new_user_task.verification_status},
+                    status=status.HTTP_200_OK)
+
+
+def queue_photo_verification(user_task):
+    """Reset the fraud-check fields of a submission, queueing it if it has a photo."""
+    user_task.verification_status = 'pending' if user_task.photo else 'not_required'
+    user_task.fraud_score = None
+    user_task.fraud_matched_task = None
+    user_task.verification_updated_at = timezone.now()
 
 # Leaderboard Retrieval
 
@@ -441,18 +421,16 @@ def complete_task(request):
 def leaderboard_view(request):
     """Returns both lifetime and monthly leaderboard rankings with correct key names."""
     try:
-        lifetime_leaderboard = list(Leaderboard.objects.order_by('-points')[:10].values('user__username', 'points'))
-        monthly_leaderboard = list(Leaderboard.objects.order_by('-monthly_points')[:10].values('user__username', 'monthly_points'))
-
-        formatted_monthly_leaderboard = [
-            {"user": entry["user__username"], "points": entry["monthly_points"]}
-            for entry in monthly_leaderboard
+        entry = get_leaderboard()
+        lifetime_leaderboard = [
+            {"user__username": player["user"], "points": player["points"]}
+            for player in entry["lifetime"]
         ]
 
-        return JsonResponse({
+        return HttpResponse(dumps({
             "lifetime_leaderboard": lifetime_leaderboard,
-            "monthly_leaderboard": formatted_monthly_leaderboard,
-        })
+            "monthly_leaderboard": entry["monthly"],
+        }), content_type='application/json')
     except Exception as e:
         logger.error(f"Error fetching leaderboard data: {str(e)}")
         return JsonResponse({"error": "Failed to retrieve leaderboard data"}, status=500)
@@ -463,18 +441,139 @@ def leaderboard_view(request):
 
 
 
+def cached_leaderboard_response(request, entry, data):
+    """
+    Respond with part of the cached leaderboard, or 304 Not Modified when the
+    client's copy (If-None-Match / If-Modified-Since) is still current.
+    """
+    not_modified = get_conditional_response(
+        request, etag=entry['etag'], last_modified=int(entry['last_modified'].timestamp())
+    )
+    response = not_modified or Response(data)
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'].timestamp())
+    # Let browsers keep the copy but revalidate it on every use
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
 @api_view(['GET'])
 def leaderboard(request):
     """Retrieves the top 10 players from the leaderboard ordered by highest points."""
     try:
-        top_players = Leaderboard.objects.order_by('-points')[:10]
-        serializer = LeaderboardSerializer(top_players, many=True)
-        return Response(serializer.data)
+        entry = get_leaderboard()
+        return cached_leaderboard_response(request, entry, entry['lifetime'])
     except Exception as e:
         logger.error(f"Error fetching top leaderboard players: {str(e)}")
         return Response({"error": "Failed to retrieve leaderboard"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leaderboard_around_me(request):
+    """
+    Retrieves the current user's leaderboard position and the players just above and below.
+
+    Query parameters:
+        board: 'lifetime' (default) or 'monthly'
+        count: Players to show either side (default 2, at most 10)
+    """
+    field = {'lifetime': 'points', 'monthly': 'monthly_points'}.get(request.query_params.get('board', 'lifetime'))
+    if field is None:
+        return Response({"error": "board must be lifetime or monthly"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        count = min(max(int(request.query_params.get('count', 2)), 0), 10)
+    except ValueError:
+        return Response({"error": "count must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        "rank": leaderboard_position(request.user.id, field=field),
+        "players": [
+            {"rank": entry["rank"], "user": entry["username"], "points": entry["points"]}
+            for entry in users_around(request.user.id, count, field=field)
+        ]
+    })
+
+
+def parse_month(value):
+    """Parse a YYYY-MM query parameter into the first day of that month, or None if invalid."""
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except (TypeError, ValueError):
+        return None
+
+
+@api_view(['GET'])
+def leaderboard_history(request):
+    """
+    Retrieves a past month's monthly leaderboard from the archived standings.
+
+    Query parameters:
+        month: Month as YYYY-MM (default: the latest archived month)
+        limit: Number of standings to return (default 10, at most 100)
+
+    Also lists the archived months, newest first.
+    """
+    try:
+        limit = min(int(request.query_params.get('limit', LEADERBOARD_HISTORY_SIZE)), LEADERBOARD_HISTORY_MAX_SIZE)
+    except ValueError:
+        return Response({"error": "limit must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1:
+        return Response({"error": "limit must be positive"}, status=status.HTTP_400_BAD_REQUEST)
+
+    months = archived_months()
+    if 'month' in request.query_params:
+        month = parse_month(request.query_params['month'])
+        if month is None:
+            return Response({"error": "month must be YYYY-MM"}, status=status.HTTP_400_BAD_REQUEST)
+    elif months:
+        month = months[0]
+    else:
+        return Response({"month": None, "months": [], "standings": []})
+
+    standings = MonthlyStanding.objects.filter(month=month).order_by('-points', 'user_id')[:limit]
+    return Response({
+        "month": f"{month:%Y-%m}",
+        "months": [f"{m:%Y-%m}" for m in months],
+        "standings": [
+            {"rank": rank, "user": username, "points": points}
+            for rank, username, points in standings.values_list('rank', 'user__username', 'points')
+        ]
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_leaderboard_history(request):
+    """
+    Retrieves a user's archived monthly ranks, newest first.
+
+    Query parameters:
+        user_id: User to look up, for GameKeepers and Developers (default: the current user)
+        year: Only return months in this year
+    """
+    user_id = request.query_params.get('user_id')
+    if user_id and str(user_id) != str(request.user.id):
+        if (request.user.role or '').lower() not in ['gamekeeper', 'developer']:
+            return Response({'error': "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
+        user = get_object_or_404(User, id=user_id)
+    else:
+        user = request.user
+
+    standings = MonthlyStanding.objects.filter(user=user).order_by('-month')
+    if 'year' in request.query_params:
+        try:
+            standings = standings.filter(month__year=int(request.query_params['year']))
+        except ValueError:
+            return Response({"error": "year must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        "user": user.username,
+        "history": [
+            {"month": f"{month:%Y-%m}", "rank": rank, "points": points}
+            for month, rank, points in standings.values_list('month', 'rank', 'points')
+        ]
+    })
 
 
 # Check Developer Role
@@ -494,67 +593,63 @@ def check_developer_role(request):
     })
 
 
+def profile_etag(request):
+    """
+    The profile changes with the user's profile version and with their
+    leaderboard position, which moves when other players earn points.
+    """
+    user_id = request.user.id
+    version = profile_version(user_id)
+    position = leaderboard_position(user_id, points=get_profile_state(user_id)['points'])
+    return make_etag('profile', user_id, version, position)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(profile_etag, private=True)
 def get_user_profile(request):
     """
-    Get the current user's profile information including task status and rejection reasons
+    Get the current user's profile information including task status and rejection reasons.
+
+    Read-only: badges are awarded when tasks are approved, and users without a
+    profile or leaderboard entry yet are shown the defaults. The stored state
+    is served from the profile cache, which is rebuilt in three queries after
+    the user's tasks, badges, points or details change. The leaderboard
+    position comes from the in-memory rank index.
     """
     user = request.user
-    profile, created = Profile.objects.get_or_create(user=user)
-    leaderboard, _ = Leaderboard.objects.get_or_create(user=user)
+
+    # Points, pictures, tasks and badges, cached per user until one of them changes
+    state = get_profile_state(user.id)
+    user_tasks_data = state['user_tasks']
 
     # Count completed tasks
-    completed_tasks = UserTask.objects.filter(user=user, completed=True).count()
-
-    # Get all user tasks for status display with rejection reasons
-    user_tasks_list = UserTask.objects.filter(user=user)
-    user_tasks_data = []
-    for task in user_tasks_list:
-        user_tasks_data.append({
-            'task_id': task.task.id,
-            'status': task.status,
-            'completed': task.completed,
-            'submission_date': task.completion_date,
-            'rejection_reason': task.rejection_reason if task.status == 'rejected' else None
-        })
+    completed_tasks = sum(1 for task in user_tasks_data if task['completed'])
 
-    # First, check if new patterns have been completed but badges not awarded yet
-    check_and_award_patterns(user)
-    
-    # Now get user badges (after possible updates from pattern detection)
-    user_badges = UserBadge.objects.filter(user=user).select_related('pattern')
-    badges_data = []
-    for badge in user_badges:
-        badges_data.append({
-            'id': badge.pattern.id,
-            'name': badge.pattern.name if badge.pattern.name else f"{badge.pattern.pattern_type} Pattern",
-            'type': badge.pattern.pattern_type,
-            'description': badge.pattern.description,
-            'bonus_points': badge.pattern.bonus_points,
-        })
+    # Badges are awarded when the tasks completing each pattern were approved
+    badges_data = [
+        dict(badge, name=badge['name'] or f"{badge['type']} Pattern")
+        for badge in state['badges']
+    ]
 
-    # Calculate user rank
-    user_points = leaderboard.points
+    # Calculate user rank from their points
+    user_points = state['points']
     rank = user_rank(user_points)
 
-    # Update rank in profile if different
-    if profile.rank != rank:
-        profile.rank = rank
-        profile.save()
-
-    # Get user's position in leaderboard
-    leaderboard_position = Leaderboard.objects.filter(points__gt=user_points).count() + 1
+    # Get user's position in leaderboard from the in-memory rank index
+    position = leaderboard_position(user.id, points=user_points)
 
     # Prepare profile data
+    picture = state['picture']
     profile_data = {
         "username": user.username,
         "email": user.email,
         "total_points": user_points,
         "completed_tasks": completed_tasks,
-        "leaderboard_rank": leaderboard_position,
-        "profile_picture": request.build_absolute_uri(profile.profile_picture.url) if profile.profile_picture else None,
-        "rank": profile.rank,
+        "leaderboard_rank": position,
+        "profile_picture": stored_image_url(request, picture, state['picture_thumbnail']),
+        "profile_picture_full": stored_image_url(request, picture),
+        "rank": rank,
         "user_tasks": user_tasks_data,
         "badges": badges_data } 
 
@@ -640,45 +735,109 @@ def register_view(request):
     
     return render(request, 'accounts/register.html', {'form': form})
     
-# Update the pending_tasks function in views.py
+def pending_cursor(completion_date, user_task_id):
+    """
+    Build the keyset cursor for the submission after which the next page starts,
+    in the URL-safe form "<UTC completion date>,<UserTask id>".
+    """
+    completion_date = completion_date.astimezone(dt_timezone.utc)
+    return f"{completion_date.strftime('%Y-%m-%dT%H:%M:%S.%fZ')},{user_task_id}"
+
+
+def parse_pending_cursor(cursor):
+    """
+    Read a cursor built by pending_cursor.
+
+    Returns:
+        tuple: (completion_date, user_task_id), or None if the cursor is invalid
+    """
+    completion_date, _, user_task_id = cursor.rpartition(',')
+    try:
+        completion_date = parse_datetime(completion_date)
+        user_task_id = int(user_task_id)
+    except ValueError:
+        return None
+    if completion_date is None:
+        return None
+    return completion_date, user_task_id
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def pending_tasks(request):
     """
-    Shows all the pending tasks for GameKeepers to review
+    Shows the pending tasks for GameKeepers to review, oldest first.
+
+    Results are fetched in one joined query and paginated by keyset:
+    ?limit= sets the page size (default 50), ?task_id= restricts the page to
+    one task, and ?after= continues from the cursor returned in the
+    X-Next-Cursor header of the previous page. The header is omitted on the
+    last page.
     """
     # Make the role check case-insensitive and include Developer role
     if request.user.role.lower() not in ['gamekeeper', 'developer']:
         return Response({"error": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
-    
-    # Filter tasks with status 'pending' or completed=False (for backward compatibility)
+
+    try:
+        limit = int(request.query_params.get('limit', PENDING_TASKS_PAGE_SIZE))
+        task_id = request.query_params.get('task_id')
+        task_id = int(task_id) if task_id else None
+    except ValueError:
+        return Response({"error": "limit and task_id must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1:
+        return Response({"error": "limit must be positive"}, status=status.HTTP_400_BAD_REQUEST)
+    limit = min(limit, PENDING_TASKS_MAX_PAGE_SIZE)
+
     pending = UserTask.objects.filter(status='pending')
-    
+    if task_id is not None:
+        pending = pending.filter(task_id=task_id)
+
+    after = request.query_params.get('after')
+    if after:
+        cursor = parse_pending_cursor(after)
+        if cursor is None:
+            return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+        completion_date, user_task_id = cursor
+        pending = pending.filter(
+            Q(completion_date__gt=completion_date) | Q(completion_date=completion_date, id__gt=user_task_id)
+        )
+
+    # One extra row tells us whether there is another page
+    rows = list(pending.order_by('completion_date', 'id').values(
+        'id', 'user_id', 'user__username', 'task_id', 'task__description', 'task__points',
+        'task__requires_upload', 'completion_date', 'photo', 'photo_review', 'photo_thumbnail',
+        'verification_status', 'fraud_score', 'fraud_matched_task_id'
+    )[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
     # For debugging
-    print(f"Found {pending.count()} pending tasks")
-    
+    print(f"Returning {len(rows)} pending tasks")
+
     result = []
-    for item in pending:
-        task_data = {
-            'user_id': item.user.id,
-            'username': item.user.username,
-            'task_id': item.task.id,
-            'task_description': item.task.description,
-            'points': item.task.points,
-            'requires_upload': item.task.requires_upload,
-            'completion_date': item.completion_date,  
-            'photo_url': None
-        }
-        
-        # Add photo URL if exists
-        if item.photo and item.photo.name:
-            task_data['photo_url'] = request.build_absolute_uri(item.photo.url)
-            print(f"Photo URL: {task_data['photo_url']}")  # Debug: Print photo URL
-        
-        result.append(task_data)
+    for row in rows:
+        result.append({
+            'user_task_id': row['id'],
+            'user_id': row['user_id'],
+            'username': row['user__username'],
+            'task_id': row['task_id'],
+            'task_description': row['task__description'],
+            'points': row['task__points'],
+            'requires_upload': row['task__requires_upload'],
+            'completion_date': row['completion_date'],
+            'photo_url': stored_image_url(request, row['photo'], row['photo_thumbnail']),
+            'photo_review_url': stored_image_url(request, row['photo'], row['photo_review']),
+            'photo_full_url': stored_image_url(request, row['photo']),
+            'verification_status': row['verification_status'],
+            'fraud_score': row['fraud_score'],
+            'fraud_matched_task_id': row['fraud_matched_task_id']
+        })
 
-    return Response(result)
+    response = Response(result)
+    if has_more:
+        last = rows[-1]
+        response['X-Next-Cursor'] = pending_cursor(last['completion_date'], last['id'])
+    return response
 
 
 @api_view(['POST'])
@@ -702,45 +861,34 @@ def approve_task(request):
     if user_task.completed:
         return Response({"message": "Task already approved!"}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Store image signatures for approved photos (for fraud detection)
+    # Make sure approved photos have a stored signature (for fraud detection).
+    # Signatures are saved at upload time, so this only decodes older photos.
     if user_task.photo and user_task.photo.name:
         try:
             from .basic_image_fraud_detector import BasicImageFraudDetector
 
-            # Open and read the photo file
-            user_task.photo.open('rb')
-            photo_data = user_task.photo.read()
-            user_task.photo.close()
-
-            # Initialize fraud detector and save signatures
             detector = BasicImageFraudDetector()
-            detector.save_image_signature(user_task.id, photo_data)
-
-            logger.info(f"Saved image signature for task {user_task.id}")
+            detector.get_stored_signature(user_task)
         except Exception as e:
             # Log error but don't prevent approval
             logger.error(f"Error saving image signature: {str(e)}")
 
-    # Mark as completed and update status
-    user_task.completed = True
-    user_task.status = 'approved'
-    user_task.save()
-
-    # Update leaderboard
-    leaderboard, _ = Leaderboard.objects.get_or_create(user=user)
-    leaderboard.points += task.points
-    leaderboard.save()
+    # Lock the submission so concurrent approvals cannot both award its points
+    with transaction.atomic():
+        user_task = UserTask.objects.select_for_update().get(id=user_task.id)
+        if user_task.completed:
+            return Response({"message": "Task already approved!"}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Update profile total points
-    profile, _ = Profile.objects.get_or_create(user=user)
-    profile.total_points += task.points
-    profile.save()
+        # Mark as completed and update status
+        user_task.completed = True
+        user_task.status = 'approved'
+        user_task.save()
 
-    # Debugging line
-    print(f"Calling check_and_award_patterns for user {user.username}")
+        # Update leaderboard and profile points
+        award_points(user.id, task.points, task=task)
 
-    # Call this function to check for and award patterns
-    check_and_award_patterns(user)
+    # Call this function to check for and award patterns through the approved task
+    check_and_award_patterns(user, completed_task_ids={task.id})
 
     return Response({
         "message": f"Task approved for {user.username}. {task.points} points rewarded."
@@ -777,6 +925,179 @@ def reject_task(request):
         "message": f"Task submission from {user.username} has been rejected."
     })
 
+
+def parse_review_decisions(data):
+    """
+    Read the decisions of a bulk approve/reject request.
+
+    Args:
+        data: Request data with a "decisions" list of {"user_id", "task_id"}
+              objects, each optionally with a "reason"
+
+    Returns:
+        tuple: (list of decision dicts with integer ids, error message or None)
+    """
+    decisions = data.get('decisions')
+    if not isinstance(decisions, list) or not decisions:
+        return [], "decisions must be a non-empty list"
+    if len(decisions) > MAX_REVIEW_BATCH_SIZE:
+        return [], f"At most {MAX_REVIEW_BATCH_SIZE} decisions can be sent at once"
+
+    parsed = []
+    for decision in decisions:
+        try:
+            parsed.append({
+                'user_id': int(decision['user_id']),
+                'task_id': int(decision['task_id']),
+                'reason': decision.get('reason')
+            })
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return [], "Each decision needs an integer user_id and task_id"
+    return parsed, None
+
+
+def load_review_batch(decisions):
+    """
+    Lock and load the submissions named by a batch of decisions in one query.
+
+    Returns:
+        tuple: (dict of (user_id, task_id) -> UserTask, list of pairs not found)
+    """
+    pairs = {(decision['user_id'], decision['task_id']) for decision in decisions}
+    candidates = UserTask.objects.select_for_update().select_related('task').filter(
+        user_id__in={user_id for user_id, _ in pairs},
+        task_id__in={task_id for _, task_id in pairs}
+    )
+    found = {(ut.user_id, ut.task_id): ut for ut in candidates if (ut.user_id, ut.task_id) in pairs}
+    not_found = [{'user_id': user_id, 'task_id': task_id} for user_id, task_id in sorted(pairs - found.keys())]
+    return found, not_found
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def approve_tasks_bulk(request):
+    """
+    Approves many pending task submissions in one transaction.
+    Only for GameKeepers and Developers.
+
+    Expects {"decisions": [{"user_id": ..., "task_id": ...}, ...]}. Points are
+    awarded per user in bulk and bingo patterns are checked once per user.
+    Submissions that are already approved or cannot be found are reported
+    rather than failing the batch.
+    """
+    if request.user.role.lower() not in ['gamekeeper', 'developer']:
+        return Response({'error': "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
+
+    decisions, error = parse_review_decisions(request.data)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Approved photos need a stored signature; only photos submitted before
+    # signatures were saved at upload time are decoded here
+    missing_signatures = UserTask.objects.filter(
+        user_id__in={d['user_id'] for d in decisions},
+        task_id__in={d['task_id'] for d in decisions},
+        completed=False,
+        image_signature__isnull=True
+    ).exclude(photo='').exclude(photo__isnull=True)
+    pairs = {(d['user_id'], d['task_id']) for d in decisions}
+    missing_signatures = [ut for ut in missing_signatures if (ut.user_id, ut.task_id) in pairs]
+    if missing_signatures:
+        from .basic_image_fraud_detector import BasicImageFraudDetector
+
+        detector = BasicImageFraudDetector()
+        for user_task in missing_signatures:
+            try:
+                detector.get_stored_signature(user_task)
+            except Exception as e:
+                # Log error but don't prevent approval
+                logger.error(f"Error saving image signature: {str(e)}")
+
+    with transaction.atomic():
+        found, not_found = load_review_batch(decisions)
+        to_approve = [ut for ut in found.values() if not ut.completed]
+        already_approved = [{'user_id': ut.user_id, 'task_id': ut.task_id} for ut in found.values() if ut.completed]
+
+        UserTask.objects.filter(id__in=[ut.id for ut in to_approve]).update(completed=True, status='approved')
+
+        task_ids_by_user = {}
+        for user_task in to_approve:
+            task_ids_by_user.setdefault(user_task.user_id, set()).add(user_task.task_id)
+        award_points_bulk((user_task.user_id, user_task.task.points, user_task.task) for user_task in to_approve)
+
+        # update() skips the UserTask signals, so mark the board cells and
+        # bump the cached profiles here
+        for user_id, task_ids in task_ids_by_user.items():
+            set_cells_completed(user_id, task_ids)
+            profile_changed(user_id)
+
+    # Check for and award patterns once per affected user, after the approvals
+    # are committed as approve_task does. Each check gets its own transaction,
+    # so it cannot undo the batch or another user's badges, and saves each
+    # badge in a savepoint, so a badge that fails to save (e.g. awarded by a
+    # concurrent approval) does not stop the rest of that user's awards.
+    for user in User.objects.filter(id__in=task_ids_by_user):
+        with transaction.atomic():
+            check_and_award_patterns(user, completed_task_ids=task_ids_by_user[user.id])
+
+    logger.info(f"Bulk approved {len(to_approve)} submissions for {len(task_ids_by_user)} users")
+
+    return Response({
+        "message": f"Approved {len(to_approve)} submissions for {len(task_ids_by_user)} users.",
+        "approved": len(to_approve),
+        "already_approved": already_approved,
+        "not_found": not_found
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def reject_tasks_bulk(request):
+    """
+    Rejects many pending task submissions in one transaction.
+    Only for GameKeepers and Developers.
+
+    Expects {"decisions": [{"user_id": ..., "task_id": ..., "reason": ...}, ...],
+    "reason": ...}; a decision without its own reason uses the top-level one.
+    Approved submissions cannot be rejected and are reported back.
+    """
+    if request.user.role.lower() not in ['gamekeeper', 'developer']:
+        return Response({'error': "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
+
+    decisions, error = parse_review_decisions(request.data)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+    default_reason = request.data.get('reason', 'Task rejected by game keeper')
+
+    with transaction.atomic():
+        found, not_found = load_review_batch(decisions)
+        to_reject = []
+        already_approved = []
+        for decision in decisions:
+            # Popped, so a submission listed twice is only rejected once
+            user_task = found.pop((decision['user_id'], decision['task_id']), None)
+            if user_task is None:
+                continue
+            if user_task.completed:
+                already_approved.append({'user_id': user_task.user_id, 'task_id': user_task.task_id})
+                continue
+            user_task.status = 'rejected'
+            user_task.rejection_reason = decision['reason'] or default_reason
+            to_reject.append(user_task)
+
+        UserTask.objects.bulk_update(to_reject, ['status', 'rejection_reason'])
+
+        # bulk_update() skips the UserTask signals
+        for user_id in {user_task.user_id for user_task in to_reject}:
+            profile_changed(user_id)
+
+    return Response({
+        "message": f"Rejected {len(to_reject)} submissions.",
+        "rejected": len(to_reject),
+        "already_approved": already_approved,
+        "not_found": not_found
+    })
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def check_auth(request):
@@ -821,7 +1142,9 @@ def debug_user_tasks(request):
             'completed': task.completed,
             'has_photo': bool(task.photo),
             'completion_date': task.completion_date,
-            'photo_url': None
+            'photo_url': None,
+            'verification_status': task.verification_status,
+            'fraud_score': task.fraud_score
         })
     
     return Response(result)
@@ -874,200 +1197,166 @@ def debug_media_urls(request):
         'config': config_info
     })
 
+def badges_etag(request):
+    return make_etag('badges', request.user.id, profile_version(request.user.id))
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_etag(badges_etag, private=True)
 def get_user_badges(request):
     """
-    Get all badges earned by the authenticated user
+    Get all badges earned by the authenticated user.
+    Read-only: badges are awarded when the tasks completing a pattern are approved.
     """
     user = request.user
-    
-    # First check if new patterns have been completed
-    print(f"Checking for new patterns for user {user.username}")
-    detected_patterns, new_patterns_found = check_and_award_patterns(user)
-    
-    if new_patterns_found:
-        print(f"New patterns detected: {detected_patterns}")
-    
-    # Get all user badges
-    user_badges = UserBadge.objects.filter(user=user).select_related('pattern')
-    badges_data = []
-    
-    for badge in user_badges:
-        badges_data.append({
-            'id': badge.pattern.id,
-            'name': badge.pattern.name,
-            'type': badge.pattern.pattern_type,
-            'description': badge.pattern.description,
-            'bonus_points': badge.pattern.bonus_points,
-        })
+
+    # Shares the cached profile state with get_user_profile
+    badges_data = get_profile_state(user.id)['badges']
     
     return Response(badges_data)
 
 
-def check_and_award_patterns(user):
-    """Check if the user has completed any patterns and award badges and points"""
-    try:
-        # Only print header if debugging is enabled
-        if DEBUG_PATTERN_CHECKING:
-            print(f"\n\n==== CHECKING PATTERNS FOR USER: {user.username} ====")
+def check_and_award_patterns(user, completed_task_ids=None):
+    """
+    Check if the user has completed any patterns and award badges and points.
 
-        # Get all completed tasks for the user
-        completed_tasks = UserTask.objects.filter(user=user, completed=True)
+    Reads the user's stored board completion mask instead of their tasks. When
+    completed_task_ids is given, only the patterns through those tasks' cells
+    are checked, as no other pattern can have just been completed.
 
-        if DEBUG_PATTERN_CHECKING:
-            print(f"Found {completed_tasks.count()} completed tasks: {[t.task.id for t in completed_tasks]}")
+    Args:
+        user: The user to check
+        completed_task_ids: Optional IDs of the tasks the user just completed
+    """
+    try:
+        logger.debug(f"Checking patterns for user {user.username}")
 
-            for task in completed_tasks:
-                print(f"  - Task {task.task.id}: {task.task.description}")
+        # Stored bitmask of the user's completed board cells
+        board_mask, layout = get_completion_mask(user)
+        logger.debug(f"Board mask: {board_mask:0{layout.size * layout.size}b}")
 
-        # If no completed tasks, return early
-        if not completed_tasks.exists():
-            if DEBUG_PATTERN_CHECKING:
-                print("No completed tasks found, skipping pattern check")
+        # If no completed tasks on the board, return early
+        if not board_mask:
+            logger.debug("No completed tasks found, skipping pattern check")
             return [], False
 
-        # Get all tasks to understand grid positioning
-        all_tasks = Task.objects.all().order_by('id')
-        if DEBUG_PATTERN_CHECKING:
-            print(f"Total tasks in system: {all_tasks.count()}")
-
-        # Create grid representation
-        grid = BingoPatternDetector.create_grid_from_tasks(completed_tasks, all_tasks, grid_size=3)
-
-        if DEBUG_PATTERN_CHECKING:
-            print(f"Grid representation:")
-            for row in grid:
-                print(f"  {row}")
-
         # Detect patterns with detailed logging
-        detected_patterns = BingoPatternDetector.detect_patterns(grid, size=3)
-        if DEBUG_PATTERN_CHECKING:
-            print(f"Detected patterns: {detected_patterns}")
+        if completed_task_ids is not None:
+            cells = [layout.positions[task_id] for task_id in completed_task_ids if task_id in layout.positions]
+            detected_patterns = BingoPatternDetector.detect_patterns_through_cells(board_mask, cells, size=layout.size)
+        else:
+            detected_patterns = BingoPatternDetector.detect_patterns_from_mask(board_mask, size=layout.size)
+        logger.debug(f"Detected patterns: {detected_patterns}")
 
         # If no patterns detected, return early
         if not detected_patterns:
-            if DEBUG_PATTERN_CHECKING:
-                print("No patterns detected")
+            logger.debug("No patterns detected")
             return [], False
 
         # Get existing badges for user
         existing_badges = UserBadge.objects.filter(user=user).values_list('pattern__pattern_type', flat=True)
-        if DEBUG_PATTERN_CHECKING:
-            print(f"Existing badges: {list(existing_badges)}")
-
-        # Get user's leaderboard entry
-        leaderboard, _ = Leaderboard.objects.get_or_create(user=user)
-        if DEBUG_PATTERN_CHECKING:
-            print(f"Current points: {leaderboard.points}")
+        logger.debug(f"Existing badges: {list(existing_badges)}")
 
         # Track if any new patterns were completed
         new_patterns_completed = False
         newly_added_patterns = []
+        bonus_total = 0
 
         # Award new badges and points
         for pattern_type in detected_patterns:
             try:
                 # Skip if user already has this badge
                 if pattern_type in existing_badges:
-                    if DEBUG_PATTERN_CHECKING:
-                        print(f"User already has badge for pattern: {pattern_type}")
+                    logger.debug(f"User already has badge for pattern: {pattern_type}")
                     continue
 
-                if DEBUG_PATTERN_CHECKING:
-                    print(f"New pattern detected: {pattern_type}")
+                logger.debug(f"New pattern detected: {pattern_type}")
                 newly_added_patterns.append(pattern_type)
 
-                # Get the pattern details
+                # Get the pattern details. Each badge is saved in its own
+                # savepoint, so one that fails (e.g. already awarded by a
+                # concurrent approval) leaves the caller's transaction usable.
                 try:
                     bonus_points = 35  # Default for letter patterns (X, O)
                     if pattern_type in ['HORIZ', 'VERT']:
                         bonus_points = 5  # Lower points for basic line patterns
 
-                    # Get or create the pattern in the database
-                    pattern, created = BingoPattern.objects.get_or_create(
-                        pattern_type=pattern_type,
-                        defaults={
-                            'name': get_pattern_name(pattern_type),
-                            'description': get_pattern_description(pattern_type),
-                            'bonus_points': bonus_points
-                        }
-                    )
-
-                    if not created and pattern.bonus_points != bonus_points:
-                        pattern.bonus_points = bonus_points
-                        pattern.save()
-
-                    if DEBUG_PATTERN_CHECKING:
+                    with transaction.atomic():
+                        # Get or create the pattern in the database
+                        pattern, created = BingoPattern.objects.get_or_create(
+                            pattern_type=pattern_type,
+                            defaults={
+                                'name': get_pattern_name(pattern_type),
+                                'description': get_pattern_description(pattern_type),
+                                'bonus_points': bonus_points
+                            }
+                        )
+
+                        if not created and pattern.bonus_points != bonus_points:
+                            pattern.bonus_points = bonus_points
+                            pattern.save()
+
                         if created:
-                            print(f"Created new pattern in database: {pattern.name}")
-                        else:
-                            print(f"Found existing pattern in database: {pattern.name}")
+                            logger.debug(f"Created new pattern in database: {pattern.name}")
 
-                    # Create badge for user and award bonus points
-                    UserBadge.objects.create(user=user, pattern=pattern)
-                    if DEBUG_PATTERN_CHECKING:
-                        print(f"Created UserBadge for pattern: {pattern.pattern_type}")
+                        # Create badge for user and award bonus points
+                        UserBadge.objects.create(user=user, pattern=pattern)
+                    logger.debug(f"Created UserBadge for pattern: {pattern.pattern_type}")
 
-                    # Award pattern bonus points
-                    leaderboard.points += pattern.bonus_points
-                    if DEBUG_PATTERN_CHECKING:
-                        print(f"Awarded {pattern.bonus_points} bonus points for pattern")
+                    # Award pattern bonus points, added to the leaderboard below
+                    bonus_total += pattern.bonus_points
+                    logger.debug(f"Awarded {pattern.bonus_points} bonus points for pattern")
 
                     # Set flag to indicate a new pattern was completed
                     new_patterns_completed = True
 
-                except Exception as e:
-                    if DEBUG_PATTERN_CHECKING:
-                        print(f"ERROR creating or retrieving pattern: {str(e)}")
-            except Exception as inner_e:
-                if DEBUG_PATTERN_CHECKING:
-                    print(f"ERROR processing pattern {pattern_type}: {str(inner_e)}")
+                except Exception:
+                    logger.exception(f"Error creating or retrieving pattern {pattern_type} for {user.username}")
+            except Exception:
+                logger.exception(f"Error processing pattern {pattern_type}")
 
-        if DEBUG_PATTERN_CHECKING:
-            print(f"New patterns completed: {new_patterns_completed}")
+        logger.debug(f"New patterns completed: {new_patterns_completed}")
 
         # Award additional points for completing a task that forms a bingo pattern
         if new_patterns_completed:
-            if DEBUG_PATTERN_CHECKING:
-                print("Awarding extra 5 points for pattern completion...")
+            logger.debug("Awarding extra 5 points for pattern completion...")
 
             # Award extra points
             try:
                 task_completion_bonus = 0
-                leaderboard.points += task_completion_bonus
-                leaderboard.save()
-                if DEBUG_PATTERN_CHECKING:
-                    print(f"Awarded {task_completion_bonus} extra points for pattern completion")
+                bonus_total += task_completion_bonus
+                award_points(user.id, bonus_total, kind=PointEvent.PATTERN,
+                             reason=f"Completed {', '.join(newly_added_patterns)}")
+                logger.debug(f"Awarded {task_completion_bonus} extra points for pattern completion")
 
                 # Create bonus record
                 try:
-                    # Get any completed task to link bonus to
-                    some_task = completed_tasks.first()
-                    if some_task:
-                        TaskBonus.objects.create(
-                            user=user,
-                            task=some_task.task,
-                            bonus_points=task_completion_bonus,
-                            reason="Completed bingo pattern"
-                        )
-                        if DEBUG_PATTERN_CHECKING:
-                            print(f"Created TaskBonus record")
+                    # Link the bonus to a task just completed, or else to any completed board cell
+                    if completed_task_ids:
+                        bonus_task_id = min(completed_task_ids)
                     else:
-                        if DEBUG_PATTERN_CHECKING:
-                            print("ERROR: No completed task found to link bonus to")
-                except Exception as tb_error:
-                    if DEBUG_PATTERN_CHECKING:
-                        print(f"ERROR creating TaskBonus: {str(tb_error)}")
-                    pass
-            except Exception as bonus_error:
-                if DEBUG_PATTERN_CHECKING:
-                    print(f"ERROR awarding extra points: {str(bonus_error)}")
+                        bonus_task_id = next((task_id for position, task_id in enumerate(layout.task_ids)
+                                              if task_id is not None and board_mask >> position & 1), None)
+                    if bonus_task_id is not None:
+                        with transaction.atomic():
+                            TaskBonus.objects.create(
+                                user=user,
+                                task_id=bonus_task_id,
+                                bonus_points=task_completion_bonus,
+                                reason="Completed bingo pattern"
+                            )
+                        logger.debug("Created TaskBonus record")
+                    else:
+                        logger.warning("No completed task found to link the pattern bonus to")
+                except Exception:
+                    logger.exception(f"Error creating TaskBonus for {user.username}")
+            except Exception:
+                logger.exception(f"Error awarding pattern points to {user.username}")
 
         return newly_added_patterns, new_patterns_completed
-    except Exception as e:
-        if DEBUG_PATTERN_CHECKING:
-            print(f"ERROR in check_and_award_patterns: {str(e)}")
+    except Exception:
+        logger.exception(f"Error checking patterns for {user.username}")
         return [], False
 
 # Helper functions for pattern names and descriptions
@@ -1125,12 +1414,10 @@ def force_award_pattern(request):
         leaderboard, _ = Leaderboard.objects.get_or_create(user=user)
         old_points = leaderboard.points
         
-        # Award pattern bonus
-        leaderboard.points += pattern.bonus_points
-        
-        # Award extra completion bonus
-        leaderboard.points += 5
-        leaderboard.save()
+        # Award pattern bonus and extra completion bonus
+        award_points(user.id, pattern.bonus_points + 5, kind=PointEvent.PATTERN,
+                     reason=f"Forced award of {pattern_type} pattern")
+        leaderboard.refresh_from_db(fields=['points'])
         
         # Create bonus record if there are completed tasks
         some_task = UserTask.objects.filter(user=user, completed=True).first()